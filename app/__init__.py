@@ -103,7 +103,7 @@ def create_app(config_class=Config):
     login_manager.login_message_category = 'info'
 
     # Import models to ensure they're known to Flask-Migrate
-    from app.models import user, inventory, config, mobile
+    from app.models import user, inventory, config, mobile, upc, alerts, activity, backup, imports, tracking
 
     # Initialize checkout reasons
     try:
@@ -131,11 +131,16 @@ def create_app(config_class=Config):
     from app import cli
     cli.init_app(app)
 
+    # Batch-insert activity rows buffered during each request
+    from app.utils import activity_logger
+    activity_logger.init_app(app)
+
     # Add template context processor
     @app.context_processor
     def utility_processor():
         from app.models.config import Configuration
-        return dict(Configuration=Configuration)
+        from app.utils.barcode_cache import image_url
+        return dict(Configuration=Configuration, barcode_url=image_url)
 
     # Register the root route directly in the app
     @app.route('/')
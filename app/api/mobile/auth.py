@@ -10,12 +10,14 @@ from datetime import datetime, timedelta
 from functools import wraps
 from flask_restx import Resource
 from app.api.mobile.swagger import ns_auth, login_model, token_response, user_model, history_model
+from app.utils.mobile_principals import get_principal
 
 def generate_token(user):
     """Generate JWT token for user"""
     token = jwt.encode({
         'user_id': user.id,
         'username': user.username,
+        'ver': user.token_version or 0,  # Tokens die when the user's token_version is bumped
         'exp': datetime.utcnow() + timedelta(days=7)  # Extended to 7 days
     }, current_app.config['SECRET_KEY'])
     return token
@@ -37,9 +39,12 @@ def mobile_token_required(f):  # Renamed to be specific to mobile
 
         try:
             data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            user = User.query.get(data['user_id'])
+            # A cached MobilePrincipal (id, username, role), not a User row
+            user = get_principal(data['user_id'])
             if not user:
                 return {'message': 'Invalid token'}, 401
+            if data.get('ver', 0) != user.token_version:
+                return {'message': 'Token has been revoked'}, 401
             
             # Pass user as first argument for class methods
             if len(args) > 0 and isinstance(args[0], Resource):
@@ -97,6 +102,7 @@ class MobileLogin(Resource):  # Renamed to be specific to mobile
             user = User.query.filter_by(username=username).first()
 
             if user and user.check_pin(pin):
+                db.session.commit()  # Persist a fingerprint backfilled for a legacy PIN
                 token = generate_token(user)
 
                 current_app.logger.info(f"[Mobile Login] Successful login for user: {username}")
@@ -9,9 +9,12 @@ from datetime import datetime
 from flask_restx import Resource
 from app.api.mobile.swagger import (
     checkout_reason_model, checkout_request_model, history_model,
-    item_model, system_model, ns_checkout
+    item_model, system_model, ns_checkout,
+    batch_checkout_request_model, batch_checkout_response_model
 )
 from app.utils.activity_logger import log_activity
+from app.utils.checkout import CheckoutError, checkout_cart, claim_system, decrement_stock
+from app.utils.stock_alerts import enqueue_stock_alert
 from flask_restx import marshal
 
 # Routes start here
@@ -115,12 +118,17 @@ class Checkout(Resource):
                 if not item:
                     return {'error': 'Item not found'}, 404
 
-                # Check quantity
                 quantity = data.get('quantity', 1)
-                if quantity > item.quantity:
-                    return {'error': 'Insufficient quantity available'}, 400
+                if not isinstance(quantity, int) or quantity < 1:
+                    return {'error': 'Quantity must be a positive integer'}, 400
 
                 try:
+                    # Take the stock atomically; fails if a concurrent checkout got there first
+                    new_quantity = decrement_stock(item, quantity)
+                    if new_quantity is None:
+                        db.session.rollback()
+                        return {'error': 'Insufficient quantity available'}, 400
+
                     # Create transaction
                     transaction = Transaction(
                         item_id=item.id,
@@ -131,13 +139,12 @@ class Checkout(Resource):
                         created_at=datetime.utcnow()
                     )
                     
-                    # Update item quantity
-                    old_quantity = item.quantity
-                    item.quantity -= quantity
-                    
                     # Add transaction to session
                     db.session.add(transaction)
                     
+                    # Queue a low-stock alert; the alert worker emails it
+                    enqueue_stock_alert(item)
+                    
                     # Log activity for system logs
                     current_app.logger.info(f'[CHECKOUT] Mobile user {current_user.username} checked out {item.name} (x{quantity}) - {reason.name}')
                     log_activity(
@@ -146,10 +153,11 @@ class Checkout(Resource):
                         f'Mobile checkout by {current_user.username}: {item.name} (x{quantity}) - {reason.name}',
                         details={
                             'item_id': item.id,
+                            'tracking_id': item.tracking_id,
                             'item_name': item.name,
                             'quantity': quantity,
-                            'old_quantity': old_quantity,
-                            'new_quantity': item.quantity,
+                            'old_quantity': new_quantity + quantity,
+                            'new_quantity': new_quantity,
                             'reason': reason.name,
                             'username': current_user.username,
                             'notes': data.get('notes', '')
@@ -166,16 +174,11 @@ class Checkout(Resource):
                 if not system:
                     return {'error': 'System not found'}, 404
 
-                if system.status != 'available':
-                    return {'error': 'System is not available for checkout'}, 400
-
                 try:
-                    # Update system status
-                    system.status = 'checked_out'
-                    system.checked_out_by = current_user
-                    system.checked_out_at = datetime.utcnow()
-                    system.checkout_reason = reason.name
-                    system.checkout_notes = data.get('notes', '')
+                    # Claim the system atomically; fails if it is no longer available
+                    if not claim_system(system, current_user.id, reason.name, data.get('notes', '')):
+                        db.session.rollback()
+                        return {'error': 'System is not available for checkout'}, 400
                     
                     # Log activity for system logs
                     current_app.logger.info(f'[CHECKOUT] Mobile user {current_user.username} checked out system {system.model.manufacturer} {system.model.model_name} - {reason.name}')
@@ -185,6 +188,7 @@ class Checkout(Resource):
                         f'Mobile checkout by {current_user.username}: {system.model.manufacturer} {system.model.model_name} - {reason.name}',
                         details={
                             'system_id': system.id,
+                            'tracking_id': system.tracking_id,
                             'system_name': f"{system.model.manufacturer} {system.model.model_name}",
                             'reason': reason.name,
                             'username': current_user.username,
@@ -210,4 +214,41 @@ class Checkout(Resource):
         except Exception as e:
             current_app.logger.error(f'[CHECKOUT] Failed: {str(e)}')
             db.session.rollback()
-            return {'error': str(e)}, 500 
\ No newline at end of file
+            return {'error': str(e)}, 500 
+
+@ns_checkout.route('/batch')
+class BatchCheckout(Resource):
+    method_decorators = [mobile_token_required]
+
+    @csrf.exempt
+    @api.doc('process_batch_checkout', security='Bearer')
+    @api.expect(batch_checkout_request_model)
+    @api.response(200, 'Every line checked out', batch_checkout_response_model)
+    @api.response(400, 'Nothing checked out; see the per-line results', batch_checkout_response_model)
+    @api.response(500, 'Internal server error')
+    def post(self, current_user):
+        """Check out a cart of items and systems in one transaction"""
+        data = request.get_json(silent=True)
+        if not data:
+            return {'error': 'No data provided'}, 400
+        if 'reason_id' not in data or 'lines' not in data:
+            return {'error': 'Missing required fields: reason_id, lines'}, 400
+
+        reason = db.session.get(MobileCheckoutReason, data['reason_id'])
+        if not reason:
+            return {'error': 'Invalid checkout reason'}, 400
+        if not reason.is_active:
+            return {'error': 'Checkout reason is not active'}, 400
+
+        try:
+            results = checkout_cart(data['lines'], current_user.id, current_user.username,
+                                    reason.name, notes=data.get('notes', ''), source='mobile')
+        except CheckoutError as e:
+            return marshal({'error': str(e), 'results': e.results}, batch_checkout_response_model), 400
+        except Exception as e:
+            current_app.logger.error(f'[CHECKOUT] Batch failed: {str(e)}')
+            return {'error': 'Internal server error'}, 500
+
+        current_app.logger.info(f'[CHECKOUT] Mobile user {current_user.username} checked out {len(results)} lines - {reason.name}')
+        return marshal({'message': 'Checkout processed successfully', 'results': results},
+                       batch_checkout_response_model), 200
@@ -1,11 +1,16 @@
 """Mobile API Item Routes"""
-from flask import jsonify, current_app
+from flask import jsonify, current_app, request
 from app.api.mobile import bp, csrf
-from app.models.inventory import InventoryItem, ComputerSystem
+from app.models.inventory import InventoryItem, ComputerSystem, Transaction
 from app.api.mobile.auth import mobile_token_required
 from flask_restx import Resource
-from app.api.mobile.swagger import api, ns_items, ns_systems, item_model, system_model
+from app.api.mobile.swagger import (
+    api, ns_items, ns_systems, item_model, system_model, tag_usage_model, transaction_page_model
+)
+from app.utils.pagination import keyset_page
+from app.utils.tag_stats import get_tag_stats
 from flask_restx import marshal
+from sqlalchemy.orm import joinedload
 
 @ns_items.route('/<string:barcode>')
 @api.doc(security='Bearer')
@@ -27,6 +32,60 @@ class ItemLookup(Resource):
             current_app.logger.error(f'Error getting item details: {str(e)}')
             return {'message': 'Internal server error', 'error': True}, 500
 
+@ns_items.route('/tags')
+@api.doc(security='Bearer')
+class TagList(Resource):
+    @csrf.exempt
+    @api.doc('list_tags')
+    @api.response(200, 'Success', [tag_usage_model])
+    @api.response(500, 'Internal server error')
+    @mobile_token_required
+    def get(self, current_user):
+        """List tags with their item and system usage counts"""
+        try:
+            return [tag.to_dict() for tag in get_tag_stats()], 200
+        except Exception as e:
+            current_app.logger.error(f'Error listing tags: {str(e)}')
+            return {'message': 'Internal server error', 'error': True}, 500
+
+@ns_items.route('/<int:item_id>/transactions')
+@api.doc(security='Bearer')
+class ItemTransactions(Resource):
+    @csrf.exempt
+    @api.doc('list_item_transactions')
+    @api.param('cursor', 'next_cursor from the previous page')
+    @api.param('limit', 'Results per page (default: 20, max: 100)')
+    @api.response(200, 'Success', transaction_page_model)
+    @api.response(400, 'Invalid request')
+    @api.response(404, 'Item not found')
+    @api.response(500, 'Internal server error')
+    @mobile_token_required
+    def get(self, current_user, item_id):
+        """Get an item's transaction history, newest first"""
+        try:
+            limit = min(int(request.args.get('limit', 20)), 100)
+            if limit < 1:
+                raise ValueError(limit)
+            if not InventoryItem.query.filter_by(id=item_id).with_entities(InventoryItem.id).first():
+                return {'message': 'Item not found', 'error': True}, 404
+
+            transactions, next_cursor = keyset_page(
+                Transaction.query.filter_by(item_id=item_id).options(joinedload(Transaction.user)),
+                [Transaction.created_at, Transaction.id],
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+            return marshal({
+                'results': transactions,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }, transaction_page_model), 200
+        except ValueError:
+            return {'message': 'Invalid limit parameter', 'error': True}, 400
+        except Exception as e:
+            current_app.logger.error(f'Error getting item transactions: {str(e)}')
+            return {'message': 'Internal server error', 'error': True}, 500
+
 @ns_systems.route('/<string:barcode>')
 @api.doc(security='Bearer')
 class SystemLookup(Resource):
@@ -1,22 +1,92 @@
 """Mobile API Search Routes"""
 from flask import jsonify, current_app, request
 from app.api.mobile import bp, csrf
-from app.models.inventory import InventoryItem, ComputerSystem, ComputerModel
+from app.models.inventory import InventoryItem, ComputerSystem
 from app.api.mobile.auth import mobile_token_required
 from flask_restx import Resource
-from app.api.mobile.swagger import api, ns_search, item_model, system_model, search_results_model
-from flask_restx import marshal
-from sqlalchemy import or_
-from sqlalchemy.orm import joinedload
+from app.api.mobile.swagger import api, ns_search, item_model, item_summary_model, system_model, search_results_model
+from flask_restx import fields, marshal
+from app.utils.pagination import estimate_count, keyset_page
+from app.utils.search import item_search_filter, item_search_rank, system_search_filter, system_search_rank
+from sqlalchemy.orm import joinedload, lazyload, load_only, selectinload
+
+# Item columns that can be requested with fields=
+ITEM_FIELDS = [name for name, field in item_model.items()
+               if not isinstance(field, (fields.Nested, fields.List))]
+# Related records that can be requested with expand=, and how each is loaded.
+# Transaction history has its own paginated endpoint (/item/<id>/transactions).
+ITEM_EXPANSIONS = {
+    'tags': selectinload,
+    'purchase_links': selectinload,
+    'category': joinedload,
+    'creator': joinedload
+}
+
+def parse_selector(value, allowed):
+    """Split a comma-separated fields=/expand= value, rejecting unknown names"""
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise LookupError(', '.join(unknown))
+    return names
+
+def item_search_shape(fields_arg, expand_arg):
+    """
+    Columns and relationships to load for item search results.
+
+    Returns:
+        tuple: (loader options, marshal fields)
+    """
+    columns = parse_selector(fields_arg, ITEM_FIELDS) or list(item_summary_model)
+    if 'id' not in columns:
+        columns.insert(0, 'id')
+    expand = parse_selector(expand_arg, ITEM_EXPANSIONS)
+
+    options = [load_only(*[getattr(InventoryItem, name) for name in columns]), lazyload('*')]
+    options += [ITEM_EXPANSIONS[name](getattr(InventoryItem, name)) for name in expand]
+    return options, {name: item_model[name] for name in columns + expand}
+
+def search_page(query, model, rank, limit):
+    """
+    One page of search results, best matches first, as the response dict
+    (results still unmarshalled).
+
+    Pages are keyed on (rank, id) and the next page starts after the last
+    row of this one, so each page costs the same however deep the client
+    scrolls. A total is only computed when asked for with total=true, and
+    is approximate.
+    """
+    rows, next_cursor = keyset_page(
+        query.add_columns(rank.label('rank')),
+        [rank, model.id],
+        cursor=request.args.get('cursor'),
+        limit=limit,
+        key=lambda row: (row.rank, row[0].id)
+    )
+    return {
+        'results': [row[0] for row in rows],
+        'next_cursor': next_cursor,
+        'has_next': next_cursor is not None,
+        'total': estimate_count(query) if request.args.get('total') == 'true' else None
+    }
+
+def page_limit():
+    limit = min(int(request.args.get('limit', 20)), 50)  # Cap at 50 results per page
+    if limit < 1:
+        raise ValueError(limit)
+    return limit
 
 @ns_search.route('/items/search')
 @api.doc(security='Bearer')
 class ItemSearch(Resource):
     @csrf.exempt
     @api.doc('search_items')
-    @api.param('q', 'Search query (name or tracking ID)')
-    @api.param('page', 'Page number (default: 1)')
-    @api.param('limit', 'Results per page (default: 20)')
+    @api.param('q', 'Search query (name, tracking ID, barcode, manufacturer or MPN)')
+    @api.param('cursor', 'next_cursor from the previous page')
+    @api.param('limit', 'Results per page (default: 20, max: 50)')
+    @api.param('total', 'Set to true to include an approximate total')
+    @api.param('fields', 'Comma-separated item columns to return (default: the ItemSummary columns)')
+    @api.param('expand', 'Comma-separated related records to include: tags, category, creator, purchase_links')
     @api.response(200, 'Success', search_results_model)
     @api.response(400, 'Invalid request')
     @api.response(500, 'Internal server error')
@@ -26,47 +96,27 @@ class ItemSearch(Resource):
         try:
             # Get query parameters
             query = request.args.get('q', '').strip()
-            page = int(request.args.get('page', 1))
-            limit = min(int(request.args.get('limit', 20)), 50)  # Cap at 50 items per page
+            limit = page_limit()
 
             if not query:
                 return {'message': 'Search query is required', 'error': True}, 400
 
-            # Build search query
-            search_query = InventoryItem.query.options(
-                joinedload(InventoryItem.tags),
-                joinedload(InventoryItem.transactions),
-                joinedload(InventoryItem.purchase_links),
-                joinedload(InventoryItem.creator),
-                joinedload(InventoryItem.category)
-            ).filter(
-                or_(
-                    InventoryItem.name.ilike(f'%{query}%'),
-                    InventoryItem.tracking_id.ilike(f'%{query}%'),
-                    InventoryItem.manufacturer.ilike(f'%{query}%'),
-                    InventoryItem.mpn.ilike(f'%{query}%')
-                )
-            )
-
-            # Execute paginated query
-            paginated_results = search_query.paginate(page=page, per_page=limit)
-            
+            try:
+                options, result_fields = item_search_shape(request.args.get('fields'),
+                                                           request.args.get('expand'))
+            except LookupError as e:
+                return {'message': f'Unknown fields: {e.args[0]}', 'error': True}, 400
+
+            # Build search query, loading only what is returned
+            search_query = InventoryItem.query.options(*options).filter(item_search_filter(query))
+            response = search_page(search_query, InventoryItem, item_search_rank(query), limit)
+
             # Marshal the results
-            results = [marshal(item, item_model) for item in paginated_results.items]
-            
-            response = {
-                'results': results,
-                'total': paginated_results.total,
-                'pages': paginated_results.pages,
-                'current_page': page,
-                'has_next': paginated_results.has_next,
-                'has_prev': paginated_results.has_prev
-            }
-            
+            response['results'] = [marshal(item, result_fields) for item in response['results']]
             return marshal(response, search_results_model), 200
 
         except ValueError as e:
-            return {'message': 'Invalid page or limit parameter', 'error': True}, 400
+            return {'message': 'Invalid limit parameter', 'error': True}, 400
         except Exception as e:
             current_app.logger.error(f'Error searching items: {str(e)}')
             return {'message': 'Internal server error', 'error': True}, 500
@@ -76,9 +126,10 @@ class ItemSearch(Resource):
 class SystemSearch(Resource):
     @csrf.exempt
     @api.doc('search_systems')
-    @api.param('q', 'Search query (tracking ID or model info)')
-    @api.param('page', 'Page number (default: 1)')
-    @api.param('limit', 'Results per page (default: 20)')
+    @api.param('q', 'Search query (tracking ID, serial tag or model info)')
+    @api.param('cursor', 'next_cursor from the previous page')
+    @api.param('limit', 'Results per page (default: 20, max: 50)')
+    @api.param('total', 'Set to true to include an approximate total')
     @api.response(200, 'Success', search_results_model)
     @api.response(400, 'Invalid request')
     @api.response(500, 'Internal server error')
@@ -88,43 +139,24 @@ class SystemSearch(Resource):
         try:
             # Get query parameters
             query = request.args.get('q', '').strip()
-            page = int(request.args.get('page', 1))
-            limit = min(int(request.args.get('limit', 20)), 50)  # Cap at 50 items per page
+            limit = page_limit()
 
             if not query:
                 return {'message': 'Search query is required', 'error': True}, 400
 
-            # Build search query with joins
-            search_query = ComputerSystem.query.join(
-                ComputerModel,
-                ComputerSystem.model_id == ComputerModel.id
-            ).filter(
-                or_(
-                    ComputerSystem.tracking_id.ilike(f'%{query}%'),
-                    ComputerModel.manufacturer.ilike(f'%{query}%'),
-                    ComputerModel.model_name.ilike(f'%{query}%')
-                )
-            )
-
-            # Execute paginated query
-            paginated_results = search_query.paginate(page=page, per_page=limit)
-            
+            # Build search query
+            search_query = ComputerSystem.query.options(
+                joinedload(ComputerSystem.model),
+                joinedload(ComputerSystem.cpu)
+            ).filter(system_search_filter(query))
+            response = search_page(search_query, ComputerSystem, system_search_rank(query), limit)
+
             # Marshal the results
-            results = [marshal(system, system_model) for system in paginated_results.items]
-            
-            response = {
-                'results': results,
-                'total': paginated_results.total,
-                'pages': paginated_results.pages,
-                'current_page': page,
-                'has_next': paginated_results.has_next,
-                'has_prev': paginated_results.has_prev
-            }
-            
+            response['results'] = [marshal(system, system_model) for system in response['results']]
             return marshal(response, search_results_model), 200
 
         except ValueError as e:
-            return {'message': 'Invalid page or limit parameter', 'error': True}, 400
+            return {'message': 'Invalid limit parameter', 'error': True}, 400
         except Exception as e:
             current_app.logger.error(f'Error searching systems: {str(e)}')
             return {'message': 'Internal server error', 'error': True}, 500 
\ No newline at end of file
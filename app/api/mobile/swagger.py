@@ -168,7 +168,7 @@ Search endpoints for finding items and systems.
 - Barcode lookup
 - Filter by category
 - Sort by various fields
-- Pagination support
+- Cursor pagination (pass next_cursor back as cursor=)
 
 ## Search Tips
 - Use * for wildcard
@@ -218,6 +218,14 @@ tag_model = api.model('Tag', {
     'color': fields.String(description='Hex color code (e.g. #FF0000)', pattern='^#[0-9A-Fa-f]{6}$', example='#FF0000')
 })
 
+tag_usage_model = api.model('TagUsage', {
+    'id': fields.Integer(description='Unique identifier for the tag', example=1),
+    'name': fields.String(description='Tag name', example='Testing'),
+    'color': fields.String(description='Hex color code', example='#FF0000'),
+    'item_count': fields.Integer(description='Number of items with the tag', example=12),
+    'system_count': fields.Integer(description='Number of systems with the tag', example=3)
+})
+
 computer_model_model = api.model('ComputerModel', {
     'id': fields.Integer(description='Unique identifier for the model', example=1),
     'manufacturer': fields.String(description='Manufacturer name (e.g. Dell, HP)', example='Dell'),
@@ -300,14 +308,43 @@ system_model = api.model('System', {
     'tags': fields.List(fields.Nested(tag_model))
 })
 
-# Search results model with pagination
+# Compact item shape returned by item search unless fields=/expand= ask for more
+item_summary_model = api.model('ItemSummary', {
+    'id': fields.Integer(example=1),
+    'tracking_id': fields.String(example='TC-B95F49A3'),
+    'name': fields.String(example='USB Network Adapter'),
+    'manufacturer': fields.String(example='TP-Link'),
+    'mpn': fields.String(example='UE300'),
+    'quantity': fields.Integer(example=5),
+    'status': fields.String(example='available'),
+    'storage_location': fields.String(example='Warehouse 1'),
+    'image_url': fields.String(example='https://inventory.ticom.pro/images/items/UE300.jpg')
+})
+
+transaction_model = api.model('Transaction', {
+    'id': fields.Integer(example=1),
+    'transaction_type': fields.String(description='checkout, check_in, adjustment, ...', example='checkout'),
+    'quantity_changed': fields.Integer(example=-2),
+    'notes': fields.String(example='Mobile checkout: CLIENT INSTALL'),
+    'created_at': fields.String(example='2024-02-06T12:00:00Z'),
+    'user': fields.Nested(api.model('TransactionUser', {
+        'id': fields.Integer(example=1),
+        'username': fields.String(example='jsmith')
+    }), allow_null=True)
+})
+
+transaction_page_model = api.model('TransactionPage', {
+    'results': fields.List(fields.Nested(transaction_model)),
+    'next_cursor': fields.String(description='Pass as cursor= to fetch the next page; null on the last page'),
+    'has_next': fields.Boolean(description='Whether there is a next page', example=True)
+})
+
+# Search results model with cursor pagination
 search_results_model = api.model('SearchResults', {
-    'results': fields.Raw(description='List of search results (items or systems)'),
-    'total': fields.Integer(description='Total number of results', example=42),
-    'pages': fields.Integer(description='Total number of pages', example=3),
-    'current_page': fields.Integer(description='Current page number', example=1),
+    'results': fields.Raw(description='List of search results (items or systems), best matches first'),
+    'next_cursor': fields.String(description='Pass as cursor= to fetch the next page; null on the last page'),
     'has_next': fields.Boolean(description='Whether there is a next page', example=True),
-    'has_prev': fields.Boolean(description='Whether there is a previous page', example=False)
+    'total': fields.Integer(description='Approximate number of results; null unless total=true', example=42)
 })
 
 # Auth models with examples
@@ -339,4 +376,35 @@ checkout_request_model = api.model('CheckoutRequest', {
     'reason_id': fields.Integer(required=True, description='Checkout reason ID', example=1),
     'quantity': fields.Integer(description='Quantity to checkout (for items)', example=1),
     'notes': fields.String(description='Checkout notes', example='Needed for Client ABC setup')
-}) 
\ No newline at end of file
+})
+
+checkout_line_model = api.model('CheckoutLine', {
+    'type': fields.String(description='item or system; optional with tracking_id', example='item'),
+    'id': fields.Integer(description='Item/System ID (or give tracking_id)', example=1),
+    'tracking_id': fields.String(description='Scanned tracking ID (or give id)', example='TC-B95F49A3'),
+    'quantity': fields.Integer(description='Quantity to checkout (items only, default 1)', example=2)
+})
+
+batch_checkout_request_model = api.model('BatchCheckoutRequest', {
+    'reason_id': fields.Integer(required=True, description='Checkout reason ID', example=1),
+    'notes': fields.String(description='Checkout notes', example='Needed for Client ABC setup'),
+    'lines': fields.List(fields.Nested(checkout_line_model), required=True, description='Cart lines (max 100)')
+})
+
+checkout_line_result_model = api.model('CheckoutLineResult', {
+    'line': fields.Integer(description='Index of the line in the request', example=0),
+    'type': fields.String(example='item'),
+    'id': fields.Integer(example=1),
+    'tracking_id': fields.String(example='TC-B95F49A3'),
+    'name': fields.String(example='USB Network Adapter'),
+    'quantity': fields.Integer(example=2),
+    'remaining': fields.Integer(description='Stock left after checkout (items)', example=3),
+    'status': fields.String(description='ok, error, or not_applied (rolled back because another line failed)', example='ok'),
+    'error': fields.String(description='Why the line failed')
+})
+
+batch_checkout_response_model = api.model('BatchCheckoutResponse', {
+    'message': fields.String(example='Checkout processed successfully'),
+    'error': fields.String(description='Set when nothing was checked out'),
+    'results': fields.List(fields.Nested(checkout_line_result_model))
+})
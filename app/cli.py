@@ -4,6 +4,10 @@ from app import db
 from app.models.inventory import Category, ComputerModel, CPU, Tag
 from app.models.user import User
 from app.utils.version import increment_build_number
+from app.utils.upc_lookup import purge_expired_lookups
+from app.utils.barcode_cache import pregenerate_images
+from app.utils.stock_alerts import run_alert_worker
+from app.utils.backup import run_backup_scheduler
 
 def init_app(app):
     app.cli.add_command(create_category_command)
@@ -13,7 +17,12 @@ def init_app(app):
     app.cli.add_command(create_cpus_command)
     app.cli.add_command(create_tags_command)
     app.cli.add_command(set_user_pin_command)
+    app.cli.add_command(expire_legacy_pins_command)
     app.cli.add_command(increment_version)
+    app.cli.add_command(purge_upc_cache_command)
+    app.cli.add_command(pregenerate_barcodes_command)
+    app.cli.add_command(stock_alert_worker_command)
+    app.cli.add_command(backup_scheduler_command)
 
 @click.command('create-category')
 @with_appcontext
@@ -280,6 +289,22 @@ def set_user_pin_command(username):
         db.session.rollback()
         print(f"Error setting PIN: {str(e)}")
 
+@click.command('expire-legacy-pins')
+@with_appcontext
+def expire_legacy_pins_command():
+    """Clear PINs set before PIN fingerprints; their users must set a new PIN"""
+    try:
+        users = User.query.filter(User.pin_hash != None, User.pin_fingerprint == None).all()
+        for user in users:
+            user.pin_hash = None
+        db.session.commit()
+        click.echo(f"Cleared {len(users)} legacy PINs")
+        for user in users:
+            click.echo(f"  {user.username}: set a new PIN with flask set-user-pin {user.username}")
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f"Error expiring legacy PINs: {str(e)}")
+
 @click.command('increment-version')
 @with_appcontext
 def increment_version():
@@ -288,4 +313,43 @@ def increment_version():
     if new_version:
         click.echo(f"Version incremented to {new_version}")
     else:
-        click.echo("Failed to increment version") 
\ No newline at end of file
+        click.echo("Failed to increment version") 
+
+@click.command('purge-upc-cache')
+@with_appcontext
+def purge_upc_cache_command():
+    """Delete expired UPC lookup cache entries"""
+    try:
+        deleted = purge_expired_lookups()
+        click.echo(f"Removed {deleted} expired UPC lookups")
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f"Error purging UPC cache: {str(e)}")
+
+@click.command('pregenerate-barcodes')
+@with_appcontext
+def pregenerate_barcodes_command():
+    """Render missing barcode and QR images for all items and systems"""
+    try:
+        created = pregenerate_images()
+        click.echo(f"Generated {created} barcode images")
+    except Exception as e:
+        click.echo(f"Error generating barcode images: {str(e)}")
+
+@click.command('stock-alert-worker')
+@click.option('--once', is_flag=True, help='Send any pending alerts now and exit')
+@click.option('--interval', type=int, default=None, help='Seconds between queue checks')
+@with_appcontext
+def stock_alert_worker_command(once, interval):
+    """Email queued low-stock alerts as coalesced digests"""
+    click.echo("Processing stock alerts" if once else "Stock alert worker started")
+    run_alert_worker(poll_seconds=interval, once=once)
+
+@click.command('backup-scheduler')
+@click.option('--once', is_flag=True, help='Run a backup now, prune old ones and exit')
+@click.option('--interval', type=int, default=None, help='Seconds between schedule checks')
+@with_appcontext
+def backup_scheduler_command(once, interval):
+    """Run automatic database backups on the configured schedule"""
+    click.echo("Running backup" if once else "Backup scheduler started")
+    run_backup_scheduler(poll_seconds=interval, once=once)
@@ -1,7 +1,8 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, SelectField, IntegerField, FloatField, TextAreaField, DecimalField, SelectMultipleField, PasswordField, BooleanField
 from wtforms.validators import DataRequired, Length, NumberRange, Optional, Regexp, ValidationError, URL, EqualTo
-from app.models.inventory import ComputerModel, Category, CPU, Tag, WikiCategory, WikiPage
+from app.models.inventory import ComputerModel, Category, CPU, WikiCategory, WikiPage
+from app.utils.tag_stats import get_tag_choices
 
 # Define choices as constants for easy maintenance
 MANUFACTURER_CHOICES = [
@@ -147,8 +148,7 @@ class ComputerSystemForm(FlaskForm):
                               for c in CPU.query.order_by(CPU.manufacturer, CPU.model).all()]
         
         # Populate tag choices
-        self.tags.choices = [(t.id, t.name) 
-                            for t in Tag.query.order_by(Tag.name).all()]
+        self.tags.choices = get_tag_choices()
 
 class GeneralItemForm(FlaskForm):
     name = StringField('Name', validators=[DataRequired(), Length(max=100)])
@@ -14,6 +14,11 @@ from app.models.inventory import (
 )
 from app.models.activity import Activity
 from app.models.config import Configuration
+from app.models.upc import UpcLookup
+from app.models.alerts import StockAlert
+from app.models.backup import BackupRun
+from app.models.imports import ImportJob
+from app.models.tracking import TrackingIdCounter
 
 __all__ = [
     'User', 
@@ -29,5 +34,10 @@ __all__ = [
     'WikiPage',
     'WikiCategory',
     'PurchaseLink',
-    'Activity'
+    'Activity',
+    'UpcLookup',
+    'StockAlert',
+    'BackupRun',
+    'ImportJob',
+    'TrackingIdCounter'
 ]
\ No newline at end of file
@@ -1,9 +1,16 @@
 from app import db
 from datetime import datetime
+from app.utils.activity_logger import utc_to_local
 
 class Activity(db.Model):
     """Model for storing activity logs"""
     __tablename__ = 'activity_logs'
+    __table_args__ = (
+        # Support the admin log viewer's time-range, user, action and item filters
+        db.Index('ix_activity_logs_user_id_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_activity_logs_action_timestamp', 'action', 'timestamp'),
+        db.Index('ix_activity_logs_item', 'item_type', 'item_id', 'timestamp'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     action = db.Column(db.String(50), nullable=False)
@@ -11,11 +18,17 @@ class Activity(db.Model):
     item_id = db.Column(db.Integer)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     details = db.Column(db.JSON)
-    item_identifier = db.Column(db.String(255))
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    item_identifier = db.Column(db.String(255), index=True)
+    message = db.Column(db.Text)  # Human-readable line, as previously written to activity.log
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
     user = db.relationship('User', backref='activities')
 
+    @property
+    def local_timestamp(self):
+        """Timestamp in server-local time, matching the log files"""
+        return utc_to_local(self.timestamp) if self.timestamp else None
+
     def __repr__(self):
-        return f'<Activity {self.action} {self.item_type} {self.item_identifier}>' 
\ No newline at end of file
+        return f'<Activity {self.action} {self.item_type} {self.item_identifier}>' 
@@ -0,0 +1,22 @@
+"""Stock Alert Queue Model"""
+from app import db
+from datetime import datetime
+
+class StockAlert(db.Model):
+    """Pending or sent low-stock alert for an item, drained by the alert worker"""
+    __tablename__ = 'stock_alerts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('items.id', ondelete='CASCADE'), nullable=False, index=True)
+    quantity = db.Column(db.Integer)  # Stock level when the alert was queued
+    queued_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, index=True)  # NULL while pending
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime)  # Set after a failed send
+    failed_at = db.Column(db.DateTime)  # Given up after STOCK_ALERT_MAX_ATTEMPTS
+    last_error = db.Column(db.String(256))
+
+    item = db.relationship('InventoryItem')
+
+    def __repr__(self):
+        return f'<StockAlert item={self.item_id} sent={self.sent_at is not None} failed={self.failed_at is not None}>'
@@ -0,0 +1,25 @@
+"""Scheduled Backup Run Model"""
+from app import db
+from datetime import datetime
+from app.utils.activity_logger import utc_to_local
+
+class BackupRun(db.Model):
+    """One run of the backup scheduler and the file it wrote"""
+    __tablename__ = 'backup_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime)
+    status = db.Column(db.String(20), default='running', nullable=False)  # running, success, failed
+    filename = db.Column(db.String(255))
+    size_bytes = db.Column(db.BigInteger)
+    error = db.Column(db.String(512))
+    deleted_at = db.Column(db.DateTime)  # Set when the file is pruned by retention
+
+    @property
+    def local_started_at(self):
+        """Start time in server-local time, as backup_time is configured"""
+        return utc_to_local(self.started_at) if self.started_at else None
+
+    def __repr__(self):
+        return f'<BackupRun {self.started_at} {self.status}>'
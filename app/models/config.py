@@ -1,6 +1,7 @@
 """Configuration Model"""
 from app import db
 from datetime import datetime
+from app.utils.config_cache import get_config_values, register_config_listeners
 
 class Configuration(db.Model):
     __tablename__ = 'configuration'
@@ -14,9 +15,9 @@ class Configuration(db.Model):
 
     @staticmethod
     def get_value(key, default=None):
-        """Get configuration value by key"""
-        config = Configuration.query.filter_by(key=key).first()
-        return config.value if config else default
+        """Get configuration value by key, served from the in-process cache"""
+        values = get_config_values()
+        return values[key] if key in values else default
 
     @staticmethod
     def set_value(key, value, description=None):
@@ -32,10 +33,65 @@ class Configuration(db.Model):
             db.session.add(config)
         db.session.commit()
 
+    @staticmethod
+    def set_many(values, descriptions=None):
+        """
+        Set several configuration values in one statement and one transaction.
+
+        Args:
+            values: Mapping of key to value
+            descriptions: Optional mapping of key to description; existing
+                descriptions are kept for keys not listed
+        """
+        if not values:
+            return
+        descriptions = descriptions or {}
+        now = datetime.utcnow()
+        rows = [
+            {'key': key, 'value': value, 'description': descriptions.get(key),
+             'created_at': now, 'updated_at': now}
+            for key, value in values.items()
+        ]
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(Configuration).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Configuration.key],
+                set_={
+                    'value': stmt.excluded.value,
+                    'description': db.func.coalesce(stmt.excluded.description, Configuration.description),
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            db.session.execute(stmt)
+        else:
+            # Portable fallback: one query for the existing rows, then a single flush
+            existing = {
+                config.key: config
+                for config in Configuration.query.filter(Configuration.key.in_(list(values)))
+            }
+            for row in rows:
+                config = existing.get(row['key'])
+                if config:
+                    config.value = row['value']
+                    if row['description']:
+                        config.description = row['description']
+                    config.updated_at = now
+                else:
+                    db.session.add(Configuration(**row))
+        db.session.commit()
+
     @staticmethod
     def is_read_only_mode():
         """Check if system is in read-only mode"""
         return Configuration.get_value('read_only_mode', 'false').lower() == 'true'
 
     def __repr__(self):
-        return f'<Configuration {self.key}={self.value}>'
\ No newline at end of file
+        return f'<Configuration {self.key}={self.value}>'
+
+register_config_listeners(Configuration)
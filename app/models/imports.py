@@ -0,0 +1,41 @@
+"""CSV Import Job Model"""
+from app import db
+from datetime import datetime
+
+class ImportJob(db.Model):
+    """A CSV upload being validated or imported, with its progress and row errors"""
+    __tablename__ = 'import_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    filename = db.Column(db.String(255))  # Name of the uploaded file
+    upload_path = db.Column(db.String(512))  # Saved copy, removed after a real import
+    dry_run = db.Column(db.Boolean, default=False, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, running, completed, failed
+    total_rows = db.Column(db.Integer)
+    processed_rows = db.Column(db.Integer, default=0, nullable=False)
+    imported_rows = db.Column(db.Integer, default=0, nullable=False)
+    error_count = db.Column(db.Integer, default=0, nullable=False)
+    errors = db.Column(db.JSON)  # [{'row': n, 'error': '...'}], capped
+    message = db.Column(db.String(512))  # Why the whole job failed, if it did
+    created_by_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # Last progress save by the running import
+
+    created_by = db.relationship('User')
+
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+    @property
+    def progress(self):
+        """Percentage of rows processed"""
+        if not self.total_rows:
+            return 100 if self.is_finished else 0
+        return min(100, int(self.processed_rows * 100 / self.total_rows))
+
+    def __repr__(self):
+        return f'<ImportJob {self.id} {self.table_name} {self.status}>'
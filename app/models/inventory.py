@@ -5,6 +5,9 @@ from sqlalchemy import Table
 from sqlalchemy.orm import relationship
 from sqlalchemy import event
 from app.utils.activity_logger import log_activity
+from app.utils.category_tree import get_category_tree, register_category_listeners
+from app.utils.tag_stats import register_tag_listeners
+from app.utils.search import search_vector_type, html_to_text
 
 class Category(db.Model):
     __tablename__ = 'category'
@@ -19,8 +22,20 @@ class Category(db.Model):
                           lazy='dynamic')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    def _tree_node(self):
+        """Cached tree entry for this category, unless it has unsaved changes"""
+        if self.id is None:
+            return None
+        node = get_category_tree().get(self.id)
+        if node and node.name == self.name and node.parent_id == self.parent_id:
+            return node
+        return None
+
     def get_full_path(self):
         """Get the full hierarchical path of the category"""
+        node = self._tree_node()
+        if node:
+            return node.full_path
         path = [self.name]
         current = self
         while current.parent:
@@ -30,6 +45,9 @@ class Category(db.Model):
 
     def get_display_name(self):
         """Get indented name for dropdown display"""
+        node = self._tree_node()
+        if node:
+            return node.get_display_name()
         depth = 0
         current = self
         while current.parent:
@@ -39,20 +57,14 @@ class Category(db.Model):
 
     @staticmethod
     def get_ordered_categories():
-        """Get categories in hierarchical order for dropdowns"""
-        def build_hierarchy(parent_id=None, level=0):
-            categories = []
-            query = Category.query.filter_by(parent_id=parent_id).order_by(Category.name)
-            
-            for category in query.all():
-                category.level = level  # Add level info for template
-                categories.append(category)
-                # Recursively get children
-                categories.extend(build_hierarchy(category.id, level + 1))
-            
-            return categories
-            
-        return build_hierarchy()
+        """Get categories in hierarchical order for dropdowns
+
+        Served from the in-process category tree cache, so this costs at
+        most one query regardless of the number of categories.
+        """
+        return list(get_category_tree().ordered)
+
+register_category_listeners(Category)
 
 item_tags = db.Table('item_tags',
     db.Column('item_id', db.Integer, db.ForeignKey('items.id', ondelete='CASCADE'), primary_key=True),
@@ -76,6 +88,10 @@ class Tag(db.Model):
 
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Supports keyset pagination of an item's transaction history
+        db.Index('ix_transactions_item_id_created_at_id', 'item_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     item_id = db.Column(db.Integer, db.ForeignKey('items.id'))
@@ -94,7 +110,10 @@ class Transaction(db.Model):
 
 class InventoryItem(db.Model):
     __tablename__ = 'items'
-    
+    __table_args__ = (
+        db.Index('ix_items_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     tracking_id = db.Column(db.String(50), unique=True)
     upc = db.Column(db.String(50), unique=True, nullable=True)
@@ -118,6 +137,9 @@ class InventoryItem(db.Model):
     status = db.Column('status', db.String(50), default='available')
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     creator = db.relationship('User', backref='items_created')
+
+    # Maintained by a database trigger on PostgreSQL (see app.utils.search)
+    search_vector = db.deferred(db.Column(search_vector_type(), nullable=True))
     
     # Define the many-to-many relationship with Tag
     tags = db.relationship('Tag', 
@@ -161,12 +183,17 @@ class ComputerModel(db.Model):
 class ComputerSystem(db.Model):
     """Model for computer systems"""
     __tablename__ = 'computer_systems'
+    __table_args__ = (
+        # Supports keyset pagination of the dashboard systems listing
+        db.Index('ix_computer_systems_created_at_id', 'created_at', 'id'),
+        db.Index('ix_computer_systems_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     tracking_id = db.Column(db.String(50), unique=True, nullable=False)
-    model_id = db.Column(db.Integer, db.ForeignKey('computer_model.id'))
+    model_id = db.Column(db.Integer, db.ForeignKey('computer_model.id'), index=True)
     serial_tag = db.Column(db.String(100))
-    status = db.Column(db.String(50), default='available')  # available, checked_out, maintenance, retired
+    status = db.Column(db.String(50), default='available', index=True)  # available, checked_out, maintenance, retired
     storage_location = db.Column(db.String(100))
     notes = db.Column(db.Text)
     cpu_id = db.Column(db.Integer, db.ForeignKey('cpu.id'))
@@ -197,6 +224,9 @@ class ComputerSystem(db.Model):
     # Price field
     sell_price = db.Column(db.Numeric(10, 2))
 
+    # Maintained by a database trigger on PostgreSQL (see app.utils.search)
+    search_vector = db.deferred(db.Column(search_vector_type(), nullable=True))
+
     # Relationships
     model = relationship('ComputerModel', backref='systems')
     cpu = relationship('CPU', backref='systems')
@@ -215,6 +245,8 @@ class ComputerSystem(db.Model):
     def __repr__(self):
         return f'<ComputerSystem {self.tracking_id}>'
 
+register_tag_listeners(Tag, [InventoryItem, ComputerSystem])
+
 class BenchmarkResult(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     system_id = db.Column(db.Integer, db.ForeignKey('computer_systems.id'))
@@ -236,9 +268,16 @@ class WikiCategory(db.Model):
 
 class WikiPage(db.Model):
     __tablename__ = 'wiki_page'
+    __table_args__ = (
+        db.Index('ix_wiki_page_search_vector', 'search_vector', postgresql_using='gin'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
+    # Content with the HTML stripped, kept in step with content on every save
+    plain_text = db.deferred(db.Column(db.Text, nullable=True))
+    # Maintained by a database trigger on PostgreSQL (see app.utils.search)
+    search_vector = db.deferred(db.Column(search_vector_type(), nullable=True))
     category_id = db.Column(db.Integer, db.ForeignKey('wiki_category.id'), nullable=False)
     author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -250,6 +289,11 @@ class WikiPage(db.Model):
     def __repr__(self):
         return f'<WikiPage {self.title}>'
 
+    @db.validates('content')
+    def _set_plain_text(self, key, content):
+        self.plain_text = html_to_text(content)
+        return content
+
     def can_edit(self, user):
         """Check if user can edit this page"""
         return user.is_admin or user.id == self.author_id
@@ -0,0 +1,12 @@
+"""Tracking ID Allocation Model"""
+from app import db
+
+class TrackingIdCounter(db.Model):
+    """Single-row counter from which blocks of tracking IDs are reserved"""
+    __tablename__ = 'tracking_id_counter'
+
+    id = db.Column(db.Integer, primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+
+    def __repr__(self):
+        return f'<TrackingIdCounter next={self.next_value}>'
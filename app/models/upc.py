@@ -0,0 +1,21 @@
+"""UPC Lookup Cache Model"""
+from app import db
+from datetime import datetime
+
+class UpcLookup(db.Model):
+    """Cached UPCItemDB lookup result, shared by all workers"""
+    __tablename__ = 'upc_lookups'
+
+    id = db.Column(db.Integer, primary_key=True)
+    upc = db.Column(db.String(50), unique=True, nullable=False)
+    found = db.Column(db.Boolean, nullable=False, default=False)
+    item_data = db.Column(db.JSON)  # First item of the UPCItemDB response
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= datetime.utcnow()
+
+    def __repr__(self):
+        return f'<UpcLookup {self.upc} found={self.found}>'
@@ -1,7 +1,11 @@
 from app import db, login_manager
+from flask import current_app
 from flask_login import UserMixin
 import bcrypt
+import hashlib
+import hmac
 from datetime import datetime
+from app.utils.mobile_principals import register_principal_listeners
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -12,7 +16,10 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     pin_hash = db.Column(db.String(255))
+    pin_fingerprint = db.Column(db.String(64), index=True)
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    # Carried in mobile API tokens; bumped to revoke every token issued so far
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     def set_password(self, password):
         """Hash password using bcrypt"""
@@ -20,6 +27,7 @@ class User(UserMixin, db.Model):
             password.encode('utf-8'), 
             bcrypt.gensalt()
         ).decode('utf-8')
+        self.revoke_tokens()
     
     def check_password(self, password):
         """Verify password using bcrypt"""
@@ -40,19 +48,70 @@ class User(UserMixin, db.Model):
             pin.encode('utf-8'),
             bcrypt.gensalt()
         ).decode('utf-8')
+        self.pin_fingerprint = User.pin_fingerprint_for(pin)
+        self.revoke_tokens()
+
+    def revoke_tokens(self):
+        """Invalidate the mobile API tokens issued to this user"""
+        self.token_version = (self.token_version or 0) + 1
     
     def check_pin(self, pin):
         """Verify PIN code"""
         if not self.pin_hash:
             return False
         try:
-            return bcrypt.checkpw(
+            valid = bcrypt.checkpw(
                 pin.encode('utf-8'),
                 self.pin_hash.encode('utf-8')
             )
         except Exception as e:
             print(f"PIN check error: {e}")
             return False
+        if valid and not self.pin_fingerprint:
+            # Backfill fingerprints for PINs set before they existed
+            self.pin_fingerprint = User.pin_fingerprint_for(pin)
+        return valid
+
+    @staticmethod
+    def pin_fingerprint_for(pin):
+        """Keyed HMAC of a PIN, used to find its owner without bcrypt
+
+        The key (PIN_FINGERPRINT_KEY, falling back to SECRET_KEY) is kept out
+        of the database, so the fingerprints alone can't be brute forced.
+        Changing the key requires clearing the pin_fingerprint column.
+        """
+        key = current_app.config.get('PIN_FINGERPRINT_KEY') or current_app.config['SECRET_KEY']
+        return hmac.new(
+            key.encode('utf-8'),
+            pin.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def find_by_pin(pin):
+        """Find the user owning a PIN
+
+        Candidates are looked up by PIN fingerprint, so only users sharing
+        the fingerprint are bcrypt-verified. Users whose PIN predates
+        fingerprints are all checked as a fallback, so none of them is locked
+        out, and get their fingerprint filled in on success; the caller is
+        responsible for committing. Each kiosk or mobile PIN login shrinks the
+        fallback, and once no such users remain (or an admin runs
+        ``flask expire-legacy-pins``) a wrong PIN costs one indexed lookup.
+        """
+        candidates = User.query.filter_by(pin_fingerprint=User.pin_fingerprint_for(pin)).all()
+        for user in candidates:
+            if user.check_pin(pin):
+                return user
+
+        legacy_users = User.query.filter(
+            User.pin_hash != None,
+            User.pin_fingerprint == None
+        ).all()
+        for user in legacy_users:
+            if user.check_pin(pin):
+                return user
+        return None
 
     @property
     def role(self):
@@ -64,6 +123,8 @@ class User(UserMixin, db.Model):
         """Set is_admin based on role value"""
         self.is_admin = (value == 'admin')
 
+register_principal_listeners(User)
+
 @login_manager.user_loader
 def load_user(id):
     return User.query.get(int(id)) 
\ No newline at end of file
@@ -1,28 +1,62 @@
 from flask import (
     Blueprint, render_template, request, flash, redirect, 
-    url_for, jsonify, send_file, make_response, current_app
+    url_for, jsonify, make_response, current_app,
+    Response, stream_with_context
 )
 from flask_login import login_required, current_user
 from app.models.config import Configuration
 from app.models.inventory import (
     InventoryItem, ComputerSystem, Category, 
-    ComputerModel, CPU, Transaction
+    ComputerModel, CPU, Transaction, Tag
 )
 from app.routes.inventory import admin_required
 from app import db
 from app.models.user import User
-import subprocess
 from datetime import datetime, timedelta
 import os
-from urllib.parse import urlparse
 import csv
 import io
-from sqlalchemy import create_engine
-import uuid
-from app.utils.logs import get_recent_logs
+from app.utils.backup import (
+    BACKUP_FORMATS, BackupError, backup_filename, backup_mimetype, stream_pg_dump,
+    backup_settings, last_successful_run, next_backup_at
+)
+from app.utils.csv_export import iter_table_csv, table_has_rows
+from app.utils.csv_import import IMPORT_TABLES, create_import_job, fail_if_stale, start_import
+from app.utils.logs import tail_logs, read_entries_forward, merge_entries, export_chunks
+from app.models.activity import Activity
+from app.models.backup import BackupRun
+from app.models.imports import ImportJob
+from app.utils.activity_logger import ACTION_TAGS, format_log_line, local_to_utc
 
 bp = Blueprint('admin', __name__)
 
+# (configuration key, form field, default, description) saved by manage_config
+CONFIG_FIELDS = [
+    # User Management Settings
+    ('allow_public_registration', 'allow_registration', 'false', 'Allow public user registration'),
+    ('require_email_verification', 'require_email_verification', 'false', 'Require email verification for new users'),
+    ('allow_password_reset', 'allow_password_reset', 'false', 'Allow users to reset passwords via email'),
+    # Inventory Settings
+    ('items_per_page', 'items_per_page', '20', 'Number of items to display per page'),
+    ('enable_barcode_scanner', 'enable_barcode_scanner', 'false', 'Enable barcode scanning functionality'),
+    ('enable_low_stock_alerts', 'enable_low_stock_alerts', 'false', 'Enable low stock alerts'),
+    ('stock_alert_email', 'stock_alert_email', '', 'Email address for low stock alerts'),
+    # Email Settings
+    ('smtp_server', 'smtp_server', '', 'SMTP server address'),
+    ('smtp_port', 'smtp_port', '587', 'SMTP server port'),
+    ('smtp_username', 'smtp_username', '', 'SMTP username'),
+    ('smtp_password', 'smtp_password', '', 'SMTP password'),
+    ('notification_email', 'notification_email', '', 'Email address for system notifications'),
+]
+
+# (configuration key and form field, default, description) saved by save_backup_settings
+BACKUP_CONFIG_FIELDS = [
+    ('auto_backup_enabled', 'false', 'Enable automatic database backups'),
+    ('backup_frequency', 'daily', 'Frequency of automatic backups'),
+    ('backup_retention_days', '30', 'Number of days to retain backups'),
+    ('backup_time', '00:00', 'Time to run automatic backups'),
+]
+
 @bp.route('/admin/users')
 @login_required
 @admin_required
@@ -146,73 +180,11 @@ def manage_config():
             # Debug: Log form data
             current_app.logger.debug(f"Form data: {request.form}")
 
-            # User Management Settings
-            Configuration.set_value(
-                'allow_public_registration',
-                request.form.get('allow_registration', 'false'),
-                'Allow public user registration'
-            )
-            Configuration.set_value(
-                'require_email_verification',
-                request.form.get('require_email_verification', 'false'),
-                'Require email verification for new users'
-            )
-            Configuration.set_value(
-                'allow_password_reset',
-                request.form.get('allow_password_reset', 'false'),
-                'Allow users to reset passwords via email'
-            )
-
-            # Inventory Settings
-            Configuration.set_value(
-                'items_per_page',
-                request.form.get('items_per_page', '20'),
-                'Number of items to display per page'
-            )
-            Configuration.set_value(
-                'enable_barcode_scanner',
-                request.form.get('enable_barcode_scanner', 'false'),
-                'Enable barcode scanning functionality'
-            )
-            Configuration.set_value(
-                'enable_low_stock_alerts',
-                request.form.get('enable_low_stock_alerts', 'false'),
-                'Enable low stock alerts'
-            )
-            Configuration.set_value(
-                'stock_alert_email',
-                request.form.get('stock_alert_email', ''),
-                'Email address for low stock alerts'
-            )
-
-            # Email Settings
-            Configuration.set_value(
-                'smtp_server',
-                request.form.get('smtp_server', ''),
-                'SMTP server address'
+            # Save every setting in one upsert and one transaction
+            Configuration.set_many(
+                {key: request.form.get(field, default) for key, field, default, _ in CONFIG_FIELDS},
+                descriptions={key: description for key, _, _, description in CONFIG_FIELDS}
             )
-            Configuration.set_value(
-                'smtp_port',
-                request.form.get('smtp_port', '587'),
-                'SMTP server port'
-            )
-            Configuration.set_value(
-                'smtp_username',
-                request.form.get('smtp_username', ''),
-                'SMTP username'
-            )
-            Configuration.set_value(
-                'smtp_password',
-                request.form.get('smtp_password', ''),
-                'SMTP password'
-            )
-            Configuration.set_value(
-                'notification_email',
-                request.form.get('notification_email', ''),
-                'Email address for system notifications'
-            )
-
-            db.session.commit()
 
             # Return JSON response for AJAX request
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -247,59 +219,66 @@ def manage_config():
 
     return render_template('admin/config.html', **settings)
 
+# Log files shown by the viewer; rotated app.log.N backups are included automatically
+LOG_FILES = ['logs/app.log', 'logs/activity.log']
+
+def filter_activity_query(args):
+    """
+    Apply the log viewer's activity filters: start_date/end_date (local
+    YYYY-MM-DD, inclusive), user (id), action and item (tracking ID or
+    other identifier).
+    """
+    query = Activity.query
+    start_date = args.get('start_date')
+    if start_date:
+        query = query.filter(Activity.timestamp >= local_to_utc(datetime.strptime(start_date, '%Y-%m-%d')))
+    end_date = args.get('end_date')
+    if end_date:
+        end = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+        query = query.filter(Activity.timestamp < local_to_utc(end))
+    user_id = args.get('user', type=int)
+    if user_id:
+        query = query.filter(Activity.user_id == user_id)
+    action = args.get('action')
+    if action:
+        query = query.filter(Activity.action == action)
+    item = args.get('item', '').strip()
+    if item:
+        query = query.filter(Activity.item_identifier == item)
+    return query
+
 @bp.route('/admin/logs')
 @login_required
 @admin_required
 def view_logs():
     try:
-        logs = []
-        log_start_date = None
-        log_end_date = None
-        
-        # Read from both log files
-        log_files = ['logs/app.log', 'logs/activity.log']
-        
-        for log_file in log_files:
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    file_logs = f.readlines()
-                    logs.extend(file_logs)
-        
-        # Sort all logs by timestamp
-        def get_log_timestamp(log):
-            try:
-                date_str = log.split('[')[0].strip()
-                return datetime.strptime(date_str, '%Y-%m-%d %I:%M:%S %p')
-            except:
-                return datetime.min
-        
-        logs.sort(key=get_log_timestamp, reverse=True)
-        
-        # Get last 100 lines
-        logs = logs[:100]
+        # Newest 100 entries, read backwards from the end of the application log
+        # (and its rotated backups) and of activity.log from before activity
+        # moved to the database
+        entries = tail_logs(LOG_FILES, max_lines=100)
+        logs = [entry for _, entry in entries]
         
         # Get log date range
-        if logs:
-            # Parse dates from log entries
-            for log in logs:
-                try:
-                    date_str = log.split('[')[0].strip()
-                    date = datetime.strptime(date_str, '%Y-%m-%d %I:%M:%S %p')
-                    if log_start_date is None or date < log_start_date:
-                        log_start_date = date
-                    if log_end_date is None or date > log_end_date:
-                        log_end_date = date
-                except:
-                    continue
+        log_start_date = entries[-1][0] if entries else None
+        log_end_date = entries[0][0] if entries else None
         
         # Format dates for template
         log_start_date = log_start_date.strftime('%Y-%m-%d') if log_start_date else datetime.now().strftime('%Y-%m-%d')
         log_end_date = log_end_date.strftime('%Y-%m-%d') if log_end_date else datetime.now().strftime('%Y-%m-%d')
         
-        return render_template('admin/logs.html', logs=logs, log_start_date=log_start_date, log_end_date=log_end_date)
+        # Most recent activity matching the filters, from the indexed activity table
+        activities = filter_activity_query(request.args).options(db.joinedload(Activity.user))\
+            .order_by(Activity.timestamp.desc(), Activity.id.desc())\
+            .limit(100)\
+            .all()
+        actions = sorted(set(ACTION_TAGS) | {'add', 'update', 'delete', 'checkout', 'mobile_checkout', 'kiosk_checkout', 'import'})
+        users = User.query.order_by(User.username).all()
+        
+        return render_template('admin/logs.html', logs=logs, log_start_date=log_start_date, log_end_date=log_end_date,
+                               activities=activities, actions=actions, users=users)
     except Exception as e:
         current_app.logger.error(f"Error viewing logs: {str(e)}")
-        return render_template('admin/logs.html', logs=["Error loading logs"])
+        return render_template('admin/logs.html', logs=["Error loading logs"], activities=[], actions=[], users=[])
 
 @bp.route('/admin/logs/download', methods=['POST'])
 @login_required
@@ -311,45 +290,29 @@ def download_logs():
         # Add one day to end_date to include the entire day
         end_date = end_date + timedelta(days=1)
         
-        filtered_logs = []
-        log_files = ['logs/app.log', 'logs/activity.log']
+        # Activity rows in the range, narrowed by any user/action/item filters
+        activity_query = filter_activity_query(request.form).order_by(Activity.timestamp, Activity.id)
+        activity_entries = ((activity.local_timestamp, format_log_line(activity))
+                            for activity in activity_query.yield_per(500))
         
-        for log_file in log_files:
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            date_str = line.split('[')[0].strip()
-                            log_date = datetime.strptime(date_str, '%Y-%m-%d %I:%M:%S %p')
-                            if start_date <= log_date <= end_date:
-                                filtered_logs.append(line)
-                        except:
-                            continue
-        
-        # Sort filtered logs by timestamp
-        def get_log_timestamp(log):
-            try:
-                date_str = log.split('[')[0].strip()
-                return datetime.strptime(date_str, '%Y-%m-%d %I:%M:%S %p')
-            except:
-                return datetime.min
-        
-        filtered_logs.sort(key=get_log_timestamp, reverse=True)
-        
-        # Create in-memory file
-        mem_file = io.StringIO()
-        mem_file.write(''.join(filtered_logs))
-        mem_file.seek(0)
+        # Each log file is entered at the start date by binary search and all
+        # sources are merged oldest first, so nothing is held in memory
+        streams = [read_entries_forward(log_file, start_date, end_date) for log_file in LOG_FILES]
+        entries = merge_entries(streams + [activity_entries])
+        
+        compress = request.form.get('compress') == 'on'
         
         # Generate filename with date range
         filename = f"logs_{start_date.strftime('%Y%m%d')}_to_{end_date.strftime('%Y%m%d')}.log"
+        if compress:
+            filename += '.gz'
         
-        return send_file(
-            io.BytesIO(mem_file.getvalue().encode('utf-8')),
-            mimetype='text/plain',
-            as_attachment=True,
-            download_name=filename
+        response = Response(
+            stream_with_context(export_chunks(entries, compress=compress)),
+            mimetype='application/gzip' if compress else 'text/plain'
         )
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
         
     except Exception as e:
         current_app.logger.error(f"Error downloading logs: {str(e)}")
@@ -361,77 +324,46 @@ def download_logs():
 def backup():
     if request.method == 'POST':
         try:
-            # Create pg_dump command
-            db_url = current_app.config['DATABASE_URL']
-            parsed = urlparse(db_url)
-            
-            # Extract database connection info
-            dbname = parsed.path[1:]  # Remove leading slash
-            user = parsed.username
-            password = parsed.password
-            host = parsed.hostname
-            port = parsed.port or 5432
-            
-            # Set environment variables for pg_dump
-            env = os.environ.copy()
-            env['PGPASSWORD'] = password
+            fmt = request.form.get('format', 'plain')
+            if fmt not in BACKUP_FORMATS:
+                fmt = 'plain'
+            compress = request.form.get('compress') == 'on'
             
             # Generate timestamp for filename
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'tc_inventory_backup_{timestamp}.sql'
-            
-            # Create pg_dump command
-            command = [
-                'pg_dump',
-                '-h', host,
-                '-p', str(port),
-                '-U', user,
-                '-F', 'p',  # Plain text format
-                '-f', filename,
-                dbname
-            ]
-            
-            current_app.logger.info(f"Executing backup command: {' '.join(command)}")
+            filename = backup_filename(timestamp, fmt, compress)
             
-            # Execute pg_dump
-            result = subprocess.run(command, env=env, capture_output=True, text=True)
+            current_app.logger.info(f"Starting {fmt} backup {filename}")
             
-            if result.returncode == 0:
-                current_app.logger.info("Backup file created successfully")
-                # Read the backup file
-                with open(filename, 'rb') as f:
-                    backup_data = f.read()
-                
-                # Delete the temporary file
-                os.remove(filename)
-                current_app.logger.info("Temporary backup file deleted")
-                
-                # Create response with file download
-                response = make_response(backup_data)
-                response.headers['Content-Type'] = 'application/sql'
-                response.headers['Content-Disposition'] = f'attachment; filename={filename}'
-                
-                flash('Backup created successfully!', 'success')
-                return response
-            else:
-                error_msg = f'Backup failed: {result.stderr}'
-                current_app.logger.error(error_msg)
-                flash(error_msg, 'danger')
-                
+            # pg_dump's output is piped straight into the response
+            chunks = stream_pg_dump(current_app.config['DATABASE_URL'], fmt, compress)
+            response = Response(chunks, mimetype=backup_mimetype(fmt, compress))
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+            return response
+        
+        except BackupError as e:
+            error_msg = f'Backup failed: {str(e)}'
+            current_app.logger.error(error_msg)
+            flash(error_msg, 'danger')
         except Exception as e:
             error_msg = f'Error creating backup: {str(e)}'
             current_app.logger.error(error_msg)
             flash(error_msg, 'danger')
     
     # Get backup settings from configuration
-    backup_settings = {
-        'auto_backup_enabled': Configuration.get_value('auto_backup_enabled', 'false'),
-        'backup_frequency': Configuration.get_value('backup_frequency', 'daily'),
-        'backup_retention_days': Configuration.get_value('backup_retention_days', '30'),
-        'backup_time': Configuration.get_value('backup_time', '00:00'),
-    }
+    settings = backup_settings()
+    
+    # Status of the scheduled backup runner (flask backup-scheduler)
+    recent_runs = BackupRun.query.order_by(BackupRun.started_at.desc()).limit(10).all()
+    next_backup = None
+    if settings['auto_backup_enabled'] == 'true':
+        last_success = last_successful_run()
+        last_run_at = last_success.local_started_at if last_success else None
+        next_backup = next_backup_at(datetime.now(), last_run_at,
+                                     settings['backup_frequency'], settings['backup_time'])
     
-    return render_template('admin/backup.html', settings=backup_settings)
+    return render_template('admin/backup.html', settings=settings,
+                           recent_runs=recent_runs, next_backup=next_backup)
 
 @bp.route('/admin/backup/settings', methods=['POST'])
 @login_required
@@ -439,36 +371,10 @@ def backup():
 def save_backup_settings():
     try:
         # Update configuration settings
-        Configuration.query.filter_by(key='auto_backup_enabled').delete()
-        Configuration.query.filter_by(key='backup_frequency').delete()
-        Configuration.query.filter_by(key='backup_retention_days').delete()
-        Configuration.query.filter_by(key='backup_time').delete()
-        
-        db.session.add(Configuration(
-            key='auto_backup_enabled',
-            value=request.form.get('auto_backup_enabled', 'false'),
-            description='Enable automatic database backups'
-        ))
-        
-        db.session.add(Configuration(
-            key='backup_frequency',
-            value=request.form.get('backup_frequency', 'daily'),
-            description='Frequency of automatic backups'
-        ))
-        
-        db.session.add(Configuration(
-            key='backup_retention_days',
-            value=request.form.get('backup_retention_days', '30'),
-            description='Number of days to retain backups'
-        ))
-        
-        db.session.add(Configuration(
-            key='backup_time',
-            value=request.form.get('backup_time', '00:00'),
-            description='Time to run automatic backups'
-        ))
-        
-        db.session.commit()
+        Configuration.set_many(
+            {key: request.form.get(key, default) for key, default, _ in BACKUP_CONFIG_FIELDS},
+            descriptions={key: description for key, _, description in BACKUP_CONFIG_FIELDS}
+        )
         flash('Backup settings updated successfully!', 'success')
         
     except Exception as e:
@@ -488,62 +394,42 @@ def export_table():
             flash('Please select a table to export', 'danger')
             return redirect(url_for('admin.backup'))
         
-        # Create database connection
-        db_url = current_app.config['DATABASE_URL']
-        engine = create_engine(db_url)
-        
         # Define table mappings
         table_mappings = {
             'items': InventoryItem,
             'computer_systems': ComputerSystem,
             'categories': Category,
+            'tags': Tag,
             'computer_models': ComputerModel,
             'cpus': CPU,
             'users': User,
-            'transactions': Transaction
+            'transactions': Transaction,
+            'inventory_transactions': Transaction
         }
         
         if table_name not in table_mappings:
             flash('Invalid table selected', 'danger')
             return redirect(url_for('admin.backup'))
         
-        # Get model class
-        model = table_mappings[table_name]
-        
-        # Query data
-        data = model.query.all()
+        # Get the table behind the model
+        table = table_mappings[table_name].__table__
         
-        if not data:
+        if not table_has_rows(table):
             flash('No data found in selected table', 'warning')
             return redirect(url_for('admin.backup'))
         
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        headers = [column.name for column in model.__table__.columns]
-        writer.writerow(headers)
-        
-        # Write data
-        for row in data:
-            csv_row = []
-            for header in headers:
-                value = getattr(row, header)
-                # Handle relationships and complex types
-                if hasattr(value, 'name'):  # For foreign key relations that have a name
-                    value = value.name
-                elif isinstance(value, datetime):  # Format datetime
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                csv_row.append(str(value) if value is not None else '')
-            writer.writerow(csv_row)
-        
-        # Create the response
-        output.seek(0)
+        compress = request.form.get('compress') == 'on'
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename={table_name}_{timestamp}.csv'
+        filename = f'{table_name}_{timestamp}.csv'
+        if compress:
+            filename += '.gz'
+        
+        # Rows are streamed from a server-side cursor as they are written
+        response = Response(
+            stream_with_context(iter_table_csv(table, compress=compress)),
+            mimetype='application/gzip' if compress else 'text/csv'
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
         
         return response
         
@@ -563,27 +449,7 @@ def download_template():
             flash('Please select a table', 'danger')
             return redirect(url_for('admin.backup'))
         
-        # Define template fields for each table
-        template_fields = {
-            'items': [
-                'name', 'category_id', 'quantity', 'reorder_threshold',
-                'storage_location', 'barcode', 'manufacturer', 'mpn',
-                'image_url', 'description', 'cost', 'sell_price',
-                'purchase_url'
-            ],
-            'computer_systems': [
-                'model_id', 'cpu_id', 'ram', 'storage', 'os',
-                'storage_location', 'serial_tag', 'cpu_benchmark',
-                'usb_ports_status', 'usb_ports_notes', 'video_status',
-                'video_notes', 'network_status', 'network_notes',
-                'general_notes'
-            ],
-            'categories': ['name'],
-            'computer_models': ['manufacturer', 'model_name', 'model_type'],
-            'cpus': ['manufacturer', 'model', 'speed', 'cores']
-        }
-        
-        if table_name not in template_fields:
+        if table_name not in IMPORT_TABLES:
             flash('Invalid table selected', 'danger')
             return redirect(url_for('admin.backup'))
         
@@ -591,26 +457,9 @@ def download_template():
         output = io.StringIO()
         writer = csv.writer(output)
         
-        # Write headers
-        writer.writerow(template_fields[table_name])
-        
-        # Add example row
-        example_data = {
-            'items': [
-                'Example Item', '1', '10', '5', 'Shelf A1', '123456789',
-                'Example Mfr', 'MPN123', '', 'Example description',
-                '10.99', '15.99', ''
-            ],
-            'computer_systems': [
-                '1', '1', '16GB', '512GB SSD', 'Windows 10 Pro',
-                'Room 101', 'ABC123', '1000', 'PASSED', '',
-                'PASSED', '', 'PASSED', '', 'Test notes'
-            ],
-            'categories': ['Example Category'],
-            'computer_models': ['Dell', 'Latitude 5520', 'laptop'],
-            'cpus': ['Intel', 'Core i7-11800H', '2.30 GHz', '8']
-        }
-        writer.writerow(example_data[table_name])
+        # Write headers and an example row
+        writer.writerow(IMPORT_TABLES[table_name]['fields'])
+        writer.writerow(IMPORT_TABLES[table_name]['example'])
         
         # Create the response
         output.seek(0)
@@ -649,77 +498,17 @@ def import_table():
             flash('Please upload a CSV file', 'danger')
             return redirect(url_for('admin.backup'))
         
-        # Define model mappings
-        model_mappings = {
-            'items': InventoryItem,
-            'computer_systems': ComputerSystem,
-            'categories': Category,
-            'computer_models': ComputerModel,
-            'cpus': CPU
-        }
-        
-        if table_name not in model_mappings:
+        if table_name not in IMPORT_TABLES:
             flash('Invalid table selected', 'danger')
             return redirect(url_for('admin.backup'))
         
-        # Get model class
-        model = model_mappings[table_name]
-        
-        # Read CSV file
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
+        # The upload is saved to disk and processed in batches, in the
+        # background unless IMPORT_IN_BACKGROUND is off
+        job = create_import_job(table_name, file, dry_run=request.form.get('dry_run') == 'on',
+                                created_by_id=current_user.id)
+        start_import(job)
         
-        # Start transaction
-        try:
-            # Track statistics
-            rows_added = 0
-            errors = []
-            
-            for row in csv_reader:
-                try:
-                    # Clean up the row data
-                    data = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
-                    
-                    # Handle special cases
-                    if table_name == 'items':
-                        # Generate tracking ID
-                        data['tracking_id'] = f"TC-{str(uuid.uuid4())[:8].upper()}"
-                        data['created_by'] = current_user.id
-                        data['created_at'] = datetime.now()
-                        
-                        # Convert numeric fields
-                        if data.get('cost'):
-                            data['cost'] = float(data['cost']) if data['cost'] else None
-                        if data.get('sell_price'):
-                            data['sell_price'] = float(data['sell_price']) if data['sell_price'] else None
-                        if data.get('quantity'):
-                            data['quantity'] = int(data['quantity'])
-                        if data.get('reorder_threshold'):
-                            data['reorder_threshold'] = int(data['reorder_threshold'])
-                    
-                    # Create new record
-                    record = model(**data)
-                    db.session.add(record)
-                    rows_added += 1
-                    
-                except Exception as row_error:
-                    errors.append(f"Row {rows_added + 1}: {str(row_error)}")
-            
-            if errors:
-                # Rollback if there were any errors
-                db.session.rollback()
-                error_list = "\n".join(errors)
-                flash(f'Import failed with errors:\n{error_list}', 'danger')
-            else:
-                # Commit if all rows were successful
-                db.session.commit()
-                flash(f'Successfully imported {rows_added} records', 'success')
-            
-        except Exception as e:
-            db.session.rollback()
-            flash(f'Error during import: {str(e)}', 'danger')
-        
-        return redirect(url_for('admin.backup'))
+        return redirect(url_for('admin.import_job', job_id=job.id))
         
     except Exception as e:
         error_msg = f'Error importing data: {str(e)}'
@@ -727,6 +516,48 @@ def import_table():
         flash(error_msg, 'danger')
         return redirect(url_for('admin.backup'))
 
+@bp.route('/admin/import-jobs/<int:job_id>')
+@login_required
+@admin_required
+def import_job(job_id):
+    job = ImportJob.query.get_or_404(job_id)
+    fail_if_stale(job)
+    return render_template('admin/import_job.html', job=job)
+
+@bp.route('/admin/import-jobs/<int:job_id>/status')
+@login_required
+@admin_required
+def import_job_status(job_id):
+    job = ImportJob.query.get_or_404(job_id)
+    fail_if_stale(job)
+    return jsonify({
+        'status': job.status,
+        'progress': job.progress,
+        'processed_rows': job.processed_rows,
+        'total_rows': job.total_rows,
+        'imported_rows': job.imported_rows,
+        'error_count': job.error_count
+    })
+
+@bp.route('/admin/import-jobs/<int:job_id>/run', methods=['POST'])
+@login_required
+@admin_required
+def run_import_job(job_id):
+    """Import the file of a finished dry run without uploading it again"""
+    dry_run_job = ImportJob.query.get_or_404(job_id)
+    if not dry_run_job.dry_run or not dry_run_job.upload_path or not os.path.exists(dry_run_job.upload_path):
+        flash('This upload is no longer available; please upload the file again', 'danger')
+        return redirect(url_for('admin.backup'))
+    
+    job = ImportJob(table_name=dry_run_job.table_name, filename=dry_run_job.filename,
+                    upload_path=dry_run_job.upload_path, created_by_id=current_user.id)
+    dry_run_job.upload_path = None
+    db.session.add(job)
+    db.session.commit()
+    start_import(job)
+    
+    return redirect(url_for('admin.import_job', job_id=job.id))
+
 @bp.route('/config/read_only_mode', methods=['POST'])
 @login_required
 @admin_required
@@ -1,30 +1,19 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app, send_file, session
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app, send_file, session, abort
 from flask_login import login_required, current_user
 from flask_wtf import FlaskForm
 from app.models.inventory import (
     InventoryItem, ComputerSystem, Category, 
-    Transaction, ComputerModel, CPU, Tag, item_tags,
+    Transaction, ComputerModel, CPU, Tag,
     WikiPage, WikiCategory, PurchaseLink, SystemPurchaseLink
 )
-from app.models.config import Configuration
-from app.utils.email import send_stock_alert
 from app.forms import (
     ComputerModelForm, CPUForm, GeneralItemForm, InventoryItemForm,
     ComputerSystemForm, MANUFACTURER_CHOICES, 
     COMPUTER_TYPES, CategoryForm
 )
 from app import db
-import uuid
-from barcode import Code128
-from barcode.writer import ImageWriter
-import qrcode
-import io
-import base64
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.graphics.barcode import code128
+import re
+import tempfile
 from app.models.user import User
 import requests
 from bs4 import BeautifulSoup
@@ -36,6 +25,18 @@ import time
 from werkzeug.security import generate_password_hash
 from functools import wraps
 from app.utils.activity_logger import log_inventory_activity, log_system_activity
+from app.utils.checkout import CheckoutError, checkout_cart, decrement_stock
+from app.utils.pagination import estimate_count, keyset_page
+from app.utils.search import (
+    item_search_filter, item_search_rank, system_search_filter,
+    search_wiki_pages, with_snippets
+)
+from app.utils.upc_lookup import fetch_upc, lookup_upc
+from app.utils.barcode_cache import SYMBOLOGIES, get_image_path
+from app.utils.label_pdf import write_labels_pdf
+from app.utils.stock_alerts import enqueue_stock_alert
+from app.utils.tracking_ids import next_tracking_id
+from app.utils.tag_stats import get_tag_stats, get_tag_choices
 from datetime import datetime
 from sqlalchemy import or_
 
@@ -60,93 +61,36 @@ def dashboard():
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config['ITEMS_PER_PAGE']
     
-    # Items query
-    items_query = InventoryItem.query
-    
-    # Items search
-    search = request.args.get('search', '')
-    if search:
-        items_query = items_query.filter(
-            db.or_(
-                InventoryItem.name.ilike(f'%{search}%'),
-                InventoryItem.tracking_id.ilike(f'%{search}%'),
-                InventoryItem.barcode.ilike(f'%{search}%')
-            )
-        )
-    
-    # Items category filter
-    category_id = request.args.get('category', type=int)
-    if category_id:
-        items_query = items_query.filter(InventoryItem.category_id == category_id)
-    
-    # Items status filter
-    status = request.args.get('status')
-    if status == 'restock':
-        items_query = items_query.filter(
-            db.and_(
-                InventoryItem.quantity <= InventoryItem.min_quantity,
-                InventoryItem.min_quantity != None
-            )
-        )
-    elif status:
-        items_query = items_query.filter(InventoryItem.status == status)
+    # Items query with the search/category/status filters applied
+    items_query = filter_items_query(InventoryItem.query, request.args)
+    if request.args.get('search'):
+        items_query = items_query.order_by(item_search_rank(request.args['search']).desc(), InventoryItem.id)
     
     # Items pagination
     items = items_query.paginate(page=page, per_page=per_page)
     
-    # Computer Systems query with eager loading of tags
-    systems_query = ComputerSystem.query.options(db.joinedload(ComputerSystem.tags))
-    
-    # Systems search
-    systems_search = request.args.get('search_systems', '')
-    if systems_search:
-        systems_query = systems_query.filter(
-            db.or_(
-                ComputerSystem.tracking_id.ilike(f'%{systems_search}%'),
-                ComputerSystem.serial_tag.ilike(f'%{systems_search}%')
-            )
-        )
-    
-    # Systems model filter
-    model_id = request.args.get('model', type=int)
-    if model_id:
-        systems_query = systems_query.filter(ComputerSystem.model_id == model_id)
-    
-    # Systems status filter
-    system_status = request.args.get('system_status')
-    if system_status:
-        systems_query = systems_query.filter(ComputerSystem.status == system_status)
-    
-    # Get all systems for DataTables with eager loading
-    systems = systems_query.all()
+    # Computer systems are fetched page by page by the systems table
+    # through inventory.systems_data, using the same filter arguments
     
     # Get categories and models for filter dropdowns
     categories = Category.get_ordered_categories()
     computer_models = ComputerModel.query.order_by(ComputerModel.manufacturer, ComputerModel.model_name).all()
     
     # Get Wiki pages
-    wiki_search = request.args.get('wiki_search', '')
+    wiki_search = request.args.get('wiki_search', '').strip()
     wiki_category = request.args.get('wiki_category', type=int)
     
     wiki_query = WikiPage.query
-    if wiki_search:
-        wiki_query = wiki_query.filter(
-            db.or_(
-                WikiPage.title.ilike(f'%{wiki_search}%'),
-                WikiPage.content.ilike(f'%{wiki_search}%')
-            )
-        )
     if wiki_category:
         wiki_query = wiki_query.filter_by(category_id=wiki_category)
     
-    wiki_pages = wiki_query.order_by(WikiPage.updated_at.desc()).limit(10).all()
+    wiki_pages = with_snippets(search_wiki_pages(wiki_query, wiki_search).limit(10).all(), wiki_search)
     wiki_categories = WikiCategory.query.order_by(WikiCategory.name).all()
     
     form = FlaskForm()  # For CSRF protection
     
     return render_template('inventory/dashboard.html',
                          items=items,
-                         systems=systems,
                          categories=categories,
                          computer_models=computer_models,
                          wiki_pages=wiki_pages,
@@ -154,12 +98,156 @@ def dashboard():
                          form=form,
                          active_tab=active_tab)
 
+# Sortable columns of the dashboard systems table, by DataTables column index
+SYSTEM_SORT_COLUMNS = {
+    0: [ComputerSystem.tracking_id],
+    1: [ComputerModel.manufacturer, ComputerModel.model_name],
+    2: [ComputerSystem.serial_tag],
+    3: [CPU.manufacturer, CPU.model],
+    4: [ComputerSystem.ram],
+    5: [ComputerSystem.storage],
+    6: [ComputerSystem.sell_price],
+    7: [ComputerSystem.storage_location],
+    8: [ComputerSystem.status]
+}
+
+def filter_items_query(query, args):
+    """Apply the dashboard items search/category/status filters to a query"""
+    search = args.get('search', '')
+    if search:
+        query = query.filter(item_search_filter(search))
+
+    category_id = args.get('category', type=int)
+    if category_id:
+        query = query.filter(InventoryItem.category_id == category_id)
+
+    status = args.get('status')
+    if status == 'restock':
+        query = query.filter(
+            db.and_(
+                InventoryItem.quantity <= InventoryItem.min_quantity,
+                InventoryItem.min_quantity != None
+            )
+        )
+    elif status:
+        query = query.filter(InventoryItem.status == status)
+
+    return query
+
+def filter_systems_query(query, args):
+    """Apply the dashboard systems search/model/status filters to a query"""
+    systems_search = args.get('search_systems', '')
+    if systems_search:
+        query = query.filter(system_search_filter(systems_search))
+
+    model_id = args.get('model', type=int)
+    if model_id:
+        query = query.filter(ComputerSystem.model_id == model_id)
+
+    system_status = args.get('system_status')
+    if system_status:
+        query = query.filter(ComputerSystem.status == system_status)
+
+    return query
+
+def system_row(system):
+    """Serialize a computer system for the dashboard systems table"""
+    return {
+        'id': system.id,
+        'tracking_id': system.tracking_id,
+        'model': f"{system.model.manufacturer} {system.model.model_name}" if system.model else '',
+        'serial_tag': system.serial_tag,
+        'cpu': f"{system.cpu.manufacturer} {system.cpu.model}" if system.cpu else '',
+        'ram': system.ram,
+        'storage': system.storage,
+        'sell_price': float(system.sell_price) if system.sell_price is not None else None,
+        'storage_location': system.storage_location,
+        'status': system.status,
+        'tags': [{'name': tag.name, 'color': tag.color} for tag in system.tags],
+        'view_url': url_for('inventory.view_system', id=system.id),
+        'edit_url': url_for('inventory.edit_system', id=system.id),
+        'delete_url': url_for('inventory.delete_system', id=system.id)
+    }
+
+@bp.route('/systems/data')
+@login_required
+def systems_data():
+    """
+    Server-side data source for the dashboard systems table.
+
+    Speaks the DataTables server-side protocol (draw/start/length/order).
+    With the default ordering (newest first) pages are fetched by keyset
+    on (created_at, id) when the client sends the ``cursor`` returned with
+    the previous page; explicit column sorts fall back to offset paging.
+    Row counts are estimated (see estimate_count) for the first page only;
+    later pages reuse the ``records_total``/``records_filtered`` the client
+    echoes back, so no page scans the whole fleet.
+    """
+    args = request.args
+    draw = args.get('draw', 0, type=int)
+    start = max(args.get('start', 0, type=int), 0)
+    length = args.get('length', current_app.config['ITEMS_PER_PAGE'], type=int)
+    length = min(max(length, 1), 100)
+    cursor = args.get('cursor')
+
+    base_query = ComputerSystem.query
+    filtered_query = filter_systems_query(base_query, args)
+
+    records_total = args.get('records_total', type=int)
+    records_filtered = args.get('records_filtered', type=int)
+    if not (cursor or start) or records_total is None or records_filtered is None:
+        records_total = estimate_count(base_query)
+        if filtered_query is base_query:
+            records_filtered = records_total
+        else:
+            records_filtered = estimate_count(filtered_query)
+
+    systems_query = filtered_query.options(
+        db.joinedload(ComputerSystem.model),
+        db.joinedload(ComputerSystem.cpu),
+        db.selectinload(ComputerSystem.tags)
+    )
+
+    next_cursor = None
+    sort_index = args.get('order[0][column]', type=int)
+    if sort_index in SYSTEM_SORT_COLUMNS:
+        descending = args.get('order[0][dir]') == 'desc'
+        ordering = []
+        for column in SYSTEM_SORT_COLUMNS[sort_index] + [ComputerSystem.id]:
+            ordering.append(column.desc() if descending else column.asc())
+        systems = systems_query.outerjoin(ComputerSystem.model)\
+            .outerjoin(ComputerSystem.cpu)\
+            .order_by(*ordering)\
+            .offset(start)\
+            .limit(length)\
+            .all()
+    elif cursor or start == 0:
+        systems, next_cursor = keyset_page(
+            systems_query,
+            [ComputerSystem.created_at, ComputerSystem.id],
+            cursor=cursor,
+            limit=length
+        )
+    else:
+        systems = systems_query.order_by(
+            ComputerSystem.created_at.desc(),
+            ComputerSystem.id.desc()
+        ).offset(start).limit(length).all()
+
+    return jsonify({
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [system_row(system) for system in systems],
+        'next_cursor': next_cursor
+    })
+
 @bp.route('/item/add', methods=['GET', 'POST'])
 @login_required
 def add_item():
     form = InventoryItemForm()
     form.category.choices = [(c.id, c.get_display_name()) for c in Category.get_ordered_categories()]
-    form.tags.choices = [(t.id, t.name) for t in Tag.query.order_by(Tag.name).all()]
+    form.tags.choices = get_tag_choices()
     
     if request.method == 'POST':
         try:
@@ -227,25 +315,30 @@ def view_item(id):
         db.joinedload(InventoryItem.transactions).joinedload(Transaction.user)
     ).get_or_404(id)
     
-    # Generate barcode
-    barcode_io = io.BytesIO()
-    Code128(item.tracking_id, writer=ImageWriter()).write(barcode_io)
-    barcode_base64 = base64.b64encode(barcode_io.getvalue()).decode()
-    
-    # Generate QR code
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(f"http://127.0.0.1:5001/item/{item.id}/view")
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    
-    qr_io = io.BytesIO()
-    qr_img.save(qr_io)
-    qr_base64 = base64.b64encode(qr_io.getvalue()).decode()
-    
-    return render_template('inventory/view_item.html', 
-                         item=item,
-                         barcode=barcode_base64,
-                         qr_code=qr_base64)
+    return render_template('inventory/view_item.html', item=item)
+
+@bp.route('/barcodes/<symbology>/<tracking_id>.png')
+@login_required
+def barcode_image(symbology, tracking_id):
+    """Serve a cached barcode or QR code image for a tracking ID"""
+    if symbology not in SYMBOLOGIES:
+        abort(404)
+    path, key = get_image_path(symbology, tracking_id)
+    if path is None:
+        abort(404)
+
+    # Behind a login, so only the browser may cache it. URLs versioned with
+    # the content key (see barcode_url) never change and are kept for good;
+    # anything else is revalidated against the ETag.
+    if request.args.get('v') == key:
+        response = send_file(path, mimetype='image/png', etag=key, conditional=True, max_age=31536000)
+        response.cache_control.immutable = True
+    else:
+        response = send_file(path, mimetype='image/png', etag=key, conditional=True, max_age=0)
+        response.cache_control.no_cache = True
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
 
 @bp.route('/item/<int:id>/label')
 @login_required
@@ -256,15 +349,8 @@ def print_label(id):
         item = ComputerSystem.query.get_or_404(id)
         item.type = 'computer_system'  # Add type attribute for template
     
-    # Generate barcode image
-    barcode_io = io.BytesIO()
-    Code128(item.tracking_id, writer=ImageWriter()).write(barcode_io)
-    barcode_base64 = base64.b64encode(barcode_io.getvalue()).decode()
-    
     # Return the print template
-    return render_template('inventory/print_label.html',
-                         item=item,
-                         barcode=barcode_base64)
+    return render_template('inventory/print_label.html', item=item)
 
 @bp.route('/item/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
@@ -272,7 +358,7 @@ def edit_item(id):
     item = InventoryItem.query.get_or_404(id)
     form = InventoryItemForm(obj=item)
     form.category.choices = [(c.id, c.get_display_name()) for c in Category.get_ordered_categories()]
-    form.tags.choices = [(t.id, t.name) for t in Tag.query.order_by(Tag.name).all()]
+    form.tags.choices = get_tag_choices()
     
     if request.method == 'POST':
         try:
@@ -618,38 +704,24 @@ def verify_pin():
         flash('Please enter a PIN', 'danger')
         return redirect(url_for('inventory.checkout'))
     
-    # Find all users and check their PINs
-    users = User.query.all()
-    tech = None
-    for user in users:
-        if user.check_pin(pin):
-            tech = user
-            break
+    # Look the tech up by PIN fingerprint, verifying a single bcrypt hash
+    tech = User.find_by_pin(pin)
     
     if not tech:
         flash('Invalid PIN code', 'danger')
         return redirect(url_for('inventory.checkout'))
     
+    # Persist a fingerprint backfilled for a legacy PIN
+    db.session.commit()
+    
     # Store tech ID in session
     session['tech_id'] = tech.id
     flash(f'Welcome, {tech.username}!', 'success')
     return redirect(url_for('inventory.checkout'))
 
 def check_low_stock(item):
-    """Check if an item needs a stock alert and send if enabled"""
-    if not Configuration.get_value('enable_low_stock_alerts', 'false') == 'true':
-        return
-        
-    if item.needs_restock:
-        # Get all items that need restocking
-        low_stock_items = InventoryItem.query.filter(
-            InventoryItem.quantity <= InventoryItem.reorder_threshold,
-            InventoryItem.reorder_threshold != None,
-            InventoryItem.type != 'computer_system'  # Exclude computer systems
-        ).all()
-        
-        if low_stock_items:
-            send_stock_alert(low_stock_items)
+    """Queue a stock alert for the item if it is low; the alert worker sends it"""
+    enqueue_stock_alert(item)
 
 @bp.route('/checkout/process', methods=['POST'])
 def process_checkout():
@@ -669,40 +741,29 @@ def process_checkout():
         flash('Item not found', 'danger')
         return redirect(url_for('inventory.checkout'))
     
+    if quantity < 1:
+        flash('Quantity must be at least 1', 'danger')
+        return redirect(url_for('inventory.checkout'))
+    
     try:
-        # Validate quantity for general items
-        if not isinstance(item, ComputerSystem):
-            if quantity > item.quantity:
-                flash(f'Not enough items in stock. Available: {item.quantity}', 'danger')
-                return redirect(url_for('inventory.checkout'))
-        else:
-            # Force quantity to 1 for computer systems
-            quantity = 1
+        # Take the stock atomically, so concurrent checkouts cannot oversell
+        remaining = decrement_stock(item, quantity)
+        if remaining is None:
+            db.session.rollback()
+            flash(f'Not enough items in stock. Available: {item.quantity}', 'danger')
+            return redirect(url_for('inventory.checkout'))
         
         # Create transaction record
         transaction = Transaction(
             item_id=item.id,
             transaction_type='check_out',
-            quantity=quantity,
+            quantity_changed=-quantity,
             user_id=tech.id,
             notes=reason
         )
         
-        # Update item based on type
-        if isinstance(item, ComputerSystem):
-            item.status = 'removed'
-        else:
-            # Update quantity for general items
-            item.quantity -= quantity
-            
-            # Update status based on remaining quantity
-            if item.quantity == 0:
-                item.status = 'out_of_stock'
-            elif item.quantity <= item.reorder_threshold:
-                item.status = 'restock'
-                
-            # Check if we need to send a stock alert
-            check_low_stock(item)
+        # Check if we need to send a stock alert
+        check_low_stock(item)
         
         db.session.add(transaction)
         db.session.commit()
@@ -710,7 +771,7 @@ def process_checkout():
         # Log the activity
         log_inventory_activity('checkout', item, {
             'quantity': quantity,
-            'remaining': item.quantity
+            'remaining': remaining
         })
         
         flash(f'Successfully checked out {quantity} {item.name}', 'success')
@@ -722,6 +783,30 @@ def process_checkout():
         current_app.logger.error(f'Checkout error: {str(e)}')
         return redirect(url_for('inventory.checkout'))
 
+@bp.route('/checkout/batch', methods=['POST'])
+def process_batch_checkout():
+    """Check out the kiosk cart of scanned items and systems in one transaction (JSON)"""
+    tech = db.session.get(User, session['tech_id']) if 'tech_id' in session else None
+    if tech is None:
+        session.pop('tech_id', None)
+        return jsonify({'error': 'Please log in first'}), 401
+
+    data = request.get_json(silent=True) or {}
+    reason = (data.get('reason') or '').strip()
+    if not reason:
+        return jsonify({'error': 'A checkout reason is required'}), 400
+
+    try:
+        results = checkout_cart(data.get('lines'), tech.id, tech.username, reason,
+                                notes=data.get('notes', ''), source='kiosk')
+    except CheckoutError as e:
+        return jsonify({'error': str(e), 'results': e.results}), 400
+    except Exception as e:
+        current_app.logger.error(f'Batch checkout error: {str(e)}')
+        return jsonify({'error': 'Error checking out cart'}), 500
+
+    return jsonify({'message': f'Successfully checked out {len(results)} lines', 'results': results})
+
 @bp.route('/checkout/logout', methods=['GET'])
 def checkout_logout():
     """End checkout session"""
@@ -796,30 +881,19 @@ def scan_barcode():
                 'message': 'API key not configured'
             }), 500
             
-        # UPCItemDB API endpoint
-        url = f'https://api.upcitemdb.com/prod/v1/lookup?upc={barcode}'
-        headers = {
-            'user_key': api_key,
-            'key_type': '3scale'
-        }
-        
-        current_app.logger.debug(f'Making request to UPCItemDB with headers: {headers}')
-        
-        # Make the API request
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        # Parse the response
-        result = response.json()
+        # End the transaction opened by loading the user so it isn't held
+        # open across the HTTP call
+        db.session.commit()
+
+        # Look up the barcode, serving repeat scans from the shared cache
+        item_data, cached = lookup_upc(barcode)
+        current_app.logger.debug(f'UPC lookup for {barcode} (cached={cached})')
         
-        if not result.get('items'):
+        if not item_data:
             return jsonify({
                 'success': False,
                 'message': 'No product found for this barcode'
             }), 404
-            
-        # Get the first item from the results
-        item_data = result['items'][0]
         
         # Create category hierarchy if category exists
         category = None
@@ -864,11 +938,8 @@ def scan_barcode():
         }), 500
 
 def generate_tracking_id():
-    """Generate a unique tracking ID"""
-    while True:
-        tracking_id = f"TC-{uuid.uuid4().hex[:8].upper()}"
-        if not InventoryItem.query.filter_by(tracking_id=tracking_id).first():
-            return tracking_id
+    """Generate a tracking ID unique across items and systems"""
+    return next_tracking_id()
 
 # User Management Routes
 @bp.route('/users')
@@ -1078,14 +1149,7 @@ def add_system():
 def view_system(id):
     system = ComputerSystem.query.get_or_404(id)
     
-    # Generate barcode
-    barcode_io = io.BytesIO()
-    Code128(system.tracking_id, writer=ImageWriter()).write(barcode_io)
-    barcode_base64 = base64.b64encode(barcode_io.getvalue()).decode()
-    
-    return render_template('inventory/view_system.html', 
-                         system=system,
-                         barcode=barcode_base64)
+    return render_template('inventory/view_system.html', system=system)
 
 @bp.route('/system/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
@@ -1265,31 +1329,79 @@ def print_system_label(id):
     system = ComputerSystem.query.get_or_404(id)
     system.type = 'computer_system'  # Add type attribute for template
     
-    # Generate barcode image
-    barcode_io = io.BytesIO()
-    Code128(system.tracking_id, writer=ImageWriter()).write(barcode_io)
-    barcode_base64 = base64.b64encode(barcode_io.getvalue()).decode()
-    
     # Return the print template
-    return render_template('inventory/print_label.html',
-                         item=system,
-                         barcode=barcode_base64)
+    return render_template('inventory/print_label.html', item=system)
+
+def label_selection_query(args):
+    """
+    Build the query of items or systems to print labels for.
+
+    The selection combines the dashboard filters for the chosen ``kind``
+    with an optional ``tag`` id and a ``tracking_ids`` list separated by
+    commas, spaces or newlines.
+    """
+    if args.get('kind') == 'items':
+        model = InventoryItem
+        query = filter_items_query(InventoryItem.query, args).options(
+            db.joinedload(InventoryItem.category)
+        )
+    else:
+        model = ComputerSystem
+        query = filter_systems_query(ComputerSystem.query, args).options(
+            db.joinedload(ComputerSystem.model),
+            db.joinedload(ComputerSystem.cpu)
+        )
+
+    tag_id = args.get('tag', type=int)
+    if tag_id:
+        query = query.filter(model.tags.any(Tag.id == tag_id))
+
+    tracking_ids = [t for t in re.split(r'[\s,]+', args.get('tracking_ids', '')) if t]
+    if tracking_ids:
+        query = query.filter(model.tracking_id.in_(tracking_ids))
+
+    # Tags are not printed; skipping their joined load lets rows be streamed in batches
+    return query.filter(model.tracking_id.isnot(None)).options(
+        db.noload(model.tags),
+        db.joinedload(model.creator)
+    ).order_by(model.created_at, model.id)
+
+@bp.route('/labels')
+@login_required
+def bulk_labels():
+    tags = get_tag_stats()
+    return render_template('inventory/bulk_labels.html', tags=tags)
+
+@bp.route('/labels/pdf')
+@login_required
+def labels_pdf():
+    """Render the selected items or systems as a multi-page label PDF"""
+    query = label_selection_query(request.args)
+    if query.order_by(None).count() == 0:
+        flash('No items match the label selection.', 'warning')
+        return redirect(url_for('inventory.bulk_labels'))
+
+    # reportlab only finalizes the document on save, so the PDF is spooled to
+    # a temporary file and streamed from there in chunks
+    output = tempfile.TemporaryFile()
+    try:
+        count = write_labels_pdf(query.yield_per(200), output)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    current_app.logger.info(f'Generated {count} labels for {current_user.username}')
+
+    return send_file(output, mimetype='application/pdf', download_name='labels.pdf')
 
 @bp.route('/manage/tags')
 @login_required
 @admin_required
 def manage_tags():
-    tags = Tag.query.order_by(Tag.name).all()
+    # Tags with their item and system counts, from one cached grouped query
+    tags = get_tag_stats()
     
-    # Count items for each tag
-    tag_counts = {}
-    for tag in tags:
-        count = db.session.query(item_tags).filter_by(tag_id=tag.id).count()
-        tag_counts[tag.id] = count
-    
-    return render_template('inventory/manage/tags.html', 
-                         tags=tags,
-                         tag_counts=tag_counts)
+    return render_template('inventory/manage/tags.html', tags=tags)
 
 @bp.route('/manage/tags/add', methods=['POST'])
 @login_required
@@ -1356,18 +1468,10 @@ def test_upc():
     # Test UPC code
     test_upc = "190199267039"  # Example UPC for testing
     
-    # UPCItemDB API endpoint
-    url = "https://api.upcitemdb.com/prod/trial/lookup"
-    headers = {
-        'user_key': api_key,
-        'Content-Type': 'application/json'
-    }
-    params = {'upc': test_upc}
-    
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return jsonify(response.json())
+        # Straight to the API, so this checks connectivity rather than the cache
+        item_data = fetch_upc(test_upc)
+        return jsonify({'items': [item_data] if item_data else []})
     except requests.exceptions.RequestException as e:
         current_app.logger.error(f"UPC lookup error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -71,7 +71,7 @@ def submit_request():
             return jsonify({'error': 'Database error: ' + str(db_error)}), 400
         
         try:
-            log_activity('add', 'roadmap_item', item.id, {
+            log_activity(current_user.id, 'add', f"roadmap item #{item.id}", {
                 'title': item.title,
                 'category': item.category
             })
@@ -107,7 +107,7 @@ def vote(item_id):
         db.session.commit()
         
         # Log the activity
-        log_activity('vote', 'roadmap_item', item.id, {
+        log_activity(current_user.id, 'vote', f"roadmap item #{item.id}", {
             'title': item.title,
             'votes': item.votes
         })
@@ -151,7 +151,7 @@ def update_status():
             db.session.commit()
             print(f"Status updated: {old_status} -> {item.status}")
             
-            log_activity('update', 'roadmap_item', item.id, {
+            log_activity(current_user.id, 'update', f"roadmap item #{item.id}", {
                 'title': item.title,
                 'old_status': old_status,
                 'new_status': item.status
@@ -4,34 +4,30 @@ from app import db
 from app.models.inventory import WikiCategory, WikiPage
 from app.forms import WikiCategoryForm, WikiPageForm
 from app.routes.inventory import admin_required
-from sqlalchemy import or_
+from app.utils.search import search_wiki_pages, with_snippets
 
 bp = Blueprint('wiki', __name__)
 
 @bp.route('/wiki')
 @login_required
 def wiki_home():
-    search = request.args.get('search', '')
+    search = request.args.get('search', '').strip()
     category_id = request.args.get('category', type=int)
+    page = request.args.get('page', 1, type=int)
     
     query = WikiPage.query
     
-    if search:
-        query = query.filter(
-            or_(
-                WikiPage.title.ilike(f'%{search}%'),
-                WikiPage.content.ilike(f'%{search}%')
-            )
-        )
-    
     if category_id:
         query = query.filter_by(category_id=category_id)
     
-    pages = query.order_by(WikiPage.updated_at.desc()).all()
+    # Ranked by relevance when searching, most recently updated first otherwise
+    pagination = search_wiki_pages(query, search).paginate(
+        page=page, per_page=current_app.config['ITEMS_PER_PAGE'])
     categories = WikiCategory.query.order_by(WikiCategory.name).all()
     
     return render_template('wiki/home.html',
-                         pages=pages,
+                         pages=with_snippets(pagination.items, search),
+                         pagination=pagination,
                          categories=categories,
                          search=search,
                          selected_category=category_id)
@@ -66,11 +62,14 @@ def new_page():
 @login_required
 def category_view(category_id):
     category = WikiCategory.query.get_or_404(category_id)
-    pages = WikiPage.query.filter_by(category_id=category_id).order_by(WikiPage.updated_at.desc()).all()
+    page = request.args.get('page', 1, type=int)
+    pagination = search_wiki_pages(WikiPage.query.filter_by(category_id=category_id)).paginate(
+        page=page, per_page=current_app.config['ITEMS_PER_PAGE'])
     categories = WikiCategory.query.order_by(WikiCategory.name).all()
     return render_template('wiki/category.html',
                          category=category,
-                         pages=pages,
+                         pages=with_snippets(pagination.items),
+                         pagination=pagination,
                          categories=categories)
 
 @bp.route('/wiki/<int:id>')
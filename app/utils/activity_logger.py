@@ -1,28 +1,8 @@
-from flask import current_app
+"""Structured activity log stored in the activity_logs table"""
+from flask import current_app, g, has_app_context, has_request_context
 from flask_login import current_user
-from datetime import datetime
+from datetime import datetime, timezone
 import json
-import logging
-import os
-
-# Configure activity logger
-activity_logger = logging.getLogger('activity_logger')
-activity_logger.setLevel(logging.INFO)
-
-# Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-
-# Create file handler
-file_handler = logging.FileHandler('logs/activity.log')
-file_handler.setLevel(logging.INFO)
-
-# Create formatter with just timestamp - we'll add tags in the message
-formatter = logging.Formatter('%(asctime)s - %(message)s', datefmt='%Y-%m-%d %I:%M:%S %p')
-file_handler.setFormatter(formatter)
-
-# Add handler to logger
-activity_logger.addHandler(file_handler)
 
 # Action tags mapping
 ACTION_TAGS = {
@@ -41,6 +21,18 @@ ACTION_TAGS = {
     'update_model': '[MOD-UPD]'
 }
 
+# Activity.item_type for each logged model
+ITEM_TYPES = {
+    'InventoryItem': 'item',
+    'ComputerSystem': 'system',
+    'CPU': 'cpu',
+    'ComputerModel': 'computer_model',
+    'User': 'user'
+}
+
+# Same timestamp layout as logs/app.log, so exported activity merges with it
+LOG_DATE_FORMAT = '%Y-%m-%d %I:%M:%S %p'
+
 def get_action_tag(action):
     """Get the appropriate tag for an action"""
     return ACTION_TAGS.get(action, '[INFO]')
@@ -49,55 +41,157 @@ def format_details(details):
     """Format details dictionary into a readable string."""
     if not details:
         return ""
-        
+
     formatted = []
     for key, value in details.items():
         if key != 'changes':  # Skip changes as they'll be handled separately
             formatted.append(f"{value}")
-            
+
     return " ".join(s for s in formatted if s)
 
+def utc_to_local(value):
+    """Convert a naive UTC datetime (as stored) to naive server-local time"""
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+def local_to_utc(value):
+    """Convert a naive server-local datetime to naive UTC for querying"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def format_log_line(activity):
+    """Render an Activity row as a line in the activity.log format"""
+    return f"{utc_to_local(activity.timestamp).strftime(LOG_DATE_FORMAT)} - {activity.message}"
+
+def _current_user_id():
+    try:
+        return current_user.id if current_user.is_authenticated else None
+    except Exception:
+        return None
+
+def _username(user_id=None):
+    """Username for messages; works outside login sessions (mobile API, CLI)"""
+    if user_id is not None:
+        from app import db
+        from app.models.user import User
+        user = db.session.get(User, user_id)
+        if user:
+            return user.username
+    try:
+        if current_user.is_authenticated:
+            return current_user.username
+    except Exception:
+        pass
+    return 'Unknown'
+
+def record_activity(action, message, item_type='general', item_id=None,
+                    item_identifier=None, details=None, user_id=None):
+    """
+    Buffer an activity row for the current request.
+
+    Buffered rows are batch-inserted in the same transaction as the next
+    commit, so they are kept only if the work they describe is. A rollback,
+    or a request ending in an exception, drops the rows recorded since the
+    last commit. Rows still buffered when the request ends normally (such as
+    those logged after the final commit) are written by flush_activity.
+    Outside a request they are written immediately.
+    """
+    row = {
+        'action': str(action)[:50],
+        'item_type': str(item_type or 'general')[:50],
+        'item_id': item_id,
+        'item_identifier': str(item_identifier)[:255] if item_identifier is not None else None,
+        'user_id': user_id if user_id is not None else _current_user_id(),
+        'message': message,
+        # Round-trip through JSON so Decimals, datetimes etc. are stored as text
+        'details': json.loads(json.dumps(details, default=str)) if details else None,
+        'timestamp': datetime.utcnow()
+    }
+    if has_request_context():
+        g.setdefault('activity_buffer', []).append(row)
+    else:
+        flush_activity([row])
+
+def flush_activity(rows=None):
+    """Insert buffered activity rows in a single batch"""
+    if rows is None:
+        rows = g.pop('activity_buffer', None) if has_app_context() else None
+    if not rows:
+        return
+    from app import db
+    from app.models.activity import Activity
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(Activity.__table__.insert(), rows)
+    except Exception as e:
+        current_app.logger.error(f"Error writing activity log: {str(e)}")
+
+def _write_with_commit(session):
+    """Insert the request's buffered rows in the transaction being committed"""
+    if not has_request_context() or not g.get('activity_buffer'):
+        return
+    from app.models.activity import Activity
+    session.execute(Activity.__table__.insert(), g.pop('activity_buffer'))
+
+def _drop_on_rollback(session):
+    """Forget rows describing work that was just rolled back"""
+    if has_request_context():
+        g.pop('activity_buffer', None)
+
+def init_app(app):
+    """Tie each request's activity buffer to its database transaction"""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if not event.contains(Session, 'before_commit', _write_with_commit):
+        event.listen(Session, 'before_commit', _write_with_commit)
+        event.listen(Session, 'after_rollback', _drop_on_rollback)
+
+    @app.teardown_request
+    def _flush_activity(exception=None):
+        if exception is not None:
+            g.pop('activity_buffer', None)
+        flush_activity()
+
 def log_activity(user_id, action, message, details=None):
     """Log activity with user information in a human-readable format."""
     try:
-        # Get user info
-        username = current_user.username if current_user else 'Unknown'
-        
         # Format the log message based on action type
-        if action == 'mobile_checkout':
-            # For mobile checkouts, use the provided message directly
+        if action in ('mobile_checkout', 'kiosk_checkout'):
+            # For mobile and kiosk checkouts, use the provided message directly
             log_message = message
-            if details:
-                # Add any additional details to the log
-                detail_str = ' '.join(f"{k}={v}" for k, v in details.items() if v is not None)
-                if detail_str:
-                    log_message += f" ({detail_str})"
         else:
             # For other actions, use the standard format
             action_phrase = action.replace('_', ' ').title()
-            log_message = f"User {username} {action_phrase} {message}"
-            if details:
-                detail_str = ' '.join(f"{k}={v}" for k, v in details.items() if v is not None)
-                if detail_str:
-                    log_message += f" ({detail_str})"
-        
-        # Log the activity
-        activity_logger.info(log_message)
-        
+            log_message = f"User {_username(user_id)} {action_phrase} {message}"
+        if details:
+            detail_str = ' '.join(f"{k}={v}" for k, v in details.items() if v is not None)
+            if detail_str:
+                log_message += f" ({detail_str})"
+
+        details = details or {}
+        if 'system_id' in details:
+            item_type, item_id, identifier = 'system', details['system_id'], details.get('tracking_id') or details.get('system_name')
+        elif 'item_id' in details:
+            item_type, item_id, identifier = 'item', details['item_id'], details.get('tracking_id') or details.get('item_name')
+        else:
+            item_type, item_id, identifier = details.get('item_type', 'general'), None, None
+
+        record_activity(action, log_message, item_type, item_id, identifier, details, user_id)
+
     except Exception as e:
         current_app.logger.error(f"Error logging activity: {str(e)}")
 
 def log_inventory_activity(action, item, details=None):
     """Convenience function for logging inventory item activities"""
     try:
-        username = current_user.username if current_user else 'Unknown'
+        username = _username()
         tag = get_action_tag(action)
-        
+        details = details or {}
+
         # Handle different item types
         if hasattr(item, 'tracking_id'):
             # For items and systems that have tracking_id
             identifier = details.get('tracking_id', item.tracking_id)
-            item_name = item.name
+            item_name = getattr(item, 'name', identifier)
         elif item.__class__.__name__ == 'CPU':
             # For CPUs, use manufacturer and model as identifier
             identifier = f"{item.manufacturer} {item.model}"
@@ -109,7 +203,7 @@ def log_inventory_activity(action, item, details=None):
         else:
             identifier = str(item.id)
             item_name = str(item)
-        
+
         if action == 'adjustment':
             old_qty = details.get('old_quantity', 0)
             new_qty = details.get('new_quantity', 0)
@@ -118,24 +212,25 @@ def log_inventory_activity(action, item, details=None):
             message = f"{tag} - User {username} adjusted quantity of {item_name} ({identifier}) from {old_qty} to {new_qty} ({sign}{qty_change})"
         else:
             message = f"{tag} - User {username} {action} {item_name} ({identifier})"
-            if details and 'changes' in details:
-                detail_str = json.dumps(details['changes'])
+            if 'changes' in details:
+                detail_str = json.dumps(details['changes'], default=str)
                 message += f" (changes={detail_str})"
-        
-        activity_logger.info(message)
-        
+
+        record_activity(action, message, ITEM_TYPES.get(item.__class__.__name__, 'general'),
+                        item.id, identifier, details)
+
     except Exception as e:
         current_app.logger.error(f"Error logging activity: {str(e)}")
 
 def log_system_activity(action, system, details=None):
     """Log activity for computer systems"""
     try:
-        username = current_user.username if current_user else 'Unknown'
+        username = _username()
         tag = get_action_tag(action)
-        
+
         # Get system identifier (tracking ID or model info)
         system_identifier = system.tracking_id
-        if hasattr(system, 'model'):
+        if getattr(system, 'model', None):
             model_info = f"{system.model.manufacturer} {system.model.model_name}"
             if system.serial_tag:
                 system_identifier = f"{model_info} ({system.serial_tag})"
@@ -145,26 +240,26 @@ def log_system_activity(action, system, details=None):
         # Format the log message
         action_phrase = action.replace('_', ' ').title()
         message = f"{tag} - User {username} {action_phrase} System {system_identifier}"
-        
+
         if details:
-            detail_str = json.dumps(details)
+            detail_str = json.dumps(details, default=str)
             message += f" - Details: {detail_str}"
 
-        activity_logger.info(message)
-        
+        record_activity(action, message, 'system', system.id, system.tracking_id, details)
+
     except Exception as e:
         current_app.logger.error(f"Error logging system activity: {str(e)}")
 
 def log_user_activity(action, user, details=None):
     """Convenience function for logging user-related activities"""
     try:
-        username = current_user.username if current_user else 'Unknown'
+        username = _username()
         tag = get_action_tag(action)
         message = f"{tag} - User {username} {action} {user.username}"
         if details:
             detail_str = ' '.join(f"{k}={v}" for k, v in details.items() if v is not None)
             if detail_str:
                 message += f" ({detail_str})"
-        activity_logger.info(message)
+        record_activity(action, message, 'user', user.id, user.username, details)
     except Exception as e:
-        current_app.logger.error(f"Error logging user activity: {str(e)}") 
\ No newline at end of file
+        current_app.logger.error(f"Error logging user activity: {str(e)}")
@@ -0,0 +1,371 @@
+"""Database backups streamed from pg_dump, and the backup scheduler"""
+import os
+import subprocess
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from flask import current_app
+from sqlalchemy import text
+from app import db
+from app.models.backup import BackupRun
+from app.models.config import Configuration
+
+CHUNK_SIZE = 64 * 1024
+
+# PostgreSQL advisory lock key held by the scheduler while it backs up
+SCHEDULER_LOCK_KEY = 8147203551
+
+# format name -> (pg_dump -F value, file extension, mimetype)
+BACKUP_FORMATS = {
+    'plain': ('p', '.sql', 'application/sql'),
+    'custom': ('c', '.dump', 'application/octet-stream'),
+}
+
+
+class BackupError(Exception):
+    """pg_dump could not be started or exited with an error"""
+
+
+def pg_dump_command(db_url, fmt='plain', compress=False):
+    """
+    Build the pg_dump command line and environment for a database URL.
+
+    Custom-format dumps are compressed by pg_dump itself; plain dumps are
+    gzipped while streaming (see stream_pg_dump).
+
+    Returns:
+        tuple: (command, env)
+    """
+    parsed = urlparse(db_url)
+    env = os.environ.copy()
+    if parsed.password:
+        env['PGPASSWORD'] = parsed.password
+
+    command = [
+        current_app.config.get('PG_DUMP_PATH', 'pg_dump'),
+        '-h', parsed.hostname or 'localhost',
+        '-p', str(parsed.port or 5432),
+        '-F', BACKUP_FORMATS[fmt][0],
+    ]
+    if parsed.username:
+        command += ['-U', parsed.username]
+    if fmt == 'custom' and not compress:
+        command += ['-Z', '0']
+    command.append(parsed.path[1:])  # Remove leading slash
+    return command, env
+
+
+def backup_filename(timestamp, fmt='plain', compress=False):
+    """Download name for a backup, e.g. tc_inventory_backup_20240101_120000.sql.gz"""
+    filename = f'tc_inventory_backup_{timestamp}{BACKUP_FORMATS[fmt][1]}'
+    if compress and fmt == 'plain':
+        filename += '.gz'
+    return filename
+
+
+def backup_mimetype(fmt='plain', compress=False):
+    if compress and fmt == 'plain':
+        return 'application/gzip'
+    return BACKUP_FORMATS[fmt][2]
+
+
+def stream_pg_dump(db_url, fmt='plain', compress=False, chunk_size=CHUNK_SIZE):
+    """
+    Start pg_dump and return a generator over its output in chunks.
+
+    pg_dump writes to a pipe, so neither the server's disk nor memory holds
+    the whole dump. The first chunk is read before returning, so a dump that
+    fails to start (bad credentials, missing binary) raises BackupError here
+    while an error page can still be sent. A failure later in the dump raises
+    BackupError from the generator, which aborts a download mid-transfer
+    rather than letting it look complete.
+
+    Raises:
+        BackupError: If pg_dump cannot start or fails before writing output
+    """
+    command, env = pg_dump_command(db_url, fmt, compress)
+    # stderr goes to a temporary file so a chatty pg_dump cannot fill the pipe and stall
+    stderr = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=stderr)
+    except OSError as e:
+        stderr.close()
+        raise BackupError(str(e))
+
+    def error_output():
+        stderr.seek(0)
+        return stderr.read().decode('utf-8', errors='replace').strip()
+
+    first_chunk = process.stdout.read(chunk_size)
+    if not first_chunk and process.wait() != 0:
+        message = error_output() or f'pg_dump exited with status {process.returncode}'
+        process.stdout.close()
+        stderr.close()
+        raise BackupError(message)
+
+    logger = current_app.logger
+
+    def generate():
+        compressor = zlib.compressobj(wbits=31) if compress and fmt == 'plain' else None  # gzip container
+        chunk = first_chunk
+        try:
+            while chunk:
+                data = compressor.compress(chunk) if compressor else chunk
+                if data:
+                    yield data
+                chunk = process.stdout.read(chunk_size)
+            if compressor:
+                yield compressor.flush()
+            if process.wait() != 0:
+                message = error_output() or f'pg_dump exited with status {process.returncode}'
+                logger.error(f'Backup failed mid-stream: {message}')
+                raise BackupError(message)
+            logger.info('Backup streamed successfully')
+        finally:
+            # Stop pg_dump if the client disconnects before the end
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr.close()
+
+    return generate()
+
+
+# Days between scheduled backups for each backup_frequency setting
+FREQUENCY_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+    'monthly': 30,
+}
+
+# Scheduled backups are always compressed custom-format dumps
+SCHEDULED_FORMAT = 'custom'
+
+
+def backup_dir():
+    """Return the directory holding scheduled backups, creating it if needed"""
+    path = current_app.config.get('BACKUP_DIR') or os.path.join(current_app.instance_path, 'backups')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def backup_settings():
+    """Current automatic backup settings from the configuration table"""
+    return {
+        'auto_backup_enabled': Configuration.get_value('auto_backup_enabled', 'false'),
+        'backup_frequency': Configuration.get_value('backup_frequency', 'daily'),
+        'backup_retention_days': Configuration.get_value('backup_retention_days', '30'),
+        'backup_time': Configuration.get_value('backup_time', '00:00'),
+    }
+
+
+def latest_slot(now, backup_time):
+    """The most recent occurrence of backup_time ('HH:MM', local) at or before now"""
+    try:
+        hour, minute = (int(part) for part in backup_time.split(':'))
+        slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except (ValueError, AttributeError):
+        slot = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return slot if slot <= now else slot - timedelta(days=1)
+
+
+def backup_due(now, last_run_at, frequency, backup_time):
+    """
+    Whether a scheduled backup should run at now (local time).
+
+    A backup is due once the day's backup_time has passed and the previous
+    run started at least a full period of slots ago.
+    """
+    if last_run_at is None:
+        return True
+    period = timedelta(days=FREQUENCY_DAYS.get(frequency, 1) - 1)
+    return last_run_at < latest_slot(now, backup_time) - period
+
+
+def next_backup_at(now, last_run_at, frequency, backup_time):
+    """Local time of the next scheduled backup; now if one is overdue"""
+    if backup_due(now, last_run_at, frequency, backup_time):
+        return now
+    slot = latest_slot(now, backup_time)
+    for _ in range(max(FREQUENCY_DAYS.values())):
+        slot += timedelta(days=1)
+        if backup_due(slot, last_run_at, frequency, backup_time):
+            return slot
+    return slot
+
+
+def last_successful_run():
+    return BackupRun.query.filter_by(status='success').order_by(BackupRun.started_at.desc()).first()
+
+
+def retry_allowed(now, backup_time):
+    """
+    Whether another attempt may start after failed runs (now is local time).
+
+    Failed runs since the latest slot are retried BACKUP_RETRY_MINUTES apart,
+    at most BACKUP_MAX_RETRIES times; after that the next slot tries again.
+    """
+    slot = latest_slot(now, backup_time)
+    failures = [run for run in BackupRun.query.filter_by(status='failed')
+                .order_by(BackupRun.started_at.desc()).limit(50)
+                if run.local_started_at >= slot]
+    if not failures:
+        return True
+    if len(failures) > current_app.config.get('BACKUP_MAX_RETRIES', 3):
+        return False
+    retry_after = timedelta(minutes=current_app.config.get('BACKUP_RETRY_MINUTES', 15))
+    return failures[0].local_started_at + retry_after <= now
+
+
+@contextmanager
+def scheduler_lock():
+    """
+    Hold an advisory lock so only one scheduler process backs up at a time.
+
+    Yields whether the lock was acquired. Outside PostgreSQL there is no
+    lock and it always is.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        yield True
+        return
+    with db.engine.connect() as connection:
+        acquired = connection.execute(text('SELECT pg_try_advisory_lock(:key)'),
+                                      {'key': SCHEDULER_LOCK_KEY}).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': SCHEDULER_LOCK_KEY})
+
+
+def run_backup():
+    """
+    Write a compressed backup into backup_dir and record the run.
+
+    The dump is written to a .partial file and renamed once pg_dump has
+    finished, so an interrupted run never leaves a file that looks complete.
+
+    Returns:
+        BackupRun: The finished run
+    """
+    run = BackupRun(started_at=datetime.utcnow(), status='running')
+    db.session.add(run)
+    db.session.commit()
+
+    filename = backup_filename(run.local_started_at.strftime('%Y%m%d_%H%M%S'),
+                               SCHEDULED_FORMAT, compress=True)
+    path = os.path.join(backup_dir(), filename)
+    partial = path + '.partial'
+    try:
+        with open(partial, 'wb') as f:
+            for chunk in stream_pg_dump(current_app.config['DATABASE_URL'], SCHEDULED_FORMAT, compress=True):
+                f.write(chunk)
+        os.replace(partial, path)
+        run.status = 'success'
+        run.filename = filename
+        run.size_bytes = os.path.getsize(path)
+        current_app.logger.info(f'Scheduled backup written to {path}')
+    except Exception as e:
+        if os.path.exists(partial):
+            os.remove(partial)
+        run.status = 'failed'
+        run.error = str(e)[:512]
+        current_app.logger.error(f'Scheduled backup failed: {str(e)}')
+    run.finished_at = datetime.utcnow()
+    db.session.commit()
+    return run
+
+
+def prune_backups(retention_days):
+    """
+    Delete backup files older than retention_days.
+
+    The newest successful backup is always kept, however old.
+
+    Returns:
+        int: Number of backup files removed
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    newest = BackupRun.query.filter_by(status='success')\
+        .order_by(BackupRun.started_at.desc()).first()
+    expired = BackupRun.query.filter(
+        BackupRun.status == 'success',
+        BackupRun.deleted_at.is_(None),
+        BackupRun.started_at < cutoff,
+        BackupRun.id != newest.id if newest else db.true()
+    ).all()
+    directory = backup_dir()
+    for run in expired:
+        path = os.path.join(directory, run.filename)
+        if os.path.exists(path):
+            os.remove(path)
+        run.deleted_at = datetime.utcnow()
+    db.session.commit()
+    return len(expired)
+
+
+def run_scheduled_backup(now=None, force=False):
+    """
+    Run a backup if automatic backups are enabled and one is due, then
+    apply the retention period.
+
+    Due-ness is measured from the last successful run, so a failed run is
+    retried (see retry_allowed) instead of skipping its slot.
+
+    Returns:
+        BackupRun: The run, or None if no backup was due
+    """
+    settings = backup_settings()
+    if settings['auto_backup_enabled'] != 'true' and not force:
+        return None
+
+    with scheduler_lock() as acquired:
+        if not acquired:
+            return None  # Another scheduler is mid-backup
+
+        # Holding the lock, so any run still marked running was interrupted
+        for stale in BackupRun.query.filter_by(status='running'):
+            stale.status = 'failed'
+            stale.error = 'Interrupted before it finished'
+            stale.finished_at = datetime.utcnow()
+        db.session.commit()
+
+        now = now or datetime.now()
+        if not force:
+            last_success = last_successful_run()
+            last_success_at = last_success.local_started_at if last_success else None
+            if not backup_due(now, last_success_at, settings['backup_frequency'], settings['backup_time']):
+                return None
+            if not retry_allowed(now, settings['backup_time']):
+                return None
+
+        run = run_backup()
+
+    try:
+        retention_days = int(settings['backup_retention_days'])
+    except ValueError:
+        retention_days = 30
+    pruned = prune_backups(retention_days)
+    if pruned:
+        current_app.logger.info(f'Pruned {pruned} backups older than {retention_days} days')
+    return run
+
+
+def run_backup_scheduler(poll_seconds=None, once=False):
+    """Run scheduled backups until interrupted"""
+    poll_seconds = poll_seconds or current_app.config.get('BACKUP_POLL_SECONDS', 60)
+    while True:
+        try:
+            run_scheduled_backup(force=once)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f'Backup scheduler error: {str(e)}')
+        finally:
+            db.session.remove()
+        if once:
+            return
+        time.sleep(poll_seconds)
@@ -0,0 +1,152 @@
+"""Content-addressed cache of rendered barcode and QR code images"""
+import hashlib
+import io
+import os
+import tempfile
+from flask import current_app, url_for
+from barcode import Code128
+from barcode.writer import ImageWriter
+import qrcode
+
+# Bump when the rendering options change so cached images are regenerated
+RENDERER_VERSION = '1'
+
+SYMBOLOGIES = ('code128', 'qr')
+
+
+def cache_dir():
+    """Return the directory holding cached images, creating it if needed"""
+    path = current_app.config.get('BARCODE_CACHE_DIR') or os.path.join(current_app.instance_path, 'barcodes')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def qr_base_url():
+    return (current_app.config.get('QR_BASE_URL') or 'http://127.0.0.1:5001').rstrip('/')
+
+
+def qr_item_id(tracking_id):
+    """Id of the item a QR code links to, or None"""
+    from app.models.inventory import InventoryItem
+    return InventoryItem.query.with_entities(InventoryItem.id).filter_by(tracking_id=tracking_id).scalar()
+
+
+def image_key(symbology, tracking_id, item_id=None):
+    """
+    Content key for an image. It doubles as the file name, the ETag and the
+    URL version, so it covers everything that affects the rendered bytes:
+    for QR codes that includes the base URL and item id they encode.
+    """
+    parts = [RENDERER_VERSION, symbology, tracking_id]
+    if symbology == 'qr':
+        parts.extend([qr_base_url(), str(item_id)])
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()
+
+
+def image_url(symbology, tracking_id, item_id=None):
+    """URL of an image, versioned by its content key so browsers may cache it for good"""
+    if symbology == 'qr' and item_id is None:
+        item_id = qr_item_id(tracking_id)
+    return url_for('inventory.barcode_image', symbology=symbology, tracking_id=tracking_id,
+                   v=image_key(symbology, tracking_id, item_id))
+
+
+def render_code128(value):
+    output = io.BytesIO()
+    Code128(value, writer=ImageWriter()).write(output)
+    return output.getvalue()
+
+
+def render_qr(data):
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(data)
+    qr.make(fit=True)
+    output = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(output)
+    return output.getvalue()
+
+
+def render_image(symbology, tracking_id):
+    """
+    Render the PNG for a tracking ID.
+
+    Returns:
+        bytes: PNG data, or None if the tracking ID is unknown
+    """
+    from app.models.inventory import InventoryItem, ComputerSystem
+
+    if symbology == 'qr':
+        # QR codes link to the item page, so they are only issued for items
+        item_id = qr_item_id(tracking_id)
+        if item_id is None:
+            return None
+        return render_qr(f"{qr_base_url()}/item/{item_id}/view")
+
+    exists = (InventoryItem.query.filter_by(tracking_id=tracking_id).first() is not None
+              or ComputerSystem.query.filter_by(tracking_id=tracking_id).first() is not None)
+    if not exists:
+        return None
+    return render_code128(tracking_id)
+
+
+def get_image_path(symbology, tracking_id):
+    """
+    Return the path of the cached image, rendering it on first use.
+
+    Returns:
+        tuple: (path, key), or (None, None) if the tracking ID is unknown
+
+    Raises:
+        ValueError: If the symbology is not supported
+    """
+    if symbology not in SYMBOLOGIES:
+        raise ValueError(f'Unsupported symbology: {symbology}')
+
+    item_id = None
+    if symbology == 'qr':
+        item_id = qr_item_id(tracking_id)
+        if item_id is None:
+            return None, None
+    key = image_key(symbology, tracking_id, item_id)
+    directory = cache_dir()
+    path = os.path.join(directory, f'{key}.png')
+    if os.path.exists(path):
+        return path, key
+
+    data = render_image(symbology, tracking_id)
+    if data is None:
+        return None, None
+
+    # Write to a temporary file first so concurrent readers never see a partial image
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path, key
+
+
+def pregenerate_images():
+    """Render any missing images for every item and system, returning how many were created"""
+    from app.models.inventory import InventoryItem, ComputerSystem
+
+    directory = cache_dir()
+    wanted = []
+    for item_id, tracking_id in InventoryItem.query.with_entities(InventoryItem.id, InventoryItem.tracking_id).filter(
+            InventoryItem.tracking_id.isnot(None)):
+        wanted.extend([('code128', tracking_id, None), ('qr', tracking_id, item_id)])
+    for (tracking_id,) in ComputerSystem.query.with_entities(ComputerSystem.tracking_id):
+        wanted.append(('code128', tracking_id, None))
+
+    created = 0
+    for symbology, tracking_id, item_id in wanted:
+        if os.path.exists(os.path.join(directory, f'{image_key(symbology, tracking_id, item_id)}.png')):
+            continue
+        path, _ = get_image_path(symbology, tracking_id)
+        if path:
+            created += 1
+    return created
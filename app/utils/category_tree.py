@@ -0,0 +1,86 @@
+"""In-process cache of the category hierarchy"""
+from app.utils.generation_cache import GenerationCache, register_invalidation
+
+# Seconds a cached tree is trusted before it is rebuilt. Local writes
+# invalidate immediately; the TTL bounds staleness across worker processes.
+DEFAULT_TTL = 60
+
+
+class CategoryNode:
+    """Lightweight, read-only view of a category with precomputed tree data"""
+
+    __slots__ = ('id', 'name', 'parent_id', 'level', 'full_path', 'position')
+
+    def __init__(self, id, name, parent_id, level, full_path, position):
+        self.id = id
+        self.name = name
+        self.parent_id = parent_id
+        self.level = level
+        self.full_path = full_path
+        self.position = position
+
+    def get_full_path(self):
+        return self.full_path
+
+    def get_display_name(self):
+        return ('--' * self.level) + self.name
+
+    def __repr__(self):
+        return f'<CategoryNode {self.full_path}>'
+
+
+class CategoryTree:
+    """Snapshot of the whole category table, ordered for dropdowns"""
+
+    def __init__(self, rows):
+        children = {}
+        for row in rows:
+            children.setdefault(row.parent_id, []).append(row)
+
+        known_ids = {row.id for row in rows}
+        self.ordered = []
+        self.by_id = {}
+
+        # Depth-first walk from the roots, children sorted by name. Rows whose
+        # parent no longer exists are treated as roots so they stay visible.
+        roots = [row for row in rows if row.parent_id is None or row.parent_id not in known_ids]
+        stack = [(row, 0, None) for row in sorted(roots, key=lambda r: r.name, reverse=True)]
+        while stack:
+            row, level, parent_path = stack.pop()
+            if row.id in self.by_id:
+                continue  # Guard against parent cycles
+            full_path = f'{parent_path} > {row.name}' if parent_path else row.name
+            node = CategoryNode(row.id, row.name, row.parent_id, level, full_path, len(self.ordered))
+            self.ordered.append(node)
+            self.by_id[row.id] = node
+            for child in sorted(children.get(row.id, []), key=lambda r: r.name, reverse=True):
+                stack.append((child, level + 1, full_path))
+
+    def get(self, category_id):
+        return self.by_id.get(category_id)
+
+
+def _load_category_tree():
+    from app import db
+    from app.models.inventory import Category
+
+    rows = db.session.query(Category.id, Category.name, Category.parent_id).all()
+    return CategoryTree(rows)
+
+
+_cache = GenerationCache('category_tree', _load_category_tree, 'CATEGORY_CACHE_TTL', DEFAULT_TTL)
+
+
+def get_category_tree():
+    """Return the cached category tree, loading it with a single query if needed"""
+    return _cache.get()
+
+
+def invalidate_category_tree():
+    """Drop the cached tree so the next reader reloads it"""
+    _cache.invalidate()
+
+
+def register_category_listeners(model):
+    """Invalidate the cache whenever a category is added, edited or deleted"""
+    register_invalidation(_cache, [model])
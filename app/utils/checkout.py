@@ -0,0 +1,256 @@
+"""Checkout of inventory items and computer systems, safe under concurrent requests"""
+from datetime import datetime
+from sqlalchemy import case, or_, update
+from sqlalchemy.orm import joinedload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.models.inventory import InventoryItem, ComputerSystem, Transaction
+from app.utils.activity_logger import log_activity
+from app.utils.stock_alerts import enqueue_stock_alert
+
+MAX_LINES = 100
+
+# source -> (Transaction.transaction_type, activity action, activity message prefix)
+CHECKOUT_SOURCES = {
+    'mobile': ('checkout', 'mobile_checkout', 'Mobile checkout'),
+    'kiosk': ('check_out', 'kiosk_checkout', 'Kiosk checkout'),
+}
+
+
+class CheckoutError(Exception):
+    """A cart could not be checked out; nothing was applied"""
+
+    def __init__(self, message, results=None):
+        super().__init__(message)
+        self.results = results or []
+
+
+def _parse_line(index, line):
+    """
+    Normalize one cart line to a result dict.
+
+    A line names an item or system by ``id`` (with ``type``) or by
+    ``tracking_id`` (``type`` optional), plus a ``quantity`` for items.
+    """
+    result = {'line': index, 'type': None, 'id': None, 'tracking_id': None,
+              'name': None, 'quantity': 1, 'remaining': None, 'status': 'ok', 'error': None}
+    if not isinstance(line, dict):
+        result.update(status='error', error='Line must be an object')
+        return result
+
+    kind = line.get('type')
+    if kind not in (None, 'item', 'system'):
+        result.update(status='error', error='type must be item or system')
+        return result
+    result['type'] = kind
+    result['tracking_id'] = str(line['tracking_id']).strip() if line.get('tracking_id') else None
+    try:
+        result['id'] = int(line['id']) if line.get('id') is not None else None
+        result['quantity'] = int(line.get('quantity', 1))
+    except (TypeError, ValueError):
+        result.update(status='error', error='id and quantity must be integers')
+        return result
+
+    if result['id'] is None and not result['tracking_id']:
+        result.update(status='error', error='Line needs an id or tracking_id')
+    elif result['id'] is not None and kind is None:
+        result.update(status='error', error='type is required when checking out by id')
+    elif result['quantity'] < 1:
+        result.update(status='error', error='quantity must be at least 1')
+    return result
+
+
+def _load(model, lines, kind, options):
+    """Rows of model named by lines, in one IN query, keyed by id and tracking_id"""
+    ids = {line['id'] for line in lines if line['type'] == kind and line['id'] is not None}
+    tracking_ids = {line['tracking_id'] for line in lines
+                    if line['type'] in (kind, None) and line['id'] is None}
+    criteria = []
+    if ids:
+        criteria.append(model.id.in_(ids))
+    if tracking_ids:
+        criteria.append(model.tracking_id.in_(tracking_ids))
+    if not criteria:
+        return {}, {}
+    rows = model.query.options(*options).filter(or_(*criteria)).all()
+    return {row.id: row for row in rows}, {row.tracking_id: row for row in rows}
+
+
+def decrement_stock(item, quantity):
+    """
+    Take quantity from an item's stock if, and only if, enough is left.
+
+    This is a single conditional UPDATE ... WHERE quantity >= :n RETURNING,
+    so concurrent checkouts of the same item can neither oversell it nor
+    lose each other's decrement. The status is recomputed in the same
+    statement from the new quantity. The in-session item is updated to
+    match; the change commits with the caller's transaction.
+
+    Returns:
+        int: The remaining quantity, or None if there was not enough stock
+    """
+    table = InventoryItem.__table__
+    remaining = table.c.quantity - quantity
+    row = db.session.execute(
+        update(table)
+        .where(table.c.id == item.id, table.c.quantity >= quantity)
+        .values(
+            quantity=remaining,
+            status=case(
+                (remaining == 0, 'out_of_stock'),
+                (remaining <= table.c.reorder_threshold, 'restock'),
+                else_=table.c.status
+            )
+        )
+        .returning(table.c.quantity, table.c.status)
+    ).first()
+    if row is None:
+        return None
+    set_committed_value(item, 'quantity', row.quantity)
+    set_committed_value(item, 'status', row.status)
+    return row.quantity
+
+
+def claim_system(system, user_id, reason, notes='', when=None):
+    """
+    Mark a system checked out to user_id if it is still available.
+
+    A conditional UPDATE ... WHERE status = 'available', so only one of
+    several concurrent checkouts of the same system succeeds.
+
+    Returns:
+        bool: Whether the system was claimed
+    """
+    when = when or datetime.utcnow()
+    values = {
+        'status': 'checked_out',
+        'checked_out_by_id': user_id,
+        'checked_out_at': when,
+        'checkout_reason': reason,
+        'checkout_notes': notes
+    }
+    table = ComputerSystem.__table__
+    claimed = db.session.execute(
+        update(table)
+        .where(table.c.id == system.id, table.c.status == 'available')
+        .values(**values)
+    ).rowcount == 1
+    if claimed:
+        for key, value in values.items():
+            set_committed_value(system, key, value)
+    return claimed
+
+
+def checkout_cart(lines, user_id, username, reason, notes='', source='mobile'):
+    """
+    Check out every line of a cart, or nothing.
+
+    Items and systems are each validated with a single IN query. If every
+    line is valid, the stock decrements, system status changes and
+    Transaction rows are committed together; otherwise nothing is written.
+
+    Returns:
+        list: Per-line result dicts (line, type, id, tracking_id, name,
+        quantity, remaining, status, error)
+
+    Raises:
+        CheckoutError: If the cart is empty or too large, or any line fails;
+        its results say which lines failed and why
+    """
+    transaction_type, action, label = CHECKOUT_SOURCES[source]
+    if not isinstance(lines, list) or not lines:
+        raise CheckoutError('Cart is empty')
+    if len(lines) > MAX_LINES:
+        raise CheckoutError(f'A cart can hold at most {MAX_LINES} lines')
+
+    results = [_parse_line(index, line) for index, line in enumerate(lines)]
+    valid = [result for result in results if result['status'] == 'ok']
+    items_by_id, items_by_tracking_id = _load(InventoryItem, valid, 'item', [noload(InventoryItem.tags)])
+    systems_by_id, systems_by_tracking_id = _load(
+        ComputerSystem, valid, 'system', [noload(ComputerSystem.tags), joinedload(ComputerSystem.model)])
+
+    requested = {}  # item id -> quantity requested by earlier lines
+    seen_systems = set()
+    targets = []
+    for result in valid:
+        if result['type'] in ('item', None):
+            item = items_by_id.get(result['id']) if result['id'] is not None \
+                else items_by_tracking_id.get(result['tracking_id'])
+            if item is not None:
+                result.update(type='item', id=item.id, tracking_id=item.tracking_id, name=item.name)
+                total = requested.get(item.id, 0) + result['quantity']
+                if total > (item.quantity or 0):
+                    result.update(status='error',
+                                  error=f'Insufficient quantity available (available: {item.quantity or 0})')
+                else:
+                    requested[item.id] = total
+                targets.append((result, item))
+                continue
+        if result['type'] in ('system', None):
+            system = systems_by_id.get(result['id']) if result['id'] is not None \
+                else systems_by_tracking_id.get(result['tracking_id'])
+            if system is not None:
+                name = f'{system.model.manufacturer} {system.model.model_name}' if system.model else system.tracking_id
+                result.update(type='system', id=system.id, tracking_id=system.tracking_id, name=name, quantity=1)
+                if system.status != 'available' or system.id in seen_systems:
+                    result.update(status='error', error='System is not available for checkout')
+                seen_systems.add(system.id)
+                targets.append((result, system))
+                continue
+        result.update(status='error', error=f"{(result['type'] or 'Item').capitalize()} not found")
+
+    if any(result['status'] != 'ok' for result in results):
+        raise CheckoutError('Some lines could not be checked out', results)
+
+    # Stock may have moved since validation, so every write re-checks it atomically
+    now = datetime.utcnow()
+    items = {target.id: target for result, target in targets if result['type'] == 'item'}
+    activity = []
+    try:
+        remaining = {item_id: decrement_stock(items[item_id], quantity)
+                     for item_id, quantity in requested.items()}
+        for result, target in targets:
+            if result['type'] == 'item':
+                if remaining[target.id] is None:
+                    result.update(status='error', error='Insufficient quantity available')
+                    continue
+                result['remaining'] = remaining[target.id]
+                db.session.add(Transaction(
+                    item_id=target.id,
+                    user_id=user_id,
+                    quantity_changed=-result['quantity'],
+                    transaction_type=transaction_type,
+                    notes=notes or reason,
+                    created_at=now
+                ))
+                details = {'item_id': target.id, 'quantity': result['quantity'], 'new_quantity': remaining[target.id]}
+            elif claim_system(target, user_id, reason, notes, now):
+                details = {'system_id': target.id, 'system_name': result['name']}
+            else:
+                result.update(status='error', error='System is not available for checkout')
+                continue
+            details.update(tracking_id=result['tracking_id'], reason=reason, username=username, notes=notes)
+            activity.append((f"{label} by {username}: {result['name']} (x{result['quantity']}) - {reason}", details))
+
+        if any(result['status'] != 'ok' for result in results):
+            db.session.rollback()
+            # Lines applied before the failure were rolled back with it
+            for result in results:
+                if result['status'] == 'ok':
+                    result.update(status='not_applied', remaining=None,
+                                  error='Not checked out because another line failed')
+            raise CheckoutError('Some lines could not be checked out', results)
+
+        # Queue low-stock alerts once per item, with its final quantity
+        for item in items.values():
+            enqueue_stock_alert(item)
+        db.session.commit()
+    except CheckoutError:
+        raise
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for message, details in activity:
+        log_activity(user_id, action, message, details=details)
+    return results
@@ -0,0 +1,32 @@
+"""In-process cache of the configuration table"""
+from app.utils.generation_cache import GenerationCache, register_invalidation
+
+# Seconds a cached snapshot is trusted before it is reloaded. Local writes
+# invalidate immediately; the TTL bounds staleness across worker processes.
+DEFAULT_TTL = 30
+
+
+def _load_config_values():
+    from app import db
+    from app.models.config import Configuration
+
+    rows = db.session.query(Configuration.key, Configuration.value).all()
+    return {row.key: row.value for row in rows}
+
+
+_cache = GenerationCache('config_values', _load_config_values, 'CONFIG_CACHE_TTL', DEFAULT_TTL)
+
+
+def get_config_values():
+    """Return a dict of every configuration key, loading them with a single query if needed"""
+    return _cache.get()
+
+
+def invalidate_config_cache():
+    """Drop the cached snapshot so the next reader reloads it"""
+    _cache.invalidate()
+
+
+def register_config_listeners(model):
+    """Invalidate the cache whenever a configuration row is written"""
+    register_invalidation(_cache, [model])
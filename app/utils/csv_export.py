@@ -0,0 +1,60 @@
+"""Table exports streamed as CSV from a server-side cursor"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from sqlalchemy import select
+from app import db
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+
+def format_csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def table_has_rows(table):
+    return db.session.execute(select(*table.primary_key.columns).limit(1)).first() is not None
+
+
+def iter_table_csv(table, batch_size=BATCH_SIZE, compress=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield a table as CSV (header row first) in chunks of about chunk_size
+    bytes, gzip-compressed if requested.
+
+    Rows are plain column tuples read through a server-side cursor
+    batch_size at a time, so memory does not grow with the table.
+    """
+    columns = list(table.columns)
+    statement = select(*columns)\
+        .order_by(*table.primary_key.columns)\
+        .execution_options(stream_results=True, yield_per=batch_size)
+
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+
+    def take():
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    with db.engine.connect() as connection:
+        for row in connection.execute(statement):
+            writer.writerow([format_csv_value(value) for value in row])
+            if buffer.tell() >= chunk_size:
+                data = take()
+                if data:
+                    yield data
+    data = take()
+    if compressor:
+        data += compressor.flush()
+    if data:
+        yield data
@@ -0,0 +1,424 @@
+"""Bulk CSV imports: streamed parsing, per-column validation and batched inserts"""
+import csv
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.imports import ImportJob
+from app.models.inventory import InventoryItem, ComputerSystem, Category, ComputerModel, CPU
+from app.utils import tracking_ids
+from app.utils.activity_logger import log_activity
+from app.utils.category_tree import invalidate_category_tree
+
+BATCH_SIZE = 1000
+# Row errors kept on the job; error_count still counts all of them
+MAX_REPORTED_ERRORS = 500
+
+# Importable tables: model, accepted columns (also the template header),
+# an example template row, whether rows get generated tracking IDs, and
+# optionally a cache to invalidate once rows are committed (rows are
+# inserted through Core, so ORM listeners do not see them)
+IMPORT_TABLES = {
+    'items': {
+        'model': InventoryItem,
+        'fields': [
+            'name', 'category_id', 'quantity', 'reorder_threshold',
+            'storage_location', 'barcode', 'manufacturer', 'mpn',
+            'image_url', 'description', 'cost', 'sell_price',
+            'purchase_url'
+        ],
+        'example': [
+            'Example Item', '1', '10', '5', 'Shelf A1', '123456789',
+            'Example Mfr', 'MPN123', '', 'Example description',
+            '10.99', '15.99', ''
+        ],
+        'tracking_ids': True,
+    },
+    'computer_systems': {
+        'model': ComputerSystem,
+        'fields': [
+            'model_id', 'cpu_id', 'ram', 'storage', 'os',
+            'storage_location', 'serial_tag', 'cpu_benchmark',
+            'usb_ports_status', 'usb_ports_notes', 'video_status',
+            'video_notes', 'network_status', 'network_notes',
+            'general_notes'
+        ],
+        'example': [
+            '1', '1', '16GB', '512GB SSD', 'Windows 10 Pro',
+            'Room 101', 'ABC123', '1000', 'PASSED', '',
+            'PASSED', '', 'PASSED', '', 'Test notes'
+        ],
+        'tracking_ids': True,
+    },
+    'categories': {
+        'model': Category,
+        'fields': ['name'],
+        'example': ['Example Category'],
+        'tracking_ids': False,
+        'invalidate': invalidate_category_tree,
+    },
+    'computer_models': {
+        'model': ComputerModel,
+        'fields': ['manufacturer', 'model_name', 'model_type'],
+        'example': ['Dell', 'Latitude 5520', 'laptop'],
+        'tracking_ids': False,
+    },
+    'cpus': {
+        'model': CPU,
+        'fields': ['manufacturer', 'model', 'speed', 'cores'],
+        'example': ['Intel', 'Core i7-11800H', '2.30 GHz', '8'],
+        'tracking_ids': False,
+    },
+}
+
+# Numeric columns that cannot be negative
+NON_NEGATIVE = {'quantity', 'reorder_threshold', 'cost', 'sell_price', 'cores', 'cpu_benchmark'}
+
+DATETIME_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
+BOOLEAN_VALUES = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+
+
+class RowError(ValueError):
+    """A CSV value that cannot be imported"""
+
+
+def import_dir():
+    """Return the directory holding uploaded CSV files, creating it if needed"""
+    path = current_app.config.get('IMPORT_DIR') or os.path.join(current_app.instance_path, 'imports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def coerce_value(column, raw):
+    """
+    Convert a CSV cell to the Python value for a column.
+
+    Raises:
+        RowError: If the value does not fit the column
+    """
+    value = raw.strip() if isinstance(raw, str) else raw
+    if value is None or value == '':
+        return None
+    column_type = column.type
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        python_type = str
+
+    try:
+        if python_type is bool:
+            if value.lower() not in BOOLEAN_VALUES:
+                raise RowError(f'{column.name} must be true or false')
+            return BOOLEAN_VALUES[value.lower()]
+        if python_type is int:
+            result = int(value)
+        elif python_type is Decimal:
+            result = Decimal(value)
+            if not result.is_finite():
+                raise InvalidOperation
+        elif python_type is float:
+            result = float(value)
+        elif python_type is datetime:
+            for date_format in DATETIME_FORMATS:
+                try:
+                    return datetime.strptime(value, date_format)
+                except ValueError:
+                    continue
+            raise RowError(f'{column.name} must be a date (YYYY-MM-DD)')
+        else:
+            length = getattr(column_type, 'length', None)
+            if length and len(value) > length:
+                raise RowError(f'{column.name} must be at most {length} characters')
+            return value
+    except (ValueError, InvalidOperation) as e:
+        if isinstance(e, RowError):
+            raise
+        kind = 'a whole number' if python_type is int else 'a number'
+        raise RowError(f'{column.name} must be {kind}')
+
+    if column.name in NON_NEGATIVE and result < 0:
+        raise RowError(f'{column.name} cannot be negative')
+    return result
+
+
+def _required(column):
+    return not column.nullable and column.default is None and column.server_default is None
+
+
+def _fill_value(column):
+    """Value inserted for an empty cell: the column's scalar default, else NULL"""
+    if column.default is not None and column.default.is_scalar:
+        return column.default.arg
+    return None
+
+
+class TableImporter:
+    """Validates and inserts CSV rows for one IMPORT_TABLES entry"""
+
+    def __init__(self, table_name, created_by_id=None):
+        spec = IMPORT_TABLES[table_name]
+        self.table = spec['model'].__table__
+        self.fields = spec['fields']
+        self.tracking_ids = spec['tracking_ids']
+        self.invalidate = spec.get('invalidate')
+        self.created_by_id = created_by_id
+        self.columns = {name: self.table.c[name] for name in self.fields}
+        self.required = [name for name, column in self.columns.items() if _required(column)]
+        # Referenced primary keys checked once per batch
+        self.foreign_keys = {
+            name: next(iter(column.foreign_keys)).column
+            for name, column in self.columns.items() if column.foreign_keys
+        }
+        self.unique = [name for name, column in self.columns.items() if column.unique]
+        self.seen_unique = {name: set() for name in self.unique}
+
+    def check_header(self, header):
+        """Raise RowError for columns that are not importable"""
+        unknown = [name for name in header if name and name.strip() not in self.columns]
+        if unknown:
+            raise RowError(f"Unknown columns: {', '.join(unknown)}. "
+                           f"Expected: {', '.join(self.fields)}")
+
+    def parse_row(self, row):
+        """Coerce a csv.DictReader row into an insert dict with every field"""
+        values = {}
+        errors = []
+        for key, raw in row.items():
+            if key is None:
+                errors.append('Too many values in row')
+                continue
+            name = key.strip()
+            try:
+                values[name] = coerce_value(self.columns[name], raw)
+            except RowError as e:
+                errors.append(str(e))
+        for name in self.required:
+            if values.get(name) is None:
+                errors.append(f'{name} is required')
+        if errors:
+            raise RowError('; '.join(errors))
+        # executemany needs the same keys in every row
+        return {name: values[name] if values.get(name) is not None else _fill_value(column)
+                for name, column in self.columns.items()}
+
+    def check_batch(self, batch):
+        """
+        Check foreign keys and unique columns for parsed rows, with one query
+        per column for the whole batch.
+
+        Returns:
+            dict: row number -> error message
+        """
+        errors = {}
+        for name, target in self.foreign_keys.items():
+            ids = {values[name] for _, values in batch if values[name] is not None}
+            if not ids:
+                continue
+            found = set(db.session.execute(select(target).where(target.in_(ids))).scalars())
+            for row_number, values in batch:
+                if values[name] is not None and values[name] not in found:
+                    errors.setdefault(row_number, []).append(f'{name} {values[name]} does not exist')
+        for name in self.unique:
+            column = self.table.c[name]
+            keys = {values[name] for _, values in batch if values[name] is not None}
+            taken = set(db.session.execute(select(column).where(column.in_(keys))).scalars()) if keys else set()
+            for row_number, values in batch:
+                value = values[name]
+                if value is None:
+                    continue
+                if value in taken or value in self.seen_unique[name]:
+                    errors.setdefault(row_number, []).append(f'{name} {value} already exists')
+                else:
+                    self.seen_unique[name].add(value)
+        return {row_number: '; '.join(messages) for row_number, messages in errors.items()}
+
+    def insert_batch(self, batch):
+        """
+        Insert parsed rows with one executemany, falling back to row-by-row
+        savepoints if the batch hits a constraint.
+
+        Returns:
+            dict: row number -> error message for rows that were not inserted
+        """
+        rows = [values for _, values in batch]
+        if self.tracking_ids:
+            for values, tracking_id in zip(rows, tracking_ids.reserve(len(rows))):
+                values['tracking_id'] = tracking_id
+                values['creator_id'] = self.created_by_id
+        try:
+            with db.session.begin_nested():
+                db.session.execute(self.table.insert(), rows)
+            return {}
+        except IntegrityError:
+            pass
+        errors = {}
+        for row_number, values in batch:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(self.table.insert(), [values])
+            except IntegrityError as e:
+                errors[row_number] = f'Database rejected row: {e.orig}'
+        return errors
+
+
+def count_rows(path):
+    """Number of data rows in a CSV file, read without holding it in memory"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def create_import_job(table_name, upload, dry_run=False, created_by_id=None):
+    """Save an uploaded CSV to import_dir and record a pending job for it"""
+    path = os.path.join(import_dir(), f'{uuid.uuid4().hex}.csv')
+    upload.save(path)
+    job = ImportJob(table_name=table_name, filename=upload.filename, upload_path=path,
+                    dry_run=dry_run, created_by_id=created_by_id)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def run_import(job, batch_size=BATCH_SIZE):
+    """
+    Validate (and unless dry_run, insert) every row of a job's upload.
+
+    Rows are read from disk as a stream and handled batch_size at a time.
+    Valid rows are inserted and committed per batch; invalid rows are
+    skipped and reported with their row number (the header is row 1).
+    Progress is committed after each batch so the job page can follow it,
+    and a finished real import is recorded in the activity log.
+    """
+    job.status = 'running'
+    job.started_at = job.heartbeat_at = datetime.utcnow()
+    job.total_rows = count_rows(job.upload_path)
+    db.session.commit()
+
+    importer = TableImporter(job.table_name, job.created_by_id)
+    errors = []
+    counts = {'processed': 0, 'imported': 0, 'errors': 0}
+
+    def report(row_number, message):
+        counts['errors'] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': row_number, 'error': message})
+
+    def finish_batch(batch):
+        rejected = importer.check_batch(batch)
+        for row_number, message in sorted(rejected.items()):
+            report(row_number, message)
+        valid = [(row_number, values) for row_number, values in batch if row_number not in rejected]
+        if job.dry_run or not valid:
+            # A dry run counts the rows that would be imported
+            counts['imported'] += len(valid)
+            return
+        failed = importer.insert_batch(valid)
+        for row_number, message in sorted(failed.items()):
+            report(row_number, message)
+        counts['imported'] += len(valid) - len(failed)
+
+    def save_progress():
+        job.processed_rows = counts['processed']
+        job.imported_rows = counts['imported']
+        job.error_count = counts['errors']
+        job.errors = sorted(errors, key=lambda error: error['row'])
+        job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        if importer.invalidate and not job.dry_run and counts['imported']:
+            importer.invalidate()
+
+    try:
+        with open(job.upload_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            importer.check_header(reader.fieldnames or [])
+            batch = []
+            for row in reader:
+                row_number = reader.line_num
+                counts['processed'] += 1
+                try:
+                    batch.append((row_number, importer.parse_row(row)))
+                except RowError as e:
+                    report(row_number, str(e))
+                if len(batch) >= batch_size:
+                    finish_batch(batch)
+                    batch = []
+                    save_progress()
+            if batch:
+                finish_batch(batch)
+        job.status = 'completed'
+    except (RowError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.message = str(e)[:512]
+    except Exception as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.message = f'Error during import: {str(e)}'[:512]
+        current_app.logger.error(f'Import job {job.id} failed: {str(e)}')
+
+    job.finished_at = datetime.utcnow()
+    save_progress()
+    if not job.dry_run and job.upload_path and os.path.exists(job.upload_path):
+        # A dry run keeps its upload so it can be imported without re-uploading
+        os.remove(job.upload_path)
+        job.upload_path = None
+        db.session.commit()
+    if not job.dry_run:
+        log_activity(job.created_by_id, 'import',
+                     f"{job.imported_rows} {job.table_name} rows from {job.filename}",
+                     details={'item_type': 'import', 'job_id': job.id, 'table': job.table_name,
+                              'status': job.status, 'imported_rows': job.imported_rows,
+                              'error_count': job.error_count})
+    return job
+
+
+def fail_if_stale(job):
+    """
+    Mark a pending or running job failed if it has made no progress for
+    IMPORT_STALE_SECONDS, e.g. because the worker running it was restarted.
+
+    Returns:
+        bool: Whether the job was marked failed
+    """
+    if job.is_finished:
+        return False
+    stale_after = timedelta(seconds=current_app.config.get('IMPORT_STALE_SECONDS', 600))
+    last_seen = job.heartbeat_at or job.created_at
+    if last_seen > datetime.utcnow() - stale_after:
+        return False
+    job.status = 'failed'
+    job.message = 'The import was interrupted before it finished; please upload the file again'
+    job.finished_at = datetime.utcnow()
+    if not job.dry_run and job.upload_path and os.path.exists(job.upload_path):
+        os.remove(job.upload_path)
+        job.upload_path = None
+    db.session.commit()
+    current_app.logger.warning(f'Import job {job.id} marked failed after no progress since {last_seen}')
+    return True
+
+
+def start_import(job):
+    """
+    Run an import job in a background thread, so large files do not have
+    to finish within the upload request. With IMPORT_IN_BACKGROUND off the
+    job runs inline.
+    """
+    if not current_app.config.get('IMPORT_IN_BACKGROUND', True):
+        return run_import(job)
+
+    app = current_app._get_current_object()
+    job_id = job.id
+
+    def work():
+        with app.app_context():
+            try:
+                run_import(db.session.get(ImportJob, job_id))
+            finally:
+                db.session.remove()
+
+    threading.Thread(target=work, name=f'import-job-{job_id}', daemon=True).start()
+    return job
@@ -10,6 +10,9 @@ def send_stock_alert(items):
     
     Args:
         items: List of InventoryItem objects that are low in stock
+
+    Returns:
+        bool: True if the email was sent
     """
     if not items:
         return
@@ -26,7 +29,7 @@ def send_stock_alert(items):
     
     if not all([smtp_server, smtp_port, smtp_username, smtp_password, to_email]):
         current_app.logger.error('Email settings not properly configured')
-        return
+        return False
     
     # Create message
     msg = MIMEMultipart('alternative')
@@ -82,7 +85,8 @@ def send_stock_alert(items):
     
     try:
         # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
+        timeout = current_app.config.get('SMTP_TIMEOUT', 30)
+        with smtplib.SMTP(smtp_server, smtp_port, timeout=timeout) as server:
             server.starttls()
             server.login(smtp_username, smtp_password)
             server.send_message(msg)
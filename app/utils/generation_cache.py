@@ -0,0 +1,89 @@
+"""In-process caches of database snapshots, invalidated by local writes"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+
+class GenerationCache:
+    """
+    A value loaded from the database and shared by every request in the
+    process until it is older than its TTL or a local write invalidates it.
+
+    Every invalidation bumps a generation counter, and a value loaded under
+    an older generation is discarded. Writes also flag their session, so the
+    cache is invalidated again when the transaction ends, in case a reader
+    reloaded the value between the flush and the commit. The TTL bounds
+    staleness across worker processes.
+    """
+
+    def __init__(self, name, loader, ttl_key, default_ttl):
+        self.name = name  # Key in app.extensions
+        self.loader = loader
+        self.ttl_key = ttl_key
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._dirty_flag = f'{name}_dirty'
+
+    def get(self):
+        """Return the cached value, loading it if missing, stale or invalidated"""
+        ttl = current_app.config.get(self.ttl_key, self.default_ttl)
+        cached = current_app.extensions.get(self.name)
+        if self._is_fresh(cached, ttl):
+            return cached[0]
+
+        with self._lock:
+            cached = current_app.extensions.get(self.name)
+            if not self._is_fresh(cached, ttl):
+                generation = self._generation
+                cached = (self.loader(), generation, time.monotonic())
+                current_app.extensions[self.name] = cached
+            return cached[0]
+
+    def _is_fresh(self, cached, ttl):
+        return (cached is not None
+                and cached[1] == self._generation
+                and time.monotonic() - cached[2] < ttl)
+
+    def invalidate(self):
+        """Drop the cached value so the next reader reloads it"""
+        self._generation += 1
+
+    def mark_dirty(self, session):
+        """Invalidate now, and again when session's transaction ends"""
+        self.invalidate()
+        if session is not None:
+            session.info[self._dirty_flag] = True
+
+    def end_transaction(self, session):
+        if session.info.pop(self._dirty_flag, False):
+            self.invalidate()
+
+
+def register_invalidation(cache, models):
+    """
+    Invalidate cache whenever a row of any of models is inserted, updated or
+    deleted, whether through the ORM or a bulk INSERT/UPDATE/DELETE statement
+    (which bypasses the mapper events).
+    """
+    def _row_written(mapper, connection, target):
+        cache.mark_dirty(object_session(target))
+
+    for model in models:
+        for event_name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, event_name, _row_written)
+
+    mappers = {model.__mapper__ for model in models}
+
+    def _bulk_write(orm_execute_state):
+        if not orm_execute_state.is_select and mappers & set(orm_execute_state.all_mappers):
+            cache.mark_dirty(orm_execute_state.session)
+
+    def _end_transaction(session):
+        cache.end_transaction(session)
+
+    event.listen(Session, 'do_orm_execute', _bulk_write)
+    event.listen(Session, 'after_commit', _end_transaction)
+    event.listen(Session, 'after_rollback', _end_transaction)
@@ -0,0 +1,118 @@
+"""Multi-page label sheets rendered with reportlab"""
+from reportlab.graphics.barcode import code128
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+# Same 4x2 inch stock as the browser label (print_label.html), one label per page
+LABEL_SIZE = (4 * inch, 2 * inch)
+MARGIN = 0.15 * inch
+DETAILS_WIDTH = 2.2 * inch
+BARCODE_WIDTH = 1.45 * inch
+BARCODE_HEIGHT = 0.75 * inch
+
+
+def _fit(text, font, size, width):
+    """Truncate text with an ellipsis so it fits in the given width"""
+    text = str(text or '')
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '...', font, size) > width:
+        text = text[:-1]
+    return text + '...'
+
+
+def label_fields(record):
+    """
+    Title and detail rows for a label, mirroring print_label.html.
+
+    Returns:
+        tuple: (title, [(label, value), ...])
+    """
+    rows = []
+    if hasattr(record, 'cpu_id'):
+        model = f"{record.model.manufacturer} {record.model.model_name}" if record.model else ''
+        rows.append(('Model:', model))
+        if record.cpu:
+            rows.append(('CPU:', f"{record.cpu.manufacturer} {record.cpu.model}"))
+        if record.cpu_benchmark:
+            rows.append(('Bench:', f"{record.cpu_benchmark:.1f}"))
+        rows.append(('RAM:', record.ram))
+        rows.append(('Storage:', record.storage))
+        if record.serial_tag:
+            rows.append(('S/N:', record.serial_tag))
+        return model, rows
+
+    if record.manufacturer:
+        rows.append(('Mfr:', record.manufacturer))
+    if record.mpn:
+        rows.append(('MPN:', record.mpn))
+    if record.category:
+        rows.append(('Type:', record.category.name))
+    return record.name, rows
+
+
+def draw_label(pdf, record):
+    """Draw one label on the current page of the canvas"""
+    width, height = LABEL_SIZE
+    title, rows = label_fields(record)
+
+    # Left side - details
+    x = MARGIN
+    y = height - MARGIN - 11
+    pdf.setFont('Helvetica-Bold', 11)
+    pdf.drawString(x, y, _fit(title, 'Helvetica-Bold', 11, DETAILS_WIDTH))
+    if record.created_at:
+        y -= 10
+        pdf.setFont('Helvetica', 7)
+        pdf.drawString(x, y, f"Created: {record.created_at.strftime('%m/%d/%Y')}")
+
+    y -= 4
+    for label, value in rows:
+        y -= 10
+        pdf.setFont('Helvetica-Bold', 8)
+        pdf.drawString(x, y, label)
+        pdf.setFont('Helvetica', 8)
+        pdf.drawString(x + 0.5 * inch, y, _fit(value, 'Helvetica', 8, DETAILS_WIDTH - 0.5 * inch))
+
+    y = MARGIN
+    pdf.setFont('Helvetica', 7)
+    if record.storage_location:
+        pdf.drawString(x, y, _fit(f"Location: {record.storage_location}", 'Helvetica', 7, DETAILS_WIDTH))
+        y += 9
+    if record.creator:
+        pdf.drawString(x, y, _fit(f"Added by: {record.creator.username}", 'Helvetica', 7, DETAILS_WIDTH))
+
+    # Right side - vector Code128, scaled so the bars fill the column
+    center = width - MARGIN - BARCODE_WIDTH / 2
+    pdf.setFont('Helvetica-Bold', 8)
+    pdf.drawCentredString(center, height - MARGIN - 8, 'TC INVENTORY')
+
+    barcode = code128.Code128(record.tracking_id, barWidth=1, barHeight=BARCODE_HEIGHT, quiet=False)
+    bar_width = BARCODE_WIDTH / barcode.width
+    barcode = code128.Code128(record.tracking_id, barWidth=bar_width, barHeight=BARCODE_HEIGHT, quiet=False)
+    barcode.drawOn(pdf, center - barcode.width / 2, (height - BARCODE_HEIGHT) / 2)
+
+    pdf.setFont('Helvetica-Bold', 9)
+    pdf.drawCentredString(center, (height - BARCODE_HEIGHT) / 2 - 12, record.tracking_id)
+
+
+def write_labels_pdf(records, output):
+    """
+    Write one label per page for each record to a binary file object.
+
+    Records are drawn as they are iterated, so a lazily loaded query keeps
+    only the current batch of rows in memory.
+
+    Returns:
+        int: Number of labels written
+    """
+    pdf = canvas.Canvas(output, pagesize=LABEL_SIZE, pageCompression=1)
+    pdf.setTitle('Labels')
+    count = 0
+    for record in records:
+        draw_label(pdf, record)
+        pdf.showPage()
+        count += 1
+    pdf.save()
+    return count
@@ -1,50 +1,200 @@
 import os
-import logging
-from datetime import datetime, timedelta
+import heapq
+import itertools
+import zlib
+from datetime import datetime
 from flask import current_app
 
+LOG_DIR = 'logs'
+# Timestamp prefix written by the app.log and activity.log formatters
+LOG_DATE_FORMAT = '%Y-%m-%d %I:%M:%S %p'
+LOG_DATE_LENGTH = len('2024-01-01 12:00:00 AM')
+BLOCK_SIZE = 64 * 1024
+
+
+def parse_log_timestamp(line):
+    """Return the timestamp at the start of a log line, or None for continuation lines"""
+    try:
+        return datetime.strptime(line[:LOG_DATE_LENGTH], LOG_DATE_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+def rotated_log_files(path):
+    """
+    Return a log file and its RotatingFileHandler backups, newest first
+    (app.log, app.log.1, app.log.2, ...).
+    """
+    files = [path] if os.path.exists(path) else []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        files.append(f'{path}.{index}')
+        index += 1
+    return files
+
+
+def read_lines_reverse(path, block_size=BLOCK_SIZE):
+    """Yield the lines of a file from last to first, reading fixed-size blocks from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b'\n')
+            # The first piece may be the tail of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode('utf-8', errors='replace').rstrip('\r')
+        if remainder.strip():
+            yield remainder.decode('utf-8', errors='replace').rstrip('\r')
+
+
+def read_entries_reverse(path):
+    """
+    Yield (timestamp, entry) pairs for a log file and its rotated backups,
+    newest first. Continuation lines, such as tracebacks, stay attached to
+    the entry they follow.
+    """
+    for filename in rotated_log_files(path):
+        continuation = []
+        for line in read_lines_reverse(filename):
+            timestamp = parse_log_timestamp(line)
+            if timestamp is None:
+                continuation.append(line)
+                continue
+            yield timestamp, '\n'.join([line] + continuation[::-1])
+            continuation = []
+
+
+def merge_entries_reverse(paths):
+    """Merge several newest-first entry streams into one, by timestamp"""
+    streams = [read_entries_reverse(path) for path in paths]
+    return heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+
+
+def tail_logs(paths, max_lines=100):
+    """
+    Return the newest entries across log files, most recent first.
+
+    Each file is read backwards from its end and the streams are merged, so
+    the cost depends on max_lines rather than on the size of the logs.
+
+    Returns:
+        list: (timestamp, entry) pairs
+    """
+    return list(itertools.islice(merge_entries_reverse(paths), max_lines))
+
+
 def get_recent_logs(max_lines=100):
     """
     Get the most recent log entries from the application logs.
-    
+
     Args:
         max_lines (int): Maximum number of log lines to return
-        
+
     Returns:
         list: List of log entries, most recent first
     """
     try:
-        # Get log entries from Flask's default logger
-        logs = []
-        for handler in current_app.logger.handlers:
-            if isinstance(handler.formatter, logging.Formatter):
-                # Get records from the handler
-                if hasattr(handler, 'stream'):
-                    # For StreamHandler
-                    if hasattr(handler.stream, 'getvalue'):
-                        logs.extend(handler.stream.getvalue().splitlines())
-                elif hasattr(handler, 'baseFilename'):
-                    # For FileHandler
-                    try:
-                        with open(handler.baseFilename, 'r') as f:
-                            logs.extend(f.readlines())
-                    except FileNotFoundError:
-                        current_app.logger.warning(f"Log file not found: {handler.baseFilename}")
-        
-        # If no logs found in handlers, try reading from app.log
-        if not logs:
-            log_file = os.path.join('logs', 'app.log')
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    logs = f.readlines()
-            else:
-                current_app.logger.warning(f"No log file found at: {log_file}")
-        
-        # Clean and format logs
-        logs = [log.strip() for log in logs if log.strip()]
-        
-        # Return most recent logs first
-        return list(reversed(logs[-max_lines:]))
+        return [entry for _, entry in tail_logs([os.path.join(LOG_DIR, 'app.log')], max_lines)]
     except Exception as e:
         current_app.logger.error(f"Error reading logs: {str(e)}")
-        return [] 
\ No newline at end of file
+        return []
+
+
+def _next_line_start(f, offset):
+    """Offset of the first line that starts at or after offset"""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def _first_timestamp_from(f, offset):
+    """Timestamp of the first timestamped line at or after a line start, or None at EOF"""
+    f.seek(offset)
+    for line in iter(f.readline, b''):
+        timestamp = parse_log_timestamp(line.decode('utf-8', errors='replace'))
+        if timestamp is not None:
+            return timestamp
+    return None
+
+
+def find_start_offset(f, start):
+    """
+    Binary-search a chronologically ordered log file (opened in binary mode)
+    for the offset of the first line whose entry is at or after start.
+    """
+    f.seek(0, os.SEEK_END)
+    low, high = 0, f.tell()
+    while low < high:
+        middle = (low + high) // 2
+        timestamp = _first_timestamp_from(f, _next_line_start(f, middle))
+        if timestamp is None or timestamp >= start:
+            high = middle
+        else:
+            low = middle + 1
+    return _next_line_start(f, low)
+
+
+def read_entries_forward(path, start, end):
+    """
+    Yield (timestamp, entry) pairs with start <= timestamp < end from a log
+    file and its rotated backups, oldest first. Each file is entered at the
+    start offset found by binary search and left at the first later entry.
+    """
+    for filename in reversed(rotated_log_files(path)):
+        with open(filename, 'rb') as f:
+            f.seek(find_start_offset(f, start))
+            current = None
+            for raw_line in f:
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                timestamp = parse_log_timestamp(line)
+                if timestamp is None:
+                    if current is not None:
+                        current[1].append(line)
+                    continue
+                if current is not None:
+                    yield current[0], '\n'.join(current[1])
+                if timestamp >= end:
+                    # Later files are newer still, so nothing else is in range
+                    return
+                current = (timestamp, [line])
+            if current is not None:
+                yield current[0], '\n'.join(current[1])
+
+
+def merge_entries(streams):
+    """Merge oldest-first (timestamp, entry) streams into one, by timestamp"""
+    return heapq.merge(*streams, key=lambda entry: entry[0])
+
+
+def export_chunks(entries, compress=False, chunk_size=BLOCK_SIZE):
+    """
+    Encode (timestamp, entry) pairs as log text in chunks of about
+    chunk_size bytes, gzip-compressed if requested, for a streamed response.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 writes a gzip header
+    buffer = []
+    size = 0
+    for _, entry in entries:
+        data = (entry + '\n').encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            chunk = b''.join(buffer)
+            buffer, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    chunk = b''.join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,102 @@
+"""In-process LRU cache of the users behind mobile API tokens"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+# Seconds a cached user is trusted before it is reloaded. Local writes to a
+# user evict it immediately; the TTL bounds staleness across worker processes.
+DEFAULT_TTL = 30
+DEFAULT_SIZE = 1024
+
+
+class MobilePrincipal:
+    """Lightweight, read-only view of the user making a mobile API call"""
+
+    __slots__ = ('id', 'username', 'role', 'token_version')
+
+    def __init__(self, id, username, role, token_version):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.token_version = token_version
+
+    def __repr__(self):
+        return f'<MobilePrincipal {self.username}>'
+
+
+_lock = threading.Lock()
+
+
+def _cache():
+    return current_app.extensions.setdefault('mobile_principals', OrderedDict())
+
+
+def _load_principal(user_id):
+    from app import db
+    from app.models.user import User
+
+    row = db.session.execute(
+        select(User.id, User.username, User.is_admin, User.token_version)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    return MobilePrincipal(row.id, row.username, 'admin' if row.is_admin else 'user',
+                           row.token_version or 0)
+
+
+def get_principal(user_id):
+    """
+    Return the MobilePrincipal for a token's user_id, or None if the user
+    no longer exists. Missing users are not cached.
+    """
+    ttl = current_app.config.get('MOBILE_PRINCIPAL_CACHE_TTL', DEFAULT_TTL)
+    cache = _cache()
+    with _lock:
+        cached = cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[1] < ttl:
+            cache.move_to_end(user_id)
+            return cached[0]
+
+    principal = _load_principal(user_id)
+    if principal is not None:
+        size = current_app.config.get('MOBILE_PRINCIPAL_CACHE_SIZE', DEFAULT_SIZE)
+        with _lock:
+            cache[user_id] = (principal, time.monotonic())
+            cache.move_to_end(user_id)
+            while len(cache) > size:
+                cache.popitem(last=False)
+    return principal
+
+
+def evict_principal(user_id):
+    """Drop a user from the cache so their next request reloads them"""
+    if not has_app_context():
+        return
+    with _lock:
+        _cache().pop(user_id, None)
+
+
+def _user_written(mapper, connection, target):
+    evict_principal(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('mobile_principals_dirty', set()).add(target.id)
+
+
+def _after_transaction(session):
+    # Evict again once the change is committed (or rolled back), in case a
+    # request reloaded the user between the flush and the end of the transaction
+    for user_id in session.info.pop('mobile_principals_dirty', ()):
+        evict_principal(user_id)
+
+
+def register_principal_listeners(user_model):
+    """Evict cached principals when their user row is updated or deleted"""
+    event.listen(user_model, 'after_update', _user_written)
+    event.listen(user_model, 'after_delete', _user_written)
+    event.listen(Session, 'after_commit', _after_transaction)
+    event.listen(Session, 'after_rollback', _after_transaction)
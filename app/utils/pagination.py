@@ -0,0 +1,106 @@
+"""Keyset (cursor) pagination helpers"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+
+    Args:
+        values (list): Sort key values (datetimes are stored as ISO strings)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = [
+        {'dt': value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        list: Sort key values, or None if the cursor is missing or malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return [
+            datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def keyset_filter(columns, values, descending=True):
+    """
+    Build a WHERE clause that selects rows after the given sort key.
+
+    For columns (a, b) sorted descending this produces
+    ``a < :a OR (a = :a AND b < :b)``, which both PostgreSQL and SQLite
+    can answer from a composite index on (a, b).
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        past = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, past))
+    return or_(*clauses)
+
+
+def keyset_page(query, columns, cursor=None, limit=20, descending=True, key=None):
+    """
+    Fetch one page of a query using keyset pagination.
+
+    The query must not already be ordered. One extra row is fetched to
+    determine whether another page exists, so no COUNT query is needed.
+    Columns may be SQL expressions (e.g. a search rank) as long as key
+    returns their values for a row; by default each column's value is read
+    from the row attribute of the same name.
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    values = decode_cursor(cursor)
+    if values is not None and len(values) == len(columns):
+        query = query.filter(keyset_filter(columns, values, descending))
+
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        values = key(last) if key else [getattr(last, column.key) for column in columns]
+        next_cursor = encode_cursor(list(values))
+    return rows, next_cursor
+
+
+def estimate_count(query, cap=1000):
+    """
+    Approximate number of rows a query returns, without counting them all.
+
+    PostgreSQL reports the planner's row estimate from EXPLAIN. Other
+    databases count at most cap rows.
+    """
+    query = query.order_by(None)
+    connection = query.session.connection()
+    if connection.dialect.name == 'postgresql':
+        compiled = query.statement.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(
+            'EXPLAIN (FORMAT JSON) ' + compiled.string, compiled.params
+        ).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+    return query.limit(cap).count()
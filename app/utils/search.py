@@ -0,0 +1,267 @@
+"""Ranked full-text search over inventory items, computer systems and wiki pages
+
+On PostgreSQL, items, computer_systems and wiki_page carry a ``search_vector``
+tsvector column kept current by triggers (see the add_search_vectors and
+add_wiki_search migrations) and covered by a GIN index. Queries are matched by word prefix and ordered by
+ts_rank. Other databases (SQLite in tests) fall back to ILIKE over the same
+columns with a simple exact/prefix ranking. On either, a query shaped like
+part of a tracking ID, barcode or UPC is also matched as a substring of those
+columns (see identifier_fragment).
+"""
+import re
+from bs4 import BeautifulSoup
+from markupsafe import Markup, escape
+from sqlalchemy import BigInteger, case, cast, func, literal, or_, and_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app import db
+
+# Text search configuration: no stemming or stop words, since names,
+# part numbers and tracking IDs are matched as written
+TS_CONFIG = 'simple'
+MAX_TERMS = 8
+# ts_rank returns a 4-byte real, which does not compare equal to itself after
+# a round trip through a JSON cursor; scaled to an integer it does
+RANK_SCALE = 1000000
+
+
+def search_vector_type():
+    """Column type for search_vector columns; plain text outside PostgreSQL"""
+    return TSVECTOR().with_variant(db.Text(), 'sqlite')
+
+
+def search_terms(q):
+    """Split a search string into lowercase word terms safe for to_tsquery"""
+    return re.findall(r'\w+', (q or '').lower())[:MAX_TERMS]
+
+
+def use_fulltext():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def identifier_fragment(q):
+    """
+    The stripped query if it looks like part of an identifier, else None.
+
+    That is a single token containing a digit or hyphen (e.g. '0000AB' or
+    'TC-00'), or one made only of punctuation. Word-prefix tsqueries miss
+    the middle of such tokens and drop punctuation entirely, so they are
+    matched as substrings instead. Plain words are left to the index.
+    """
+    q = (q or '').strip()
+    if not q or re.search(r'\s', q):
+        return None
+    if re.search(r'[\d-]', q) or not search_terms(q):
+        return q
+    return None
+
+
+def _substring_criterion(columns, fragment):
+    """fragment appears, as written, in at least one of columns"""
+    escaped = fragment.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return or_(*[column.ilike(f'%{escaped}%', escape='\\') for column in columns])
+
+
+def prefix_tsquery(q, config=TS_CONFIG):
+    """tsquery matching every term of q as a word prefix, e.g. 'dell:* & 5520:*'"""
+    return func.to_tsquery(config, ' & '.join(f'{term}:*' for term in search_terms(q)))
+
+
+def ts_rank(vector, tsquery):
+    """ts_rank as an integer, so it can be used as an exact keyset sort key"""
+    return cast(func.ts_rank(vector, tsquery) * RANK_SCALE, BigInteger)
+
+
+def _like_criterion(columns, q):
+    """Every term appears in at least one of columns"""
+    return and_(*[or_(*[column.ilike(f'%{term}%') for column in columns]) for term in search_terms(q)])
+
+
+def _with_identifier_match(criterion, columns, q):
+    """
+    criterion (None when q has no word terms), or-ed with a substring match
+    on columns if q is identifier-shaped
+    """
+    fragment = identifier_fragment(q)
+    if fragment is None:
+        return literal(False) if criterion is None else criterion
+    if criterion is None:
+        return _substring_criterion(columns, fragment)
+    return or_(criterion, _substring_criterion(columns, fragment))
+
+
+def _item_columns():
+    from app.models.inventory import InventoryItem
+    return [InventoryItem.name, InventoryItem.tracking_id, InventoryItem.barcode,
+            InventoryItem.upc, InventoryItem.manufacturer, InventoryItem.mpn]
+
+
+def _item_identifier_columns():
+    from app.models.inventory import InventoryItem
+    return [InventoryItem.tracking_id, InventoryItem.barcode, InventoryItem.upc]
+
+
+def item_search_filter(q):
+    """Criterion matching items by name, tracking ID, barcode, UPC, manufacturer or MPN"""
+    from app.models.inventory import InventoryItem
+    criterion = None
+    if search_terms(q):
+        if use_fulltext():
+            criterion = InventoryItem.search_vector.op('@@')(prefix_tsquery(q))
+        else:
+            criterion = _like_criterion(_item_columns(), q)
+    return _with_identifier_match(criterion, _item_identifier_columns(), q)
+
+
+def item_search_rank(q):
+    """Relevance score of an item for q; higher is better"""
+    from app.models.inventory import InventoryItem
+    if use_fulltext() and search_terms(q):
+        return ts_rank(InventoryItem.search_vector, prefix_tsquery(q))
+    q = (q or '').strip()
+    return case(
+        (func.lower(InventoryItem.tracking_id) == q.lower(), 2),
+        (InventoryItem.barcode == q, 2),
+        (InventoryItem.name.ilike(f'{q}%'), 1),
+        else_=0
+    )
+
+
+def search_items(query, q):
+    """Filter an InventoryItem query by q and order it by relevance"""
+    return query.filter(item_search_filter(q)).order_by(item_search_rank(q).desc())
+
+
+def system_search_filter(q):
+    """Criterion matching systems by tracking ID, serial tag or model manufacturer/name"""
+    from app.models.inventory import ComputerSystem, ComputerModel
+    terms = search_terms(q)
+    criterion = None
+    if terms and use_fulltext():
+        criterion = ComputerSystem.search_vector.op('@@')(prefix_tsquery(q))
+    elif terms:
+        criterion = and_(*[
+            or_(
+                ComputerSystem.tracking_id.ilike(f'%{term}%'),
+                ComputerSystem.serial_tag.ilike(f'%{term}%'),
+                ComputerSystem.model.has(or_(
+                    ComputerModel.manufacturer.ilike(f'%{term}%'),
+                    ComputerModel.model_name.ilike(f'%{term}%')
+                ))
+            )
+            for term in terms
+        ])
+    identifier_columns = [ComputerSystem.tracking_id, ComputerSystem.serial_tag]
+    return _with_identifier_match(criterion, identifier_columns, q)
+
+
+def system_search_rank(q):
+    """Relevance score of a system for q; higher is better"""
+    from app.models.inventory import ComputerSystem
+    if use_fulltext() and search_terms(q):
+        return ts_rank(ComputerSystem.search_vector, prefix_tsquery(q))
+    q = (q or '').strip().lower()
+    return case(
+        (func.lower(ComputerSystem.tracking_id) == q, 1),
+        (func.lower(ComputerSystem.serial_tag) == q, 1),
+        else_=0
+    )
+
+
+def search_systems(query, q):
+    """Filter a ComputerSystem query by q and order it by relevance"""
+    return query.filter(system_search_filter(q)).order_by(system_search_rank(q).desc())
+
+
+# Wiki pages are prose, so they are stemmed as English
+WIKI_TS_CONFIG = 'english'
+SNIPPET_LENGTH = 160
+# Highlight delimiters placed around matches before the snippet is escaped
+_START, _STOP = '\x02', '\x03'
+
+
+def html_to_text(html):
+    """Visible text of an HTML fragment with whitespace collapsed"""
+    if not html:
+        return ''
+    text = BeautifulSoup(html, 'html.parser').get_text(' ')
+    return ' '.join(text.split()).replace(_START, '').replace(_STOP, '')
+
+
+def wiki_search_filter(q):
+    """Criterion matching wiki pages by title or text"""
+    from app.models.inventory import WikiPage
+    if not search_terms(q):
+        return literal(False)
+    if use_fulltext():
+        return WikiPage.search_vector.op('@@')(prefix_tsquery(q, WIKI_TS_CONFIG))
+    return _like_criterion([WikiPage.title, WikiPage.plain_text], q)
+
+
+def wiki_search_rank(q):
+    """Relevance score of a wiki page for q; higher is better"""
+    from app.models.inventory import WikiPage
+    if use_fulltext():
+        return ts_rank(WikiPage.search_vector, prefix_tsquery(q, WIKI_TS_CONFIG))
+    return case((WikiPage.title.ilike(f'%{(q or "").strip()}%'), 1), else_=0)
+
+
+def _snippet_column(q):
+    from app.models.inventory import WikiPage
+    if not q:
+        return func.substr(WikiPage.plain_text, 1, SNIPPET_LENGTH + 1)
+    if use_fulltext():
+        return func.ts_headline(
+            WIKI_TS_CONFIG, WikiPage.plain_text, prefix_tsquery(q, WIKI_TS_CONFIG),
+            f'StartSel={_START}, StopSel={_STOP}, MaxWords=30, MinWords=15, MaxFragments=2'
+        )
+    # Other databases: the snippet is cut around the first match in Python
+    return WikiPage.plain_text
+
+
+def _highlight_text(text, terms):
+    """Cut text around the first matching term and mark every match"""
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - SNIPPET_LENGTH // 3) if match else 0
+    snippet = text[start:start + SNIPPET_LENGTH + 1]
+    snippet = pattern.sub(lambda m: f'{_START}{m.group(0)}{_STOP}', snippet)
+    return ('... ' if start else '') + snippet
+
+
+def render_snippet(text):
+    """Escape a snippet and turn highlight delimiters into <mark> tags"""
+    text = text or ''
+    if len(text) > SNIPPET_LENGTH and _START not in text:
+        text = text[:SNIPPET_LENGTH].rstrip() + '...'
+    return Markup(str(escape(text)).replace(_START, '<mark>').replace(_STOP, '</mark>'))
+
+
+def search_wiki_pages(query, q=None):
+    """
+    Filter a WikiPage query by q (if given) and order it by relevance, or by
+    most recently updated without a search.
+
+    Each row is (WikiPage, snippet); pass the rows through with_snippets.
+    Page content is deferred, so listings never load the page bodies.
+    """
+    from app.models.inventory import WikiPage
+    query = query.options(
+        db.defer(WikiPage.content),
+        db.joinedload(WikiPage.author),
+        db.joinedload(WikiPage.category)
+    ).add_columns(_snippet_column(q))
+    if q:
+        query = query.filter(wiki_search_filter(q)).order_by(wiki_search_rank(q).desc())
+    return query.order_by(WikiPage.updated_at.desc(), WikiPage.id.desc())
+
+
+def with_snippets(rows, q=None):
+    """WikiPages from search_wiki_pages rows, each with a rendered .snippet"""
+    terms = search_terms(q)
+    pages = []
+    for page, text in rows:
+        if terms and not use_fulltext():
+            text = _highlight_text(text or '', terms)
+        page.snippet = render_snippet(text)
+        pages.append(page)
+    return pages
@@ -0,0 +1,131 @@
+"""Low-stock alert queue, drained outside the request cycle"""
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models.alerts import StockAlert
+from app.models.config import Configuration
+from app.models.inventory import InventoryItem
+from app.utils.email import send_stock_alert
+
+
+def is_low_stock(item):
+    return item.reorder_threshold is not None and (item.quantity or 0) <= item.reorder_threshold
+
+
+def enqueue_stock_alert(item):
+    """
+    Queue a low-stock alert for an item in the caller's transaction.
+
+    Nothing is queued if alerts are disabled, the item is not low, an alert
+    for it is already pending, or one was sent (or given up on) within
+    STOCK_ALERT_REPEAT_HOURS.
+
+    Returns:
+        StockAlert: The queued alert, or None
+    """
+    if Configuration.get_value('enable_low_stock_alerts', 'false') != 'true':
+        return None
+    if not is_low_stock(item):
+        return None
+
+    repeat_after = datetime.utcnow() - timedelta(hours=current_app.config.get('STOCK_ALERT_REPEAT_HOURS', 24))
+    already_alerted = db.session.query(StockAlert.id).filter(
+        StockAlert.item_id == item.id,
+        db.or_(
+            db.and_(StockAlert.sent_at.is_(None), StockAlert.failed_at.is_(None)),
+            StockAlert.sent_at > repeat_after,
+            StockAlert.failed_at > repeat_after
+        )
+    ).first()
+    if already_alerted:
+        return None
+
+    alert = StockAlert(item_id=item.id, quantity=item.quantity)
+    db.session.add(alert)
+    return alert
+
+
+def process_stock_alerts(force=False):
+    """
+    Send one digest for all pending alerts.
+
+    Alerts are coalesced: nothing is sent until the oldest pending alert has
+    waited STOCK_ALERT_WINDOW_SECONDS, unless force is set (which also skips
+    any retry backoff). Items restocked in the meantime are dropped from the
+    digest. If the email cannot be sent the alerts are retried after
+    STOCK_ALERT_RETRY_SECONDS, doubling each time, and dropped after
+    STOCK_ALERT_MAX_ATTEMPTS attempts.
+
+    Returns:
+        int: Number of items included in the sent digest
+    """
+    window = timedelta(seconds=current_app.config.get('STOCK_ALERT_WINDOW_SECONDS', 300))
+    now = datetime.utcnow()
+
+    # Lock the pending rows so concurrent workers do not send the same digest
+    pending = StockAlert.query.filter(StockAlert.sent_at.is_(None), StockAlert.failed_at.is_(None))
+    if not force:
+        pending = pending.filter(db.or_(StockAlert.next_attempt_at.is_(None), StockAlert.next_attempt_at <= now))
+    pending = pending.order_by(StockAlert.queued_at)\
+        .with_for_update(skip_locked=True)\
+        .all()
+    if not pending or (not force and pending[0].queued_at > now - window):
+        db.session.rollback()
+        return 0
+
+    item_ids = {alert.item_id for alert in pending}
+    items = [item for item in InventoryItem.query.filter(InventoryItem.id.in_(item_ids))
+             .order_by(InventoryItem.name) if is_low_stock(item)]
+
+    if items:
+        sent = send_stock_alert(items)
+        if not sent:
+            _record_failure(pending, now)
+            db.session.commit()
+            return 0
+
+    for alert in pending:
+        alert.attempts += 1
+        alert.sent_at = now
+        alert.next_attempt_at = None
+        alert.last_error = None
+    db.session.commit()
+    return len(items)
+
+
+def _record_failure(alerts, now):
+    """Schedule the next attempt for alerts whose digest failed, or give up on them"""
+    max_attempts = current_app.config.get('STOCK_ALERT_MAX_ATTEMPTS', 5)
+    retry_seconds = current_app.config.get('STOCK_ALERT_RETRY_SECONDS', 60)
+    dropped = []
+    for alert in alerts:
+        alert.attempts += 1
+        alert.last_error = 'Stock alert email could not be sent'
+        if alert.attempts >= max_attempts:
+            alert.failed_at = now
+            alert.next_attempt_at = None
+            dropped.append(alert.item_id)
+        else:
+            alert.next_attempt_at = now + timedelta(seconds=retry_seconds * 2 ** (alert.attempts - 1))
+    if dropped:
+        current_app.logger.error(
+            f'Dropped stock alerts for items {sorted(dropped)} after {max_attempts} failed attempts')
+
+
+def run_alert_worker(poll_seconds=None, once=False):
+    """Drain the alert queue until interrupted"""
+    poll_seconds = poll_seconds or current_app.config.get('STOCK_ALERT_POLL_SECONDS', 30)
+    while True:
+        try:
+            sent = process_stock_alerts(force=once)
+            if sent:
+                current_app.logger.info(f'Sent stock alert digest for {sent} items')
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f'Stock alert worker error: {str(e)}')
+        finally:
+            db.session.remove()
+        if once:
+            return
+        time.sleep(poll_seconds)
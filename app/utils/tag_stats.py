@@ -0,0 +1,109 @@
+"""In-process cache of tags with their item and system usage counts"""
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from app.utils.generation_cache import GenerationCache, register_invalidation
+
+# Seconds cached counts are trusted before they are reloaded. Local writes
+# invalidate immediately; the TTL bounds staleness across worker processes.
+DEFAULT_TTL = 60
+
+
+class TagUsage:
+    """Lightweight, read-only view of a tag and how often it is used"""
+
+    __slots__ = ('id', 'name', 'color', 'created_at', 'item_count', 'system_count')
+
+    def __init__(self, id, name, color, created_at, item_count, system_count):
+        self.id = id
+        self.name = name
+        self.color = color
+        self.created_at = created_at
+        self.item_count = item_count
+        self.system_count = system_count
+
+    @property
+    def total(self):
+        return self.item_count + self.system_count
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'color': self.color,
+            'item_count': self.item_count,
+            'system_count': self.system_count
+        }
+
+    def __repr__(self):
+        return f'<TagUsage {self.name} items={self.item_count} systems={self.system_count}>'
+
+
+def _load_tag_usage():
+    """Every tag with its usage counts, by name, in one statement"""
+    from app import db
+    from app.models.inventory import Tag, item_tags, system_tags
+
+    item_counts = select(item_tags.c.tag_id, func.count().label('count'))\
+        .group_by(item_tags.c.tag_id).subquery()
+    system_counts = select(system_tags.c.tag_id, func.count().label('count'))\
+        .group_by(system_tags.c.tag_id).subquery()
+    rows = db.session.execute(
+        select(Tag.id, Tag.name, Tag.color, Tag.created_at,
+               func.coalesce(item_counts.c.count, 0),
+               func.coalesce(system_counts.c.count, 0))
+        .outerjoin(item_counts, item_counts.c.tag_id == Tag.id)
+        .outerjoin(system_counts, system_counts.c.tag_id == Tag.id)
+        .order_by(Tag.name)
+    )
+    return tuple(TagUsage(*row) for row in rows)
+
+
+_cache = GenerationCache('tag_stats', _load_tag_usage, 'TAG_STATS_CACHE_TTL', DEFAULT_TTL)
+
+
+def get_tag_stats():
+    """Return every tag with its usage counts, ordered by name"""
+    return _cache.get()
+
+
+def get_tag_choices():
+    """(id, name) pairs for tag pickers"""
+    return [(tag.id, tag.name) for tag in get_tag_stats()]
+
+
+def invalidate_tag_stats():
+    """Drop the cached counts so the next reader reloads them"""
+    _cache.invalidate()
+
+
+def register_tag_listeners(tag_model, tagged_models):
+    """
+    Invalidate the cache when a tag is written or when tags are assigned to
+    or removed from any of tagged_models (each with a `tags` relationship).
+    """
+    register_invalidation(_cache, [tag_model])
+
+    tagged_models = tuple(tagged_models)
+
+    def _before_flush(session, flush_context, instances):
+        if any(isinstance(obj, tagged_models) for obj in session.deleted):
+            _cache.mark_dirty(session)
+            return
+        for obj in session.new:
+            if isinstance(obj, tagged_models) and obj.tags:
+                _cache.mark_dirty(session)
+                return
+        for obj in session.dirty:
+            if isinstance(obj, tagged_models) and inspect(obj).attrs.tags.history.has_changes():
+                _cache.mark_dirty(session)
+                return
+
+    # Bulk deletes of tagged rows bypass the flush events (their assignments cascade away)
+    tagged_mappers = {model.__mapper__ for model in tagged_models}
+
+    def _bulk_delete(orm_execute_state):
+        if orm_execute_state.is_delete and tagged_mappers & set(orm_execute_state.all_mappers):
+            _cache.mark_dirty(orm_execute_state.session)
+
+    event.listen(Session, 'before_flush', _before_flush)
+    event.listen(Session, 'do_orm_execute', _bulk_delete)
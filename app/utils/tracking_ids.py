@@ -0,0 +1,88 @@
+"""Tracking IDs for items and systems, reserved in blocks from a shared counter"""
+import threading
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.tracking import TrackingIdCounter
+from app.models.inventory import InventoryItem, ComputerSystem
+
+PREFIX = 'TC-'
+# Counter values are scrambled by a bijection on 32 bits, so IDs keep the
+# TC-XXXXXXXX shape and do not look sequential
+ID_SPACE = 2 ** 32
+MULTIPLIER = 0x9E3779B1  # Odd, so multiplication is invertible mod 2**32
+MASK = 0x5A5A5A5A
+
+_lock = threading.Lock()
+
+
+def encode_tracking_id(value):
+    """The tracking ID for a counter value; distinct values give distinct IDs"""
+    return f'{PREFIX}{((value * MULTIPLIER) % ID_SPACE) ^ MASK:08X}'
+
+
+def _reserve_values(count):
+    """
+    Atomically advance the counter by count on its own connection, so the
+    reservation survives a rollback of the caller's transaction and holds no
+    lock while it runs.
+
+    Returns:
+        range: The reserved counter values
+    """
+    counter = TrackingIdCounter.__table__
+    for _ in range(2):
+        with db.engine.begin() as connection:
+            end = connection.execute(
+                update(counter)
+                .where(counter.c.id == 1)
+                .values(next_value=counter.c.next_value + count)
+                .returning(counter.c.next_value)
+            ).scalar()
+            if end is not None:
+                return range(end - count, end)
+        try:
+            # First allocation on this database: create the counter row
+            with db.engine.begin() as connection:
+                connection.execute(counter.insert().values(id=1, next_value=1))
+        except IntegrityError:
+            pass  # Another worker created it first
+    raise RuntimeError('Could not reserve tracking IDs')
+
+
+def reserve(count):
+    """
+    Reserve count new tracking IDs, unique across items and systems.
+
+    Counter values are never handed out twice, so the only possible clash is
+    with IDs created randomly before the allocator existed. Those are skipped
+    with one query per table for the whole block rather than one per ID.
+
+    Returns:
+        list: count tracking ID strings
+    """
+    reserved = []
+    while len(reserved) < count:
+        needed = count - len(reserved)
+        candidates = [encode_tracking_id(value) for value in _reserve_values(needed)]
+        taken = set()
+        for model in (InventoryItem, ComputerSystem):
+            taken.update(db.session.execute(
+                select(model.tracking_id).where(model.tracking_id.in_(candidates))
+            ).scalars())
+        reserved.extend(candidate for candidate in candidates if candidate not in taken)
+    return reserved
+
+
+def next_tracking_id():
+    """
+    A single new tracking ID, drawn from a block reserved by this process
+    (TRACKING_ID_BLOCK_SIZE at a time) so one-off creates rarely touch the
+    counter. IDs left in a block when the process exits are simply unused.
+    """
+    with _lock:
+        block = current_app.extensions.setdefault('tracking_id_block', [])
+        if not block:
+            block.extend(reversed(reserve(current_app.config.get('TRACKING_ID_BLOCK_SIZE', 20))))
+        return block.pop()
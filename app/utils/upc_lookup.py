@@ -0,0 +1,127 @@
+"""UPCItemDB lookup service with connection pooling, timeouts and a shared cache"""
+import threading
+from datetime import datetime, timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.upc import UpcLookup
+
+DEFAULT_API_URL = 'https://api.upcitemdb.com/prod/v1/lookup'
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide pooled HTTP session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def fetch_upc(upc):
+    """
+    Query UPCItemDB directly, bypassing the cache.
+
+    Returns:
+        dict: First item of the response, or None if the UPC is unknown
+
+    Raises:
+        requests.exceptions.RequestException: On connection errors, timeouts
+            or unexpected HTTP status codes
+    """
+    config = current_app.config
+    headers = {
+        'user_key': config.get('UPCITEMDB_API_KEY') or '',
+        'key_type': '3scale'
+    }
+    timeout = (config.get('UPC_LOOKUP_CONNECT_TIMEOUT', 3.05),
+               config.get('UPC_LOOKUP_READ_TIMEOUT', 5))
+
+    response = get_session().get(
+        config.get('UPCITEMDB_API_URL') or DEFAULT_API_URL,
+        params={'upc': upc},
+        headers=headers,
+        timeout=timeout
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+
+    items = response.json().get('items') or []
+    return items[0] if items else None
+
+
+def lookup_upc(upc):
+    """
+    Look up a UPC, serving repeat scans from the shared cache.
+
+    Found products are cached for UPC_CACHE_TTL_DAYS and unknown UPCs for
+    UPC_NEGATIVE_CACHE_TTL_HOURS. Failed requests are never cached. The
+    cache is read and written on connections of its own, outside the
+    caller's session; callers should end their own transaction first so it
+    isn't held open across the HTTP request.
+
+    Returns:
+        tuple: (item_data or None, cached) where cached is True when the
+            result came from the cache
+    """
+    table = UpcLookup.__table__
+    with db.engine.connect() as connection:
+        cached = connection.execute(
+            select(table.c.found, table.c.item_data, table.c.expires_at).where(table.c.upc == upc)
+        ).first()
+    if cached and cached.expires_at > datetime.utcnow():
+        return (cached.item_data if cached.found else None), True
+
+    item_data = fetch_upc(upc)
+    store_lookup(upc, item_data)
+    return item_data, False
+
+
+def store_lookup(upc, item_data):
+    """
+    Insert or refresh the cache row for a UPC and commit it at once, in a
+    transaction of its own, so the caller's transaction is never touched.
+    """
+    config = current_app.config
+    now = datetime.utcnow()
+    if item_data is not None:
+        expires_at = now + timedelta(days=config.get('UPC_CACHE_TTL_DAYS', 30))
+    else:
+        expires_at = now + timedelta(hours=config.get('UPC_NEGATIVE_CACHE_TTL_HOURS', 24))
+    values = {
+        'found': item_data is not None,
+        'item_data': item_data,
+        'fetched_at': now,
+        'expires_at': expires_at
+    }
+
+    table = UpcLookup.__table__
+    try:
+        with db.engine.begin() as connection:
+            updated = connection.execute(table.update().where(table.c.upc == upc).values(values))
+            if not updated.rowcount:
+                connection.execute(table.insert().values(upc=upc, **values))
+    except IntegrityError:
+        # Another worker cached the same UPC first; its row is just as good
+        pass
+    except Exception as e:
+        current_app.logger.warning(f'Could not cache UPC lookup for {upc}: {str(e)}')
+
+
+def purge_expired_lookups():
+    """Delete expired cache rows, returning how many were removed"""
+    deleted = UpcLookup.query.filter(UpcLookup.expires_at <= datetime.utcnow()).delete()
+    db.session.commit()
+    return deleted
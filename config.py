@@ -22,6 +22,8 @@ class Config:
     
     # Security
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
+    # Key for PIN fingerprints (kiosk PIN lookup); defaults to SECRET_KEY
+    PIN_FINGERPRINT_KEY = os.environ.get('PIN_FINGERPRINT_KEY')
     
     # Application settings
     ITEMS_PER_PAGE = int(os.environ.get('ITEMS_PER_PAGE', 20))
@@ -37,4 +39,44 @@ class Config:
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     UPLOAD_FOLDER = 'app/static/uploads'
     TINYMCE_API_KEY = os.environ.get('TINYMCE_API_KEY')
-    UPCITEMDB_API_KEY = os.environ.get('UPCITEMDB_API_KEY')
\ No newline at end of file
+    UPCITEMDB_API_KEY = os.environ.get('UPCITEMDB_API_KEY')
+    UPCITEMDB_API_URL = os.environ.get('UPCITEMDB_API_URL', 'https://api.upcitemdb.com/prod/v1/lookup')
+    
+    # UPC lookup timeouts (seconds) and cache lifetimes
+    UPC_LOOKUP_CONNECT_TIMEOUT = float(os.environ.get('UPC_LOOKUP_CONNECT_TIMEOUT', 3.05))
+    UPC_LOOKUP_READ_TIMEOUT = float(os.environ.get('UPC_LOOKUP_READ_TIMEOUT', 5))
+    UPC_CACHE_TTL_DAYS = int(os.environ.get('UPC_CACHE_TTL_DAYS', 30))
+    UPC_NEGATIVE_CACHE_TTL_HOURS = int(os.environ.get('UPC_NEGATIVE_CACHE_TTL_HOURS', 24))
+
+    # Rendered barcode/QR images (defaults to instance/barcodes) and the base URL encoded in item QR codes
+    BARCODE_CACHE_DIR = os.environ.get('BARCODE_CACHE_DIR')
+    QR_BASE_URL = os.environ.get('QR_BASE_URL', 'http://127.0.0.1:5001')
+
+    # Low-stock alert queue: how long alerts are coalesced into one digest,
+    # how soon an item may be alerted again, how often the worker polls, and
+    # how many times (backing off from STOCK_ALERT_RETRY_SECONDS) a failed send is retried
+    STOCK_ALERT_WINDOW_SECONDS = int(os.environ.get('STOCK_ALERT_WINDOW_SECONDS', 300))
+    STOCK_ALERT_REPEAT_HOURS = int(os.environ.get('STOCK_ALERT_REPEAT_HOURS', 24))
+    STOCK_ALERT_POLL_SECONDS = int(os.environ.get('STOCK_ALERT_POLL_SECONDS', 30))
+    STOCK_ALERT_MAX_ATTEMPTS = int(os.environ.get('STOCK_ALERT_MAX_ATTEMPTS', 5))
+    STOCK_ALERT_RETRY_SECONDS = int(os.environ.get('STOCK_ALERT_RETRY_SECONDS', 60))
+    SMTP_TIMEOUT = int(os.environ.get('SMTP_TIMEOUT', 30))
+
+    # pg_dump binary used for database backups
+    PG_DUMP_PATH = os.environ.get('PG_DUMP_PATH', 'pg_dump')
+
+    # Scheduled backups (defaults to instance/backups), how often the scheduler checks,
+    # and how often and how far apart a failed scheduled backup is retried
+    BACKUP_DIR = os.environ.get('BACKUP_DIR')
+    BACKUP_POLL_SECONDS = int(os.environ.get('BACKUP_POLL_SECONDS', 60))
+    BACKUP_MAX_RETRIES = int(os.environ.get('BACKUP_MAX_RETRIES', 3))
+    BACKUP_RETRY_MINUTES = int(os.environ.get('BACKUP_RETRY_MINUTES', 15))
+
+    # Uploaded CSV imports (defaults to instance/imports); imports run in a background thread unless disabled.
+    # A job with no progress for IMPORT_STALE_SECONDS is assumed interrupted and marked failed.
+    IMPORT_DIR = os.environ.get('IMPORT_DIR')
+    IMPORT_IN_BACKGROUND = os.environ.get('IMPORT_IN_BACKGROUND', 'True').lower() == 'true'
+    IMPORT_STALE_SECONDS = int(os.environ.get('IMPORT_STALE_SECONDS', 600))
+
+    # Tracking IDs each worker reserves at a time for one-off item/system creation
+    TRACKING_ID_BLOCK_SIZE = int(os.environ.get('TRACKING_ID_BLOCK_SIZE', 20))
@@ -0,0 +1,36 @@
+"""Add computer_systems listing indexes
+
+Revision ID: 3b9d2f61c0a4
+Revises: fix_cpu_speed_format
+Create Date: 2026-10-18 09:12:40.118342
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9d2f61c0a4'
+down_revision = 'fix_cpu_speed_format'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination skips rows with a NULL sort key, so backfill them first
+    op.execute("""
+        UPDATE computer_systems
+        SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP)
+        WHERE created_at IS NULL
+    """)
+
+    with op.batch_alter_table('computer_systems', schema=None) as batch_op:
+        batch_op.create_index('ix_computer_systems_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_computer_systems_model_id'), ['model_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_computer_systems_status'), ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('computer_systems', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_computer_systems_status'))
+        batch_op.drop_index(batch_op.f('ix_computer_systems_model_id'))
+        batch_op.drop_index('ix_computer_systems_created_at_id')
@@ -0,0 +1,70 @@
+"""Add plain text and full-text search vector to wiki_page
+
+Revision ID: 5a20c8e7f3b9
+Revises: e93c5a7b1d26
+Create Date: 2026-10-18 20:41:37.215904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from bs4 import BeautifulSoup
+
+
+# revision identifiers, used by Alembic.
+revision = '5a20c8e7f3b9'
+down_revision = 'e93c5a7b1d26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgresql = bind.dialect.name == 'postgresql'
+
+    with op.batch_alter_table('wiki_page', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('plain_text', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('search_vector',
+                                      postgresql.TSVECTOR() if is_postgresql else sa.Text(),
+                                      nullable=True))
+
+    if is_postgresql:
+        op.execute("""
+            CREATE FUNCTION wiki_page_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(NEW.plain_text, '')), 'B');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER wiki_page_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, plain_text ON wiki_page
+            FOR EACH ROW EXECUTE PROCEDURE wiki_page_search_vector_update()
+        """)
+
+    # Strip the HTML of existing pages; the application does this on every save
+    wiki_page = sa.table('wiki_page',
+                         sa.column('id', sa.Integer),
+                         sa.column('content', sa.Text),
+                         sa.column('plain_text', sa.Text))
+    for page_id, content in bind.execute(sa.select(wiki_page.c.id, wiki_page.c.content)).fetchall():
+        text = ' '.join(BeautifulSoup(content or '', 'html.parser').get_text(' ').split())
+        bind.execute(wiki_page.update().where(wiki_page.c.id == page_id).values(plain_text=text))
+
+    if is_postgresql:
+        op.create_index('ix_wiki_page_search_vector', 'wiki_page', ['search_vector'],
+                        unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_wiki_page_search_vector', table_name='wiki_page')
+        op.execute("DROP TRIGGER wiki_page_search_vector_trigger ON wiki_page")
+        op.execute("DROP FUNCTION wiki_page_search_vector_update()")
+
+    with op.batch_alter_table('wiki_page', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
+        batch_op.drop_column('plain_text')
@@ -0,0 +1,32 @@
+"""Add pin_fingerprint to users
+
+Revision ID: 5e8a1c7d94b2
+Revises: 3b9d2f61c0a4
+Create Date: 2026-10-18 10:04:17.552901
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a1c7d94b2'
+down_revision = '3b9d2f61c0a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing PINs keep a NULL fingerprint; it is filled in the first time
+    # each user logs in with their PIN (see User.find_by_pin). A fingerprint
+    # can't be derived from the bcrypt hash, so any left over can be cleared
+    # with flask expire-legacy-pins.
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pin_fingerprint', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_pin_fingerprint'), ['pin_fingerprint'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_pin_fingerprint'))
+        batch_op.drop_column('pin_fingerprint')
@@ -0,0 +1,29 @@
+"""Add tracking_id_counter table
+
+Revision ID: 7d3a91c4b058
+Revises: 0b9e5d2c7f41
+Create Date: 2026-10-18 18:02:26.905147
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3a91c4b058'
+down_revision = '0b9e5d2c7f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    counter = op.create_table('tracking_id_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(counter, [{'id': 1, 'next_value': 1}])
+
+
+def downgrade():
+    op.drop_table('tracking_id_counter')
@@ -0,0 +1,38 @@
+"""Add upc_lookups table
+
+Revision ID: 8c41f0b2d6e7
+Revises: 5e8a1c7d94b2
+Create Date: 2026-10-18 10:41:03.270415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41f0b2d6e7'
+down_revision = '5e8a1c7d94b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upc_lookups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('upc', sa.String(length=50), nullable=False),
+    sa.Column('found', sa.Boolean(), nullable=False),
+    sa.Column('item_data', sa.JSON(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('upc')
+    )
+    with op.batch_alter_table('upc_lookups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_upc_lookups_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('upc_lookups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_upc_lookups_expires_at'))
+
+    op.drop_table('upc_lookups')
@@ -0,0 +1,41 @@
+"""Add stock_alerts table
+
+Revision ID: a3f7d2e9c515
+Revises: 8c41f0b2d6e7
+Create Date: 2026-10-18 13:12:47.508311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f7d2e9c515'
+down_revision = '8c41f0b2d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('queued_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=256), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_stock_alerts_item_id'), ['item_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_stock_alerts_sent_at'), ['sent_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_stock_alerts_sent_at'))
+        batch_op.drop_index(batch_op.f('ix_stock_alerts_item_id'))
+
+    op.drop_table('stock_alerts')
@@ -0,0 +1,26 @@
+"""Add token_version to users
+
+Revision ID: b6e1f9d3a720
+Revises: 5a20c8e7f3b9
+Create Date: 2026-10-18 21:15:02.634517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f9d3a720'
+down_revision = '5a20c8e7f3b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
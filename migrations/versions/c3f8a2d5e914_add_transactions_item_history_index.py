@@ -0,0 +1,25 @@
+"""Add transactions item history index
+
+Revision ID: c3f8a2d5e914
+Revises: b6e1f9d3a720
+Create Date: 2026-10-18 21:52:48.093361
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a2d5e914'
+down_revision = 'b6e1f9d3a720'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_item_id_created_at_id', ['item_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_item_id_created_at_id')
@@ -0,0 +1,51 @@
+"""Store activity in activity_logs with message column and indexes
+
+Revision ID: d61b8e4f2a90
+Revises: a3f7d2e9c515
+Create Date: 2026-10-18 15:27:19.841602
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd61b8e4f2a90'
+down_revision = 'a3f7d2e9c515'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The table may already exist on databases created with db.create_all()
+    if not sa.inspect(op.get_bind()).has_table('activity_logs'):
+        op.create_table('activity_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=50), nullable=False),
+        sa.Column('item_type', sa.String(length=50), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('item_identifier', sa.String(length=255), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('message', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_activity_logs_timestamp'), ['timestamp'], unique=False)
+        batch_op.create_index(batch_op.f('ix_activity_logs_item_identifier'), ['item_identifier'], unique=False)
+        batch_op.create_index('ix_activity_logs_user_id_timestamp', ['user_id', 'timestamp'], unique=False)
+        batch_op.create_index('ix_activity_logs_action_timestamp', ['action', 'timestamp'], unique=False)
+        batch_op.create_index('ix_activity_logs_item', ['item_type', 'item_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_logs_item')
+        batch_op.drop_index('ix_activity_logs_action_timestamp')
+        batch_op.drop_index('ix_activity_logs_user_id_timestamp')
+        batch_op.drop_index(batch_op.f('ix_activity_logs_item_identifier'))
+        batch_op.drop_index(batch_op.f('ix_activity_logs_timestamp'))
+        batch_op.drop_column('message')
@@ -0,0 +1,28 @@
+"""Add stock alert retry fields
+
+Revision ID: d7a4e2b9f160
+Revises: c3f8a2d5e914
+Create Date: 2026-10-19 09:14:22.615027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4e2b9f160'
+down_revision = 'c3f8a2d5e914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('failed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('stock_alerts', schema=None) as batch_op:
+        batch_op.drop_column('failed_at')
+        batch_op.drop_column('next_attempt_at')
@@ -0,0 +1,26 @@
+"""Add import job heartbeat
+
+Revision ID: e2c8f5a1b743
+Revises: d7a4e2b9f160
+Create Date: 2026-10-19 10:02:37.281946
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c8f5a1b743'
+down_revision = 'd7a4e2b9f160'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('import_jobs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
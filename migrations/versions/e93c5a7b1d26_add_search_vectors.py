@@ -0,0 +1,114 @@
+"""Add full-text search vectors to items and computer_systems
+
+Revision ID: e93c5a7b1d26
+Revises: 7d3a91c4b058
+Create Date: 2026-10-18 19:20:11.480213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e93c5a7b1d26'
+down_revision = '7d3a91c4b058'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        # Other databases search with ILIKE and never read the column
+        with op.batch_alter_table('items', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_vector', sa.Text(), nullable=True))
+        with op.batch_alter_table('computer_systems', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_vector', sa.Text(), nullable=True))
+        return
+
+    op.add_column('items', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('computer_systems', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Identifiers rank above manufacturer and part number
+    op.execute("""
+        CREATE FUNCTION items_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.name, '') || ' ' ||
+                                                coalesce(NEW.tracking_id, '') || ' ' ||
+                                                coalesce(NEW.barcode, '') || ' ' ||
+                                                coalesce(NEW.upc, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(NEW.manufacturer, '') || ' ' ||
+                                                coalesce(NEW.mpn, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER items_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, tracking_id, barcode, upc, manufacturer, mpn ON items
+        FOR EACH ROW EXECUTE PROCEDURE items_search_vector_update()
+    """)
+
+    op.execute("""
+        CREATE FUNCTION computer_systems_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            model_text text;
+        BEGIN
+            SELECT coalesce(manufacturer, '') || ' ' || coalesce(model_name, '')
+            INTO model_text
+            FROM computer_model WHERE id = NEW.model_id;
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.tracking_id, '') || ' ' ||
+                                                coalesce(NEW.serial_tag, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(model_text, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER computer_systems_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF tracking_id, serial_tag, model_id ON computer_systems
+        FOR EACH ROW EXECUTE PROCEDURE computer_systems_search_vector_update()
+    """)
+
+    # Renaming a model re-indexes the systems built on it
+    op.execute("""
+        CREATE FUNCTION computer_model_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE computer_systems SET model_id = model_id WHERE model_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER computer_model_search_vector_trigger
+        AFTER UPDATE OF manufacturer, model_name ON computer_model
+        FOR EACH ROW EXECUTE PROCEDURE computer_model_search_vector_update()
+    """)
+
+    # Fire the triggers once to fill in existing rows
+    op.execute("UPDATE items SET name = name")
+    op.execute("UPDATE computer_systems SET model_id = model_id")
+
+    op.create_index('ix_items_search_vector', 'items', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+    op.create_index('ix_computer_systems_search_vector', 'computer_systems', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_computer_systems_search_vector', table_name='computer_systems')
+        op.drop_index('ix_items_search_vector', table_name='items')
+        op.execute("DROP TRIGGER computer_model_search_vector_trigger ON computer_model")
+        op.execute("DROP TRIGGER computer_systems_search_vector_trigger ON computer_systems")
+        op.execute("DROP TRIGGER items_search_vector_trigger ON items")
+        op.execute("DROP FUNCTION computer_model_search_vector_update()")
+        op.execute("DROP FUNCTION computer_systems_search_vector_update()")
+        op.execute("DROP FUNCTION items_search_vector_update()")
+
+    with op.batch_alter_table('computer_systems', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
+    with op.batch_alter_table('items', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
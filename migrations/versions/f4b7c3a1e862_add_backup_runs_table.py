@@ -0,0 +1,39 @@
+"""Add backup_runs table
+
+Revision ID: f4b7c3a1e862
+Revises: d61b8e4f2a90
+Create Date: 2026-10-18 16:05:12.734190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b7c3a1e862'
+down_revision = 'd61b8e4f2a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('backup_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+    sa.Column('error', sa.String(length=512), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('backup_runs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_backup_runs_started_at'), ['started_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('backup_runs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_backup_runs_started_at'))
+
+    op.drop_table('backup_runs')
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from config import Config
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+@pytest.fixture
+def config():
+    """Config class the app is built from; override to change settings read at startup"""
+    return TestConfig
+
+@pytest.fixture
+def app(config):
+    """App with an empty in-memory database; modules override this to seed it"""
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """Test client logged in to the web UI as the first user"""
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(User.query.first().id)
+    return client
+
+@pytest.fixture
+def count_queries(app):
+    """Start recording the SQL statements run from this point on"""
+    def count_queries():
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        return statements
+    return count_queries
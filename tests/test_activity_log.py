@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.activity import Activity
+from app.models.inventory import InventoryItem
+from app.models.user import User
+from app.utils.activity_logger import flush_activity, log_inventory_activity
+
+@pytest.fixture
+def app(app):
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    admin = User(username='admin', email='admin@example.com', role='admin')
+    admin.set_password('password123')
+    db.session.add(admin)
+    db.session.add_all([
+        InventoryItem(tracking_id='TC-00000001', name='Patch Cable', quantity=5),
+        InventoryItem(tracking_id='TC-00000002', name='SATA Cable', quantity=5)
+    ])
+    db.session.commit()
+    return app
+
+def test_activity_buffered_and_batch_inserted(app, count_queries):
+    cable, sata = InventoryItem.query.order_by(InventoryItem.id).all()
+    statements = count_queries()
+
+    with app.test_request_context():
+        log_inventory_activity('adjustment', cable, {'old_quantity': 5, 'new_quantity': 3})
+        log_inventory_activity('delete', sata, {'name': sata.name})
+        assert Activity.query.count() == 0
+        flush_activity()
+
+    assert len([s for s in statements if s.startswith('INSERT INTO activity_logs')]) == 1
+    rows = Activity.query.order_by(Activity.id).all()
+    assert [(r.action, r.item_type, r.item_id, r.item_identifier) for r in rows] == [
+        ('adjustment', 'item', cable.id, 'TC-00000001'),
+        ('delete', 'item', sata.id, 'TC-00000002')
+    ]
+    assert 'from 5 to 3 (-2)' in rows[0].message
+
+def test_rolled_back_activity_is_dropped(app):
+    cable, sata = InventoryItem.query.order_by(InventoryItem.id).all()
+
+    with app.test_request_context():
+        cable.quantity = 0
+        log_inventory_activity('adjustment', cable, {'old_quantity': 5, 'new_quantity': 0})
+        db.session.rollback()
+
+        # Written in the same transaction as the work it describes
+        log_inventory_activity('delete', sata, {'name': sata.name})
+        db.session.delete(sata)
+        db.session.commit()
+        assert [r.action for r in Activity.query] == ['delete']
+
+        # A request that fails drops what it logged since its last commit
+        log_inventory_activity('adjustment', cable, {'old_quantity': 5, 'new_quantity': 4})
+        app.do_teardown_request(RuntimeError('checkout failed'))
+
+    assert [r.action for r in Activity.query] == ['delete']
+    assert db.session.get(InventoryItem, cable.id).quantity == 5
+
+def test_viewer_and_download_filter_activity(app, client):
+    admin = User.query.first()
+    now = datetime.utcnow()
+    db.session.add_all([
+        Activity(action='checkout', item_type='item', item_identifier='TC-00000001', user_id=admin.id,
+                 message='checked out patch cable', timestamp=now),
+        Activity(action='checkout', item_type='item', item_identifier='TC-00000002',
+                 message='checked out sata cable', timestamp=now),
+        Activity(action='delete', item_type='item', item_identifier='TC-00000001',
+                 message='deleted old patch cable', timestamp=now - timedelta(days=30))
+    ])
+    db.session.commit()
+
+    html = client.get('/admin/logs?item=TC-00000001').get_data(as_text=True)
+    assert 'checked out patch cable' in html
+    assert 'deleted old patch cable' in html
+    assert 'checked out sata cable' not in html
+
+    html = client.get(f'/admin/logs?user={admin.id}&action=checkout').get_data(as_text=True)
+    assert 'checked out patch cable' in html
+    assert 'deleted old patch cable' not in html
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    response = client.post('/admin/logs/download', data={'start_date': week_ago, 'end_date': today})
+    body = response.get_data(as_text=True)
+    assert 'checked out patch cable' in body and 'checked out sata cable' in body
+    assert 'deleted old patch cable' not in body
@@ -0,0 +1,77 @@
+import os
+import pytest
+from app import db
+from app.models.inventory import InventoryItem
+from app.models.user import User
+from app.utils import barcode_cache
+
+@pytest.fixture
+def config(config, tmp_path):
+    class BarcodeConfig(config):
+        BARCODE_CACHE_DIR = str(tmp_path)
+    return BarcodeConfig
+
+@pytest.fixture
+def app(app):
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.add(InventoryItem(tracking_id='TC-0000ABCD', name='Patch Cable'))
+    db.session.commit()
+    return app
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    calls = []
+    render_image = barcode_cache.render_image
+    def counting_render_image(symbology, tracking_id):
+        calls.append((symbology, tracking_id))
+        return render_image(symbology, tracking_id)
+    monkeypatch.setattr(barcode_cache, 'render_image', counting_render_image)
+    return calls
+
+def test_image_rendered_once_and_cacheable(app, client, render_calls):
+    key = barcode_cache.image_key('code128', 'TC-0000ABCD')
+    first = client.get(f'/barcodes/code128/TC-0000ABCD.png?v={key}')
+    assert first.status_code == 200
+    assert first.mimetype == 'image/png'
+    assert first.data.startswith(b'\x89PNG')
+    assert sorted(first.headers['Cache-Control'].split(', ')) == ['immutable', 'max-age=31536000', 'private']
+
+    # Without the content key in the URL the browser must revalidate
+    second = client.get('/barcodes/code128/TC-0000ABCD.png')
+    assert second.data == first.data
+    assert 'immutable' not in second.headers['Cache-Control']
+    assert 'no-cache' in second.headers['Cache-Control'] and 'public' not in second.headers['Cache-Control']
+    assert render_calls == [('code128', 'TC-0000ABCD')]
+
+    etag = first.headers['ETag']
+    not_modified = client.get('/barcodes/code128/TC-0000ABCD.png', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+
+def test_qr_and_unknown_tracking_ids(app, client, render_calls):
+    assert client.get('/barcodes/qr/TC-0000ABCD.png').status_code == 200
+    assert client.get('/barcodes/code128/TC-FFFFFFFF.png').status_code == 404
+    assert client.get('/barcodes/ean13/TC-0000ABCD.png').status_code == 404
+    # Unknown tracking IDs never reach the cache directory
+    assert len(os.listdir(app.config['BARCODE_CACHE_DIR'])) == 1
+
+def test_view_item_links_cached_images(app, client):
+    item = InventoryItem.query.first()
+    html = client.get(f'/item/{item.id}/view').get_data(as_text=True)
+    assert f"/barcodes/code128/TC-0000ABCD.png?v={barcode_cache.image_key('code128', 'TC-0000ABCD')}" in html
+    assert f"/barcodes/qr/TC-0000ABCD.png?v={barcode_cache.image_key('qr', 'TC-0000ABCD', item.id)}" in html
+    assert 'base64' not in html
+
+def test_qr_url_changes_with_encoded_content(app):
+    item = InventoryItem.query.first()
+    with app.test_request_context():
+        url = barcode_cache.image_url('qr', 'TC-0000ABCD')
+        assert url == barcode_cache.image_url('qr', 'TC-0000ABCD', item.id)
+        assert url != barcode_cache.image_url('qr', 'TC-0000ABCD', item.id + 1)
+        app.config['QR_BASE_URL'] = 'https://inventory.example.com'
+        assert url != barcode_cache.image_url('qr', 'TC-0000ABCD')
+
+def test_pregenerate_images(app):
+    assert barcode_cache.pregenerate_images() == 2
+    assert barcode_cache.pregenerate_images() == 0
@@ -0,0 +1,51 @@
+import pytest
+from app import db
+from app.models.inventory import Category
+
+@pytest.fixture
+def app(app):
+    hardware = Category(name='Hardware')
+    storage = Category(name='Storage')
+    db.session.add_all([hardware, storage])
+    db.session.flush()
+    db.session.add_all([
+        Category(name='Monitors', parent_id=hardware.id),
+        Category(name='Cases', parent_id=hardware.id),
+        Category(name='HDD-SSD', parent_id=storage.id)
+    ])
+    db.session.commit()
+    return app
+
+def test_ordered_categories_single_query(app, count_queries):
+    statements = count_queries()
+
+    categories = Category.get_ordered_categories()
+
+    assert [c.get_display_name() for c in categories] == [
+        'Hardware', '--Cases', '--Monitors', 'Storage', '--HDD-SSD'
+    ]
+    assert categories[2].get_full_path() == 'Hardware > Monitors'
+    assert len(statements) == 1
+
+    # Served from the cache on subsequent calls
+    Category.get_ordered_categories()
+    assert len(statements) == 1
+
+def test_cache_invalidated_on_write(app):
+    Category.get_ordered_categories()
+
+    hardware = Category.query.filter_by(name='Hardware').first()
+    db.session.add(Category(name='Adapters', parent_id=hardware.id))
+    db.session.commit()
+    assert '--Adapters' in [c.get_display_name() for c in Category.get_ordered_categories()]
+
+    hardware.name = 'Computer Hardware'
+    db.session.commit()
+    monitors = Category.query.filter_by(name='Monitors').first()
+    assert monitors.get_full_path() == 'Computer Hardware > Monitors'
+
+def test_cache_invalidated_on_bulk_write(app):
+    Category.get_ordered_categories()
+    Category.query.filter_by(name='Monitors').update({Category.name: 'Displays'})
+    db.session.commit()
+    assert 'Hardware > Displays' in [c.get_full_path() for c in Category.get_ordered_categories()]
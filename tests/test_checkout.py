@@ -0,0 +1,204 @@
+import re
+import pytest
+from app import create_app, db
+from app.api.mobile.auth import generate_token
+from app.models.inventory import ComputerModel, ComputerSystem, InventoryItem, Transaction
+from app.models.mobile import MobileCheckoutReason
+from app.models.user import User
+
+@pytest.fixture
+def app(app):
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.add(MobileCheckoutReason(name='CLIENT INSTALL'))
+    db.session.add_all([
+        InventoryItem(tracking_id='TC-00000001', name='SATA cable', quantity=10),
+        InventoryItem(tracking_id='TC-00000002', name='RAM 8GB', quantity=2),
+    ])
+    model = ComputerModel(manufacturer='Dell', model_name='Optiplex 7090', model_type='desktop')
+    db.session.add(model)
+    db.session.flush()
+    db.session.add_all([
+        ComputerSystem(tracking_id='TC-0000000A', model_id=model.id, status='available'),
+        ComputerSystem(tracking_id='TC-0000000B', model_id=model.id, status='maintenance'),
+    ])
+    db.session.commit()
+    return app
+
+def post_mobile(app, body):
+    headers = {'Authorization': f'Bearer {generate_token(User.query.one())}'}
+    return app.test_client().post('/api/mobile/checkout/batch', json=body, headers=headers)
+
+def quantities():
+    return {item.tracking_id: item.quantity for item in InventoryItem.query.all()}
+
+def test_mobile_batch_checkout(app, count_queries):
+    statements = count_queries()
+    response = post_mobile(app, {'reason_id': 1, 'notes': 'Job 42', 'lines': [
+        {'type': 'item', 'id': 1, 'quantity': 3},
+        {'tracking_id': 'TC-00000002', 'quantity': 2},
+        {'tracking_id': 'TC-0000000A'},
+        {'type': 'item', 'id': 1, 'quantity': 1},
+    ]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [(r['type'], r['name'], r['quantity'], r['remaining'], r['status']) for r in results] == [
+        ('item', 'SATA cable', 3, 6, 'ok'),
+        ('item', 'RAM 8GB', 2, 0, 'ok'),
+        ('system', 'Dell Optiplex 7090', 1, None, 'ok'),
+        ('item', 'SATA cable', 1, 6, 'ok'),
+    ]
+    # One IN query validates each kind of line
+    assert len([s for s in statements if s.startswith('SELECT') and 'FROM items' in s]) == 1
+    assert len([s for s in statements if s.startswith('SELECT') and 'FROM computer_systems' in s]) == 1
+
+    assert quantities() == {'TC-00000001': 6, 'TC-00000002': 0}
+    assert InventoryItem.query.filter_by(tracking_id='TC-00000002').one().status == 'out_of_stock'
+    system = ComputerSystem.query.filter_by(tracking_id='TC-0000000A').one()
+    assert (system.status, system.checked_out_by_id, system.checkout_reason) == ('checked_out', 1, 'CLIENT INSTALL')
+    assert sorted(t.quantity_changed for t in Transaction.query.filter_by(transaction_type='checkout')) == [-3, -2, -1]
+
+def test_batch_checkout_is_all_or_nothing(app):
+    response = post_mobile(app, {'reason_id': 1, 'lines': [
+        {'type': 'item', 'id': 1, 'quantity': 3},
+        {'tracking_id': 'TC-00000002', 'quantity': 2},
+        {'tracking_id': 'TC-00000002', 'quantity': 1},
+        {'tracking_id': 'TC-0000000B'},
+        {'tracking_id': 'TC-MISSING'},
+        {'type': 'item', 'id': 1, 'quantity': 0},
+    ]})
+    assert response.status_code == 400
+    assert [(r['status'], r['error']) for r in response.get_json()['results']] == [
+        ('ok', None),
+        ('ok', None),
+        ('error', 'Insufficient quantity available (available: 2)'),
+        ('error', 'System is not available for checkout'),
+        ('error', 'Item not found'),
+        ('error', 'quantity must be at least 1'),
+    ]
+    assert quantities() == {'TC-00000001': 10, 'TC-00000002': 2}
+    assert Transaction.query.count() == 0
+
+def test_batch_checkout_rolls_back_applied_lines(app, monkeypatch):
+    from app.utils import checkout
+    # The system is claimed by someone else after validation
+    monkeypatch.setattr(checkout, 'claim_system', lambda *args: False)
+    response = post_mobile(app, {'reason_id': 1, 'lines': [
+        {'type': 'item', 'id': 1, 'quantity': 3},
+        {'tracking_id': 'TC-0000000A'},
+    ]})
+    assert response.status_code == 400
+    assert [(r['status'], r['remaining']) for r in response.get_json()['results']] == [
+        ('not_applied', None),
+        ('error', None),
+    ]
+    assert quantities() == {'TC-00000001': 10, 'TC-00000002': 2}
+    assert Transaction.query.count() == 0
+
+def test_batch_checkout_requires_active_reason(app):
+    assert post_mobile(app, {'reason_id': 99, 'lines': []}).get_json()['error'] == 'Invalid checkout reason'
+    assert post_mobile(app, {'reason_id': 1, 'lines': []}).get_json()['error'] == 'Cart is empty'
+
+def test_kiosk_batch_checkout(app):
+    client = app.test_client()
+    assert client.post('/checkout/batch', json={}).status_code == 401
+    with client.session_transaction() as sess:
+        sess['tech_id'] = User.query.one().id
+    response = client.post('/checkout/batch', json={'reason': 'Bench repair', 'lines': [
+        {'tracking_id': 'TC-00000001', 'quantity': 4},
+        {'tracking_id': 'TC-00000002'},
+    ]})
+    assert response.status_code == 200
+    assert quantities() == {'TC-00000001': 6, 'TC-00000002': 1}
+    assert Transaction.query.filter_by(transaction_type='check_out').count() == 2
+
+def test_kiosk_cart_posts_with_page_csrf_token(app):
+    app.config['WTF_CSRF_METHODS'] = ['POST', 'PUT', 'PATCH', 'DELETE']
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['tech_id'] = User.query.one().id
+    page = client.get('/checkout').get_data(as_text=True)
+    assert 'id="checkoutCartBtn"' in page
+    token = re.search(r"'X-CSRFToken': \"([^\"]+)\"", page).group(1)
+
+    body = {'reason': 'Bench repair', 'lines': [{'tracking_id': 'TC-00000001', 'quantity': 2}]}
+    assert client.post('/checkout/batch', json=body).status_code == 400
+    response = client.post('/checkout/batch', json=body, headers={'X-CSRFToken': token})
+    assert response.status_code == 200
+    assert quantities()['TC-00000001'] == 8
+
+def test_kiosk_batch_checkout_rejects_deleted_tech(app):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['tech_id'] = 999
+    response = client.post('/checkout/batch', json={'reason': 'Bench repair', 'lines': []})
+    assert response.status_code == 401
+    with client.session_transaction() as sess:
+        assert 'tech_id' not in sess
+
+def test_single_checkouts_decrement_atomically(app):
+    response = app.test_client().post('/api/mobile/checkout', json={'type': 'item', 'id': 2, 'reason_id': 1, 'quantity': 3},
+                                      headers={'Authorization': f'Bearer {generate_token(User.query.one())}'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Insufficient quantity available'
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['tech_id'] = User.query.one().id
+    client.post('/checkout/process', data={'tracking_id': 'TC-00000002', 'reason': 'Bench', 'quantity': 2})
+    item = InventoryItem.query.filter_by(tracking_id='TC-00000002').one()
+    assert (item.quantity, item.status) == (0, 'out_of_stock')
+
+def test_concurrent_checkouts_never_oversell(tmp_path, config):
+    """Many scanners checking out the same part and system at once"""
+    import threading
+
+    class FileConfig(config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'stress.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}}
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username='tech', email='tech@example.com')
+        user.set_password('password123')
+        model = ComputerModel(manufacturer='Dell', model_name='Optiplex 7090', model_type='desktop')
+        db.session.add_all([user, model, MobileCheckoutReason(name='CLIENT INSTALL'),
+                            InventoryItem(tracking_id='TC-00000001', name='SATA cable', quantity=25)])
+        db.session.flush()
+        db.session.add(ComputerSystem(tracking_id='TC-0000000A', model_id=model.id, status='available'))
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {generate_token(user)}'}
+
+    threads, statuses, lock = 40, [], threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def scanner(i):
+        client = app.test_client()
+        barrier.wait()
+        for _ in range(3):
+            body = {'type': 'item', 'id': 1, 'reason_id': 1, 'quantity': 1}
+            if i % 10 == 0:
+                body = {'type': 'system', 'id': 1, 'reason_id': 1}
+            response = client.post('/api/mobile/checkout', json=body, headers=headers)
+            with lock:
+                statuses.append((body['type'], response.status_code))
+
+    workers = [threading.Thread(target=scanner, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with app.app_context():
+        item = db.session.get(InventoryItem, 1)
+        item_ok = statuses.count(('item', 200))
+        assert item_ok == 25 and statuses.count(('item', 400)) == 36 * 3 - 25
+        assert item.quantity == 0 and item.status == 'out_of_stock'
+        assert Transaction.query.filter_by(item_id=1).count() == 25
+        assert statuses.count(('system', 200)) == 1
+        assert db.session.get(ComputerSystem, 1).status == 'checked_out'
+        db.session.remove()
+        db.drop_all()
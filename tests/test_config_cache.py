@@ -0,0 +1,77 @@
+import pytest
+from app import db
+from app.models.config import Configuration
+
+@pytest.fixture
+def app(app):
+    Configuration.set_value('smtp_server', 'mail.example.com')
+    Configuration.set_value('smtp_port', '2525')
+    return app
+
+def test_reads_share_one_query(app, count_queries):
+    Configuration.get_value('smtp_server')
+    statements = count_queries()
+
+    for _ in range(10):
+        assert Configuration.get_value('smtp_server') == 'mail.example.com'
+        assert Configuration.get_value('smtp_port', '587') == '2525'
+        assert Configuration.get_value('smtp_username') is None
+        assert Configuration.get_value('stock_alert_email', 'x') == 'x'
+        assert not Configuration.is_read_only_mode()
+    assert len(statements) == 0
+
+def test_writes_invalidate_cache(app):
+    assert Configuration.get_value('smtp_port') == '2525'
+
+    Configuration.set_value('smtp_port', '587')
+    assert Configuration.get_value('smtp_port') == '587'
+
+    Configuration.set_value('read_only_mode', 'true')
+    assert Configuration.is_read_only_mode()
+
+    # Bulk deletes skip the mapper events but must still invalidate
+    Configuration.query.filter_by(key='read_only_mode').delete()
+    db.session.commit()
+    assert not Configuration.is_read_only_mode()
+
+def test_rolled_back_write_not_cached(app):
+    config = Configuration.query.filter_by(key='smtp_server').first()
+    config.value = 'other.example.com'
+    db.session.flush()
+    assert Configuration.get_value('smtp_server') == 'other.example.com'
+
+    db.session.rollback()
+    assert Configuration.get_value('smtp_server') == 'mail.example.com'
+
+def test_set_many_upserts_in_one_statement(app, count_queries):
+    Configuration.set_value('smtp_username', 'old', 'SMTP username')
+    statements = count_queries()
+
+    Configuration.set_many({'smtp_username': 'alerts', 'notification_email': 'ops@example.com'},
+                           descriptions={'notification_email': 'Email address for system notifications'})
+
+    assert len([s for s in statements if not s.startswith(('SAVEPOINT', 'RELEASE'))]) == 1
+    assert Configuration.get_value('smtp_username') == 'alerts'
+    assert Configuration.get_value('notification_email') == 'ops@example.com'
+    config = Configuration.query.filter_by(key='smtp_username').first()
+    assert config.description == 'SMTP username'
+
+def test_manage_config_saves_all_settings(app):
+    from app.models.user import User
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    admin = User(username='admin', email='admin@example.com', role='admin')
+    admin.set_password('password123')
+    db.session.add(admin)
+    db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(admin.id)
+    response = client.post('/admin/config', data={'smtp_server': 'smtp.example.com', 'items_per_page': '50'},
+                           headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    assert response.get_json()['success'] is True
+    assert Configuration.get_value('smtp_server') == 'smtp.example.com'
+    assert Configuration.get_value('items_per_page') == '50'
+    assert Configuration.get_value('allow_public_registration') == 'false'
+    assert Configuration.query.count() == 12
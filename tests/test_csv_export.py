@@ -0,0 +1,49 @@
+import csv
+import gzip
+import io
+import pytest
+from app import db
+from app.models.inventory import InventoryItem, Tag, Transaction
+from app.models.user import User
+from app.utils.csv_export import iter_table_csv
+
+@pytest.fixture
+def app(app):
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    admin = User(username='admin', email='admin@example.com', role='admin')
+    admin.set_password('password123')
+    db.session.add(admin)
+    item = InventoryItem(tracking_id='TC-00000001', name='Patch Cable, 3ft', quantity=500)
+    item.tags.append(Tag(name='NO TOUCH'))
+    db.session.add(item)
+    db.session.flush()
+    db.session.add_all([
+        Transaction(item_id=item.id, quantity_changed=-1, user_id=admin.id, transaction_type='check_out')
+        for _ in range(3000)
+    ])
+    db.session.commit()
+    return app
+
+def read_csv(data):
+    return list(csv.reader(io.StringIO(data)))
+
+def test_export_streams_columns(client):
+    response = client.post('/admin/export-table', data={'table_name': 'items'})
+    assert response.is_streamed and response.mimetype == 'text/csv'
+    rows = read_csv(response.get_data(as_text=True))
+    assert rows[0] == [column.name for column in InventoryItem.__table__.columns]
+    assert rows[1][rows[0].index('name')] == 'Patch Cable, 3ft'
+
+    rows = read_csv(client.post('/admin/export-table', data={'table_name': 'tags'}).get_data(as_text=True))
+    assert rows[1][rows[0].index('name')] == 'NO TOUCH'
+
+def test_export_large_table_gzip(app, client):
+    chunks = list(iter_table_csv(Transaction.__table__, batch_size=100, chunk_size=4096))
+    assert len(chunks) > 1
+
+    response = client.post('/admin/export-table', data={'table_name': 'inventory_transactions', 'compress': 'on'})
+    assert response.mimetype == 'application/gzip'
+    assert response.headers['Content-Disposition'].endswith('.csv.gz')
+    rows = read_csv(gzip.decompress(response.get_data()).decode())
+    assert len(rows) == 3001
+    assert [int(row[0]) for row in rows[1:]] == list(range(1, 3001))
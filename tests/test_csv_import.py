@@ -0,0 +1,105 @@
+import io
+import pytest
+from app import db
+from app.models.imports import ImportJob
+from app.models.inventory import Category, ComputerSystem, InventoryItem
+from app.models.user import User
+
+HEADER = 'name,category_id,quantity,cost,barcode\n'
+
+@pytest.fixture
+def config(config):
+    class ImportConfig(config):
+        IMPORT_IN_BACKGROUND = False
+    return ImportConfig
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    app.config['IMPORT_DIR'] = str(tmp_path)
+    admin = User(username='admin', email='admin@example.com', role='admin')
+    admin.set_password('password123')
+    db.session.add_all([admin, Category(name='Cables')])
+    db.session.add(InventoryItem(tracking_id='TC-00000001', name='Existing', barcode='111'))
+    db.session.commit()
+    return app
+
+def upload(client, table_name, text, **form):
+    data = {'table_name': table_name, 'csv_file': (io.BytesIO(text.encode()), 'import.csv')}
+    data.update(form)
+    return client.post('/admin/import-table', data=data, content_type='multipart/form-data')
+
+def test_import_items_in_batches(app, client):
+    rows = ''.join(f'Cable {i},1,{i},1.50,\n' for i in range(2500))
+    response = upload(client, 'items', HEADER + rows)
+    assert response.status_code == 302
+
+    job = ImportJob.query.one()
+    assert (job.status, job.total_rows, job.imported_rows, job.error_count) == ('completed', 2500, 2500, 0)
+    assert job.upload_path is None
+
+    items = InventoryItem.query.filter(InventoryItem.name.like('Cable %')).all()
+    assert len(items) == 2500
+    assert len({item.tracking_id for item in items}) == 2500
+    assert all(item.creator_id == job.created_by_id and item.category_id == 1 for item in items)
+    assert 'Completed' in client.get(response.headers['Location']).get_data(as_text=True)
+
+def test_dry_run_reports_row_errors(app, client):
+    text = HEADER + (
+        'Good Cable,1,5,2.00,222\n'
+        ',1,5,,\n'                  # row 3: name missing
+        'Bad Qty,1,many,,\n'        # row 4
+        'Bad Category,9,1,,\n'      # row 5
+        'Dup Barcode,,1,,111\n'     # row 6: barcode already used
+        'Negative,,-1,,\n'          # row 7
+        'Also Good,,,,\n'
+    )
+    upload(client, 'items', text, dry_run='on')
+
+    job = ImportJob.query.one()
+    assert job.status == 'completed' and job.dry_run
+    assert job.imported_rows == 2 and job.error_count == 5
+    assert [error['row'] for error in job.errors] == [3, 4, 5, 6, 7]
+    assert 'name is required' in job.errors[0]['error']
+    assert 'quantity must be a whole number' in job.errors[1]['error']
+    assert 'category_id 9 does not exist' in job.errors[2]['error']
+    assert InventoryItem.query.count() == 1
+
+    # Import the checked file without uploading it again; invalid rows are skipped
+    client.post(f'/admin/import-jobs/{job.id}/run')
+    run = ImportJob.query.filter_by(dry_run=False).one()
+    assert run.imported_rows == 2 and run.error_count == 5
+    also_good = InventoryItem.query.filter_by(name='Also Good').one()
+    assert also_good.quantity == 0  # Column default for an empty cell
+
+def test_unknown_columns_fail_job(app, client):
+    upload(client, 'computer_systems', 'model_id,created_by\n1,1\n')
+    job = ImportJob.query.one()
+    assert job.status == 'failed' and 'Unknown columns: created_by' in job.message
+    assert ComputerSystem.query.count() == 0
+
+def test_category_import_refreshes_tree_and_is_logged(app, client):
+    from app.models.activity import Activity
+    from app.utils.category_tree import get_category_tree
+
+    assert [node.name for node in get_category_tree().ordered] == ['Cables']
+    upload(client, 'categories', 'name\nAdapters\nMemory\n')
+    assert [node.name for node in get_category_tree().ordered] == ['Adapters', 'Cables', 'Memory']
+
+    activity = Activity.query.filter_by(action='import').one()
+    assert activity.user_id == ImportJob.query.one().created_by_id
+    assert activity.details['imported_rows'] == 2 and activity.details['status'] == 'completed'
+
+def test_interrupted_job_is_marked_failed(app, client):
+    from datetime import datetime, timedelta
+
+    job = ImportJob(table_name='items', filename='big.csv', status='running',
+                    heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+    db.session.add(job)
+    db.session.commit()
+    assert client.get(f'/admin/import-jobs/{job.id}/status').get_json()['status'] == 'running'
+
+    job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+    assert client.get(f'/admin/import-jobs/{job.id}/status').get_json()['status'] == 'failed'
+    assert 'interrupted' in db.session.get(ImportJob, job.id).message
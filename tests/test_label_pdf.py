@@ -0,0 +1,43 @@
+import re
+import pytest
+from app import db
+from app.models.inventory import ComputerModel, ComputerSystem, CPU, InventoryItem, Tag
+from app.models.user import User
+
+@pytest.fixture
+def app(app):
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    model = ComputerModel(manufacturer='Dell', model_name='OptiPlex 7050', model_type='desktop')
+    cpu = CPU(manufacturer='Intel', model='Core i5-7500')
+    pallet = Tag(name='Pallet 12')
+    db.session.add_all([user, model, cpu, pallet])
+    db.session.flush()
+    for i in range(1, 31):
+        system = ComputerSystem(tracking_id=f'TC-{i:08X}', model_id=model.id, cpu_id=cpu.id,
+                                ram='8GB', storage='256GB SSD', serial_tag=f'SN{i}', creator_id=user.id)
+        if i <= 12:
+            system.tags.append(pallet)
+        db.session.add(system)
+    db.session.add(InventoryItem(tracking_id='TC-AAAAAAAA', name='Patch Cable', manufacturer='Monoprice'))
+    db.session.commit()
+    return app
+
+def page_count(pdf):
+    return len(re.findall(rb'/Type /Page\b', pdf))
+
+def test_labels_for_tracking_id_list(client):
+    response = client.get('/labels/pdf?kind=systems&tracking_ids=TC-00000001,TC-00000002%0ATC-00000003')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert page_count(response.data) == 3
+
+def test_labels_by_tag_and_filter(client):
+    tag_id = Tag.query.first().id
+    assert page_count(client.get(f'/labels/pdf?kind=systems&tag={tag_id}').data) == 12
+    assert page_count(client.get('/labels/pdf?kind=systems').data) == 30
+    assert page_count(client.get('/labels/pdf?kind=items&search=cable').data) == 1
+
+def test_empty_selection_redirects(client):
+    response = client.get('/labels/pdf?kind=systems&tracking_ids=TC-FFFFFFFF')
+    assert response.status_code == 302
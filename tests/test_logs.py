@@ -0,0 +1,115 @@
+import gzip
+from datetime import datetime, timedelta
+from app.utils import logs
+from app.utils.logs import (
+    LOG_DATE_FORMAT, read_lines_reverse, tail_logs, find_start_offset,
+    read_entries_forward, merge_entries, export_chunks
+)
+
+START = datetime(2026, 10, 18, 8, 0, 0)
+
+def stamp(minutes):
+    return (START + timedelta(minutes=minutes)).strftime(LOG_DATE_FORMAT)
+
+def write_log(path, minutes, template='{} [INFO] app event {}'):
+    with open(path, 'w') as f:
+        for m in minutes:
+            f.write(template.format(stamp(m), m) + '\n')
+
+def test_read_lines_reverse_across_blocks(tmp_path):
+    path = tmp_path / 'app.log'
+    lines = [f'line {i} ' + 'x' * (i % 37) for i in range(500)]
+    path.write_text('\n'.join(lines) + '\n')
+
+    assert list(read_lines_reverse(str(path), block_size=64)) == lines[::-1]
+
+def test_tail_merges_rotated_and_activity_logs(tmp_path):
+    app_log = tmp_path / 'app.log'
+    activity_log = tmp_path / 'activity.log'
+    # RotatingFileHandler backups hold older entries: app.log.2 < app.log.1 < app.log
+    write_log(f'{app_log}.2', range(0, 10, 2))
+    write_log(f'{app_log}.1', range(10, 20, 2))
+    write_log(str(app_log), range(20, 30, 2))
+    write_log(str(activity_log), range(1, 30, 2), '{} - activity {}')
+
+    entries = tail_logs([str(app_log), str(activity_log)], max_lines=12)
+
+    minutes = [int(entry.rsplit(' ', 1)[1]) for _, entry in entries]
+    assert minutes == list(range(29, 17, -1))
+    assert [t for t, _ in entries] == sorted((t for t, _ in entries), reverse=True)
+
+    everything = tail_logs([str(app_log), str(activity_log)], max_lines=1000)
+    assert len(everything) == 30
+
+def test_tail_keeps_tracebacks_with_entry(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text(
+        f'{stamp(0)} [INFO] started\n'
+        f'{stamp(1)} [ERROR] boom\n'
+        'Traceback (most recent call last):\n'
+        '  File "x.py", line 1\n'
+        f'{stamp(2)} [INFO] recovered\n'
+    )
+
+    entries = [entry for _, entry in tail_logs([str(path)], max_lines=2)]
+    assert entries[0].endswith('recovered')
+    assert entries[1].splitlines() == [
+        f'{stamp(1)} [ERROR] boom', 'Traceback (most recent call last):', '  File "x.py", line 1'
+    ]
+
+def test_tail_reads_only_the_end_of_large_logs(tmp_path, monkeypatch):
+    path = tmp_path / 'app.log'
+    write_log(str(path), range(20000))
+    lines_read = []
+    read_lines = logs.read_lines_reverse
+    def counting_read_lines(path, block_size=4096):
+        for line in read_lines(path, block_size):
+            lines_read.append(line)
+            yield line
+    monkeypatch.setattr(logs, 'read_lines_reverse', counting_read_lines)
+
+    entries = tail_logs([str(path)], max_lines=100)
+    assert len(entries) == 100
+    assert entries[0][1].endswith('19999')
+    # Only about one block past the requested lines is decoded
+    assert len(lines_read) < 200
+
+def test_find_start_offset_binary_search(tmp_path):
+    path = tmp_path / 'app.log'
+    write_log(str(path), range(0, 2000, 2))
+
+    with open(path, 'rb') as f:
+        for minute in (0, 1, 2, 999, 1000, 1998):
+            f.seek(find_start_offset(f, START + timedelta(minutes=minute)))
+            first = f.readline().decode()
+            expected = minute + minute % 2
+            assert first.startswith(stamp(expected)) and first.endswith(f' {expected}\n')
+        assert find_start_offset(f, START + timedelta(days=2)) == path.stat().st_size
+
+def test_read_entries_forward_across_rotated_files(tmp_path):
+    app_log = tmp_path / 'app.log'
+    activity_log = tmp_path / 'activity.log'
+    write_log(f'{app_log}.2', range(0, 10, 2))
+    write_log(f'{app_log}.1', range(10, 20, 2))
+    with open(app_log, 'w') as f:
+        f.write(f'{stamp(20)} [ERROR] boom 20\nTraceback (most recent call last):\n')
+        f.write(f'{stamp(22)} [INFO] app event 22\n')
+    write_log(str(activity_log), range(1, 30, 2), '{} - activity {}')
+
+    start, end = START + timedelta(minutes=5), START + timedelta(minutes=22)
+    entries = list(merge_entries([read_entries_forward(str(app_log), start, end),
+                                  read_entries_forward(str(activity_log), start, end)]))
+
+    assert [t for t, _ in entries] == [START + timedelta(minutes=m) for m in range(5, 22)]
+    assert entries[-2][1] == f'{stamp(20)} [ERROR] boom 20\nTraceback (most recent call last):'
+
+def test_export_chunks_streams_gzip(tmp_path):
+    path = tmp_path / 'app.log'
+    write_log(str(path), range(5000))
+    entries = read_entries_forward(str(path), START, START + timedelta(days=7))
+
+    chunks = list(export_chunks(entries, compress=True, chunk_size=4096))
+    assert len(chunks) > 1
+    lines = gzip.decompress(b''.join(chunks)).decode().splitlines()
+    assert len(lines) == 5000
+    assert lines[0].endswith(' 0') and lines[-1].endswith(' 4999')
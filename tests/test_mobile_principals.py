@@ -0,0 +1,75 @@
+import pytest
+from app import db
+from app.api.mobile.auth import generate_token
+from app.models.user import User
+
+@pytest.fixture
+def app(app):
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    user.set_pin('123456')
+    db.session.add(user)
+    db.session.commit()
+    return app
+
+def user_queries(count_queries):
+    statements = count_queries()
+    return lambda: [s for s in statements if 'FROM users' in s]
+
+def verify(app, token):
+    return app.test_client().get('/api/mobile/auth/verify', headers={'Authorization': f'Bearer {token}'})
+
+def test_user_cached_between_requests(app, count_queries):
+    token = generate_token(User.query.one())
+    queries = user_queries(count_queries)
+    first = verify(app, token)
+    assert first.status_code == 200
+    assert first.get_json()['user'] == {'id': 1, 'username': 'tech', 'role': 'user'}
+    assert verify(app, token).status_code == 200
+    assert len(queries()) == 1
+
+def test_cache_expires(app, count_queries):
+    app.config['MOBILE_PRINCIPAL_CACHE_TTL'] = 0
+    token = generate_token(User.query.one())
+    queries = user_queries(count_queries)
+    verify(app, token)
+    verify(app, token)
+    assert len(queries()) == 2
+
+def test_cache_is_bounded(app):
+    app.config['MOBILE_PRINCIPAL_CACHE_SIZE'] = 1
+    other = User(username='other', email='other@example.com')
+    other.set_password('password123')
+    db.session.add(other)
+    db.session.commit()
+    for user in User.query.all():
+        assert verify(app, generate_token(user)).status_code == 200
+    assert list(app.extensions['mobile_principals']) == [other.id]
+
+def test_pin_change_revokes_tokens(app):
+    user = User.query.one()
+    token = generate_token(user)
+    assert verify(app, token).status_code == 200
+
+    user.set_pin('654321')
+    db.session.commit()
+    response = verify(app, token)
+    assert response.status_code == 401
+    assert response.get_json()['message'] == 'Token has been revoked'
+    assert verify(app, generate_token(user)).status_code == 200
+
+def test_password_change_revokes_tokens(app):
+    user = User.query.one()
+    token = generate_token(user)
+    verify(app, token)
+    user.set_password('new-password')
+    db.session.commit()
+    assert verify(app, token).status_code == 401
+
+def test_deleted_user_rejected(app):
+    user = User.query.one()
+    token = generate_token(user)
+    verify(app, token)
+    db.session.delete(user)
+    db.session.commit()
+    assert verify(app, token).status_code == 401
@@ -0,0 +1,80 @@
+import bcrypt
+import pytest
+from app import db
+from app.models.user import User
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    # Cheap hashes so hundreds of users can be created quickly
+    gensalt = bcrypt.gensalt
+    monkeypatch.setattr(bcrypt, 'gensalt', lambda rounds=4, prefix=b'2b': gensalt(4, prefix))
+
+@pytest.fixture
+def checkpw_calls(monkeypatch):
+    calls = []
+    checkpw = bcrypt.checkpw
+    def counting_checkpw(password, hashed):
+        calls.append(hashed)
+        return checkpw(password, hashed)
+    monkeypatch.setattr(bcrypt, 'checkpw', counting_checkpw)
+    return calls
+
+def add_users(start, count):
+    for i in range(start, start + count):
+        user = User(username=f'tech{i}', email=f'tech{i}@example.com')
+        user.set_password('password123')
+        user.set_pin(f'{i:06d}')
+        db.session.add(user)
+    db.session.commit()
+
+def test_find_by_pin(app):
+    add_users(1, 3)
+    assert User.find_by_pin('000002').username == 'tech2'
+    assert User.find_by_pin('999999') is None
+
+def test_legacy_pin_gets_fingerprint(app):
+    add_users(1, 1)
+    user = User.query.first()
+    user.pin_fingerprint = None
+    db.session.commit()
+
+    assert User.find_by_pin('000001') == user
+    db.session.commit()
+    assert User.query.first().pin_fingerprint == User.pin_fingerprint_for('000001')
+
+def test_pin_login_cost_is_flat(app, checkpw_calls):
+    """bcrypt work per login stays constant as users are added"""
+    checks = []
+    added = 0
+    for total in (5, 50, 200):
+        add_users(added + 1, total - added)
+        added = total
+
+        del checkpw_calls[:]
+        assert User.find_by_pin(f'{total:06d}').username == f'tech{total}'
+        checks.append(len(checkpw_calls))
+
+    assert checks == [1, 1, 1]
+
+    # A wrong PIN costs no bcrypt checks at all
+    del checkpw_calls[:]
+    assert User.find_by_pin('999999') is None
+    assert checkpw_calls == []
+
+def test_every_legacy_pin_can_log_in_until_expired(app, checkpw_calls):
+    add_users(1, 30)
+    User.query.update({User.pin_fingerprint: None})
+    db.session.commit()
+
+    # The last legacy user is still found, and backfilled for next time
+    assert User.find_by_pin('000030').username == 'tech30'
+    db.session.commit()
+    del checkpw_calls[:]
+    assert User.find_by_pin('000030').username == 'tech30'
+    assert len(checkpw_calls) == 1
+
+    result = app.test_cli_runner().invoke(args=['expire-legacy-pins'])
+    assert 'Cleared 29 legacy PINs' in result.output
+    del checkpw_calls[:]
+    assert User.find_by_pin('000001') is None
+    assert checkpw_calls == []
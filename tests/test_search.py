@@ -0,0 +1,253 @@
+import pytest
+from app import db
+from app.api.mobile.auth import generate_token
+from app.models.inventory import ComputerModel, ComputerSystem, InventoryItem
+from app.models.user import User
+from app.utils.search import search_items, search_systems, search_terms
+
+@pytest.fixture
+def app(app):
+    app.config['WTF_CSRF_ENABLED'] = False
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.add_all([
+        InventoryItem(tracking_id='TC-00000001', name='Power supply 500W', manufacturer='Corsair', mpn='CX500'),
+        InventoryItem(tracking_id='TC-00000002', name='SATA cable', barcode='0123456789'),
+        InventoryItem(tracking_id='TC-00000003', name='Corsair RAM 8GB', manufacturer='Corsair', mpn='CMK8'),
+        InventoryItem(tracking_id='TC-00000004', name='Laptop charger', manufacturer='Dell'),
+    ])
+    latitude = ComputerModel(manufacturer='Dell', model_name='Latitude 5520', model_type='laptop')
+    optiplex = ComputerModel(manufacturer='Dell', model_name='Optiplex 7090', model_type='desktop')
+    db.session.add_all([latitude, optiplex])
+    db.session.flush()
+    db.session.add_all([
+        ComputerSystem(tracking_id='TC-0000000A', model_id=latitude.id, serial_tag='ABC123'),
+        ComputerSystem(tracking_id='TC-0000000B', model_id=optiplex.id, serial_tag='XYZ789'),
+        ComputerSystem(tracking_id='TC-0000000C', serial_tag='NOMODEL'),
+    ])
+    db.session.commit()
+    return app
+
+def item_names(q):
+    return [item.name for item in search_items(InventoryItem.query, q).order_by(InventoryItem.id)]
+
+def test_search_terms():
+    assert search_terms('  Dell, Latitude-5520 ') == ['dell', 'latitude', '5520']
+    assert search_terms("'&|!:*") == []
+
+def test_every_term_must_match_some_column(app):
+    assert item_names('corsair') == ['Corsair RAM 8GB', 'Power supply 500W']
+    assert item_names('corsair 500') == ['Power supply 500W']
+    assert item_names('cx500') == ['Power supply 500W']
+    assert item_names('0123456789') == ['SATA cable']
+    assert item_names('corsair cable') == []
+    assert item_names('***') == []
+
+def test_exact_tracking_id_ranks_first(app):
+    assert item_names('TC-00000004')[0] == 'Laptop charger'
+
+def test_identifier_fragments_match_as_substrings(app, monkeypatch):
+    from sqlalchemy.dialects import postgresql
+    from app.utils import search
+
+    db.session.add(InventoryItem(tracking_id='TC-00000005', name='Case fan', barcode='4-006381/333931'))
+    db.session.commit()
+    assert item_names('C-0000000') == ['Power supply 500W', 'SATA cable', 'Corsair RAM 8GB',
+                                       'Laptop charger', 'Case fan']
+    assert item_names('0000003') == ['Corsair RAM 8GB']
+    assert item_names('/333') == item_names('/') == ['Case fan']
+    assert item_names('%') == [] and item_names('***') == []
+    assert [s.tracking_id for s in search_systems(ComputerSystem.query, '0000000B')] == ['TC-0000000B']
+
+    # On PostgreSQL only identifier-shaped queries add the substring match
+    monkeypatch.setattr(search, 'use_fulltext', lambda: True)
+    def sql(criterion):
+        return str(criterion.compile(dialect=postgresql.dialect()))
+    assert '@@' in sql(search.item_search_filter('00000AB')) and 'ILIKE' in sql(search.item_search_filter('00000AB'))
+    assert 'ILIKE' not in sql(search.item_search_filter('dell latitude'))
+    assert 'to_tsquery' not in sql(search.item_search_filter('-/'))
+    assert 'ts_rank' not in sql(search.item_search_rank('-/'))
+
+def test_systems_match_model_without_dropping_systems_lacking_one(app):
+    def tracking_ids(q):
+        return [s.tracking_id for s in search_systems(ComputerSystem.query, q).order_by(ComputerSystem.id)]
+
+    assert tracking_ids('dell latitude') == ['TC-0000000A']
+    assert tracking_ids('dell') == ['TC-0000000A', 'TC-0000000B']
+    assert tracking_ids('xyz789') == ['TC-0000000B']
+    assert tracking_ids('nomodel') == ['TC-0000000C']
+
+def test_dashboard_search(app):
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(User.query.one().id)
+        html = client.get('/dashboard', query_string={'search': 'corsair 8gb'}).get_data(as_text=True)
+    assert 'Corsair RAM 8GB' in html
+    assert 'Power supply 500W' not in html
+
+def test_mobile_search(app):
+    headers = {'Authorization': f'Bearer {generate_token(User.query.one())}'}
+    with app.test_client() as client:
+        items = client.get('/api/mobile/search/items/search', query_string={'q': 'dell charger'}, headers=headers)
+        systems = client.get('/api/mobile/search/systems/search', query_string={'q': 'optiplex'}, headers=headers)
+    assert [item['name'] for item in items.get_json()['results']] == ['Laptop charger']
+    assert [system['tracking_id'] for system in systems.get_json()['results']] == ['TC-0000000B']
+
+def add_wiki_pages(author_id):
+    from app.models.inventory import WikiCategory, WikiPage
+    category = WikiCategory(name='Guides')
+    db.session.add(category)
+    db.session.flush()
+    pages = [
+        WikiPage(title='Imaging laptops', category_id=category.id, author_id=author_id,
+                 content='<p><strong>Boot</strong> from the USB stick &amp; select <em>Windows</em>.</p>'),
+        WikiPage(title='Shipping', category_id=category.id, author_id=author_id,
+                 content='<div class="note">Wrap laptops in foam before boxing. <b>x&lt;y</b><script>hidden()</script></div>'),
+    ]
+    db.session.add_all(pages)
+    db.session.commit()
+    return pages
+
+def test_wiki_plain_text_kept_at_save(app):
+    imaging, shipping = add_wiki_pages(User.query.one().id)
+    assert imaging.plain_text == 'Boot from the USB stick & select Windows .'
+    imaging.content = '<h1>Replaced</h1>'
+    db.session.commit()
+    assert imaging.plain_text == 'Replaced'
+
+def test_wiki_search_ranks_and_highlights(app):
+    from app.models.inventory import WikiPage
+    from app.utils.search import search_wiki_pages, with_snippets
+    add_wiki_pages(User.query.one().id)
+
+    pages = with_snippets(search_wiki_pages(WikiPage.query, 'laptops').all(), 'laptops')
+    assert [page.title for page in pages] == ['Imaging laptops', 'Shipping']
+    assert pages[1].snippet == 'Wrap <mark>laptops</mark> in foam before boxing. x&lt;y'
+
+    # Markup is not searchable
+    assert search_wiki_pages(WikiPage.query, 'strong').all() == []
+    assert search_wiki_pages(WikiPage.query, 'note').all() == []
+
+def test_wiki_home_search_is_paginated(app):
+    app.config['ITEMS_PER_PAGE'] = 1
+    add_wiki_pages(User.query.one().id)
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(User.query.one().id)
+        first = client.get('/wiki', query_string={'search': 'laptops'}).get_data(as_text=True)
+        second = client.get('/wiki', query_string={'search': 'laptops', 'page': 2}).get_data(as_text=True)
+        listing = client.get('/wiki').get_data(as_text=True)
+    assert 'Imaging laptops' in first and 'Shipping' not in first
+    assert 'Shipping' in second and '<mark>laptops</mark>' in second
+    assert 'Shipping' in listing and 'page=2' in listing
+
+def mobile_get(app, url, **params):
+    headers = {'Authorization': f'Bearer {generate_token(User.query.one())}'}
+    with app.test_client() as client:
+        return client.get(url, query_string=params, headers=headers)
+
+def test_mobile_item_search_is_compact_by_default(app, count_queries):
+    from app.models.inventory import Transaction
+    item = InventoryItem.query.filter_by(name='Laptop charger').one()
+    db.session.add_all([Transaction(item_id=item.id, quantity_changed=-1, transaction_type='checkout')
+                        for _ in range(5)])
+    db.session.commit()
+
+    statements = count_queries()
+    result = mobile_get(app, '/api/mobile/search/items/search', q='charger').get_json()['results'][0]
+    assert set(result) == {'id', 'tracking_id', 'name', 'manufacturer', 'mpn', 'quantity',
+                           'status', 'storage_location', 'image_url'}
+    page_query = next(statement for statement in statements if 'FROM items' in statement and 'LIMIT' in statement)
+    assert 'JOIN' not in page_query and 'items.description' not in page_query
+    assert not any('FROM transactions' in statement for statement in statements)
+
+def test_mobile_item_search_fields_and_expand(app):
+    result = mobile_get(app, '/api/mobile/search/items/search', q='charger',
+                        fields='name,cost', expand='tags,category').get_json()['results'][0]
+    assert result == {'id': 4, 'name': 'Laptop charger', 'cost': None, 'tags': [], 'category': {'id': None, 'name': None}}
+
+    response = mobile_get(app, '/api/mobile/search/items/search', q='charger', expand='transactions')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Unknown fields: transactions'
+
+def test_mobile_item_transactions_paginated(app):
+    from datetime import datetime, timedelta
+    from app.models.inventory import Transaction
+    item = InventoryItem.query.filter_by(name='Laptop charger').one()
+    base = datetime(2025, 1, 1)
+    db.session.add_all([Transaction(item_id=item.id, quantity_changed=-i, transaction_type='checkout',
+                                    user_id=1, created_at=base + timedelta(minutes=i))
+                        for i in range(1, 6)])
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        page = mobile_get(app, f'/api/mobile/item/{item.id}/transactions', **params).get_json()
+        seen.extend(t['quantity_changed'] for t in page['results'])
+        assert page['has_next'] == (page['next_cursor'] is not None)
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert seen == [-5, -4, -3, -2, -1]
+    assert page['results'][0]['user'] == {'id': 1, 'username': 'tech'}
+    assert mobile_get(app, '/api/mobile/item/999/transactions').status_code == 404
+
+def test_mobile_search_keyset_pages(app, count_queries):
+    db.session.add_all([InventoryItem(tracking_id=f'TC-1000000{i}', name=f'Widget {i}') for i in range(7)])
+    db.session.add(InventoryItem(tracking_id='TC-WIDGET', name='Spare widget'))
+    db.session.commit()
+
+    statements = count_queries()
+    seen, cursor = [], None
+    while True:
+        params = {'q': 'widget', 'limit': 3}
+        if cursor:
+            params['cursor'] = cursor
+        page = mobile_get(app, '/api/mobile/search/items/search', **params).get_json()
+        assert len(page['results']) <= 3 and page['total'] is None
+        assert page['has_next'] == (page['next_cursor'] is not None)
+        seen.extend(item['name'] for item in page['results'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    # Name-prefix matches rank first, then newest first within a rank
+    assert seen == [f'Widget {i}' for i in reversed(range(7))] + ['Spare widget']
+    assert not any('count(' in statement for statement in statements)
+
+    first = mobile_get(app, '/api/mobile/search/systems/search', q='dell', limit=1, total='true').get_json()
+    assert first['total'] == 2 and first['has_next']
+    second = mobile_get(app, '/api/mobile/search/systems/search', q='dell', limit=1,
+                        cursor=first['next_cursor']).get_json()
+    assert [s['tracking_id'] for s in first['results'] + second['results']] == ['TC-0000000B', 'TC-0000000A']
+    assert not second['has_next']
+
+def test_search_cursor_round_trips_tied_ranks(app, monkeypatch):
+    from sqlalchemy.dialects import postgresql
+    from app.utils import search
+    from app.utils.pagination import decode_cursor
+
+    # Same rank for every match, so pages are split within a tie
+    db.session.add_all([InventoryItem(tracking_id=f'TC-2000000{i}', name=f'Part gizmo {i}') for i in range(7)])
+    db.session.commit()
+    seen, cursor = [], None
+    while True:
+        params = {'q': 'gizmo', 'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        page = mobile_get(app, '/api/mobile/search/items/search', **params).get_json()
+        seen.extend(item['id'] for item in page['results'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+        assert all(isinstance(value, int) for value in decode_cursor(cursor))
+    assert seen == sorted(seen, reverse=True) and len(seen) == len(set(seen)) == 7
+
+    # On PostgreSQL the real-valued ts_rank is scaled to an exact integer key
+    monkeypatch.setattr(search, 'use_fulltext', lambda: True)
+    for rank in (search.item_search_rank('gizmo'), search.system_search_rank('dell')):
+        sql = str(rank.compile(dialect=postgresql.dialect()))
+        assert sql.startswith('CAST(ts_rank(') and sql.endswith('AS BIGINT)')
@@ -0,0 +1,137 @@
+import smtplib
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.alerts import StockAlert
+from app.models.config import Configuration
+from app.models.inventory import InventoryItem
+from app.models.user import User
+from app.utils.stock_alerts import process_stock_alerts
+
+class FakeSMTP:
+    """Records messages instead of talking to a mail server"""
+    sent = []
+    fail = False
+
+    def __init__(self, host, port, timeout=None):
+        if FakeSMTP.fail:
+            raise OSError('Connection refused')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def send_message(self, msg):
+        FakeSMTP.sent.append(msg)
+
+@pytest.fixture
+def app(app, monkeypatch):
+    FakeSMTP.sent = []
+    FakeSMTP.fail = False
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    app.config['WTF_CSRF_METHODS'] = []  # Skip the CSRF before_request hook
+    Configuration.set_many({
+        'enable_low_stock_alerts': 'true',
+        'smtp_server': 'localhost',
+        'smtp_username': 'alerts@example.com',
+        'smtp_password': 'secret',
+        'stock_alert_email': 'buyer@example.com'
+    })
+    tech = User(username='tech', email='tech@example.com')
+    tech.set_password('password123')
+    db.session.add(tech)
+    db.session.add_all([
+        InventoryItem(tracking_id='TC-00000001', name='Patch Cable', quantity=5, reorder_threshold=3),
+        InventoryItem(tracking_id='TC-00000002', name='SATA Cable', quantity=4, reorder_threshold=3)
+    ])
+    db.session.commit()
+    return app
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['tech_id'] = User.query.first().id
+    return client
+
+def checkout(client, tracking_id, quantity):
+    return client.post('/checkout/process', data={
+        'tracking_id': tracking_id, 'quantity': quantity, 'reason': 'Repair'
+    })
+
+def test_checkout_queues_alert_without_sending(client):
+    FakeSMTP.fail = True  # Checkout must not depend on the mail server
+    checkout(client, 'TC-00000001', 3)
+    checkout(client, 'TC-00000001', 1)
+
+    assert InventoryItem.query.filter_by(tracking_id='TC-00000001').first().quantity == 1
+    assert StockAlert.query.count() == 1
+    assert FakeSMTP.sent == []
+
+def test_alerts_coalesced_into_one_digest(client):
+    checkout(client, 'TC-00000001', 3)
+    checkout(client, 'TC-00000002', 2)
+
+    # Still inside the coalescing window
+    assert process_stock_alerts() == 0
+    assert FakeSMTP.sent == []
+
+    StockAlert.query.update({StockAlert.queued_at: datetime.utcnow() - timedelta(minutes=10)})
+    db.session.commit()
+    assert process_stock_alerts() == 2
+    assert len(FakeSMTP.sent) == 1
+    body = FakeSMTP.sent[0].get_payload()[0].get_payload()
+    assert 'Patch Cable' in body and 'SATA Cable' in body
+
+    # Already alerted items are not queued again
+    checkout(client, 'TC-00000001', 1)
+    assert StockAlert.query.filter(StockAlert.sent_at.is_(None)).count() == 0
+
+def test_failed_send_is_retried(client):
+    checkout(client, 'TC-00000001', 3)
+    FakeSMTP.fail = True
+    assert process_stock_alerts(force=True) == 0
+    alert = StockAlert.query.first()
+    assert alert.sent_at is None and alert.attempts == 1
+
+    FakeSMTP.fail = False
+    assert process_stock_alerts(force=True) == 1
+    assert len(FakeSMTP.sent) == 1
+
+def test_failed_sends_back_off_then_are_dropped(app, client):
+    app.config.update(STOCK_ALERT_MAX_ATTEMPTS=3, STOCK_ALERT_RETRY_SECONDS=60)
+    checkout(client, 'TC-00000001', 3)
+    StockAlert.query.update({StockAlert.queued_at: datetime.utcnow() - timedelta(minutes=10)})
+    db.session.commit()
+    FakeSMTP.fail = True
+
+    assert process_stock_alerts() == 0
+    alert = StockAlert.query.first()
+    assert alert.attempts == 1
+    assert alert.next_attempt_at - datetime.utcnow() > timedelta(seconds=55)
+
+    # Not retried before its backoff has elapsed
+    assert process_stock_alerts() == 0
+    assert StockAlert.query.first().attempts == 1
+
+    for attempts in (2, 3):
+        StockAlert.query.update({StockAlert.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+        assert process_stock_alerts() == 0
+        alert = StockAlert.query.first()
+        assert alert.attempts == attempts
+    assert alert.failed_at is not None and alert.next_attempt_at is None
+
+    # A dropped alert is not retried, and does not re-queue within the repeat window
+    FakeSMTP.fail = False
+    assert process_stock_alerts(force=True) == 0
+    checkout(client, 'TC-00000001', 1)
+    assert StockAlert.query.count() == 1 and FakeSMTP.sent == []
@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timedelta
+from app import db
+from app.models.user import User
+from app.models.inventory import ComputerSystem, ComputerModel
+
+@pytest.fixture
+def config(config):
+    class SystemsConfig(config):
+        WTF_CSRF_ENABLED = False
+    return SystemsConfig
+
+@pytest.fixture
+def app(app):
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    model = ComputerModel(manufacturer='Dell', model_name='Optiplex 7090', model_type='desktop')
+    db.session.add(model)
+    db.session.flush()
+    base = datetime(2025, 1, 1)
+    for i in range(25):
+        db.session.add(ComputerSystem(
+            tracking_id=f'TC-{i:08d}',
+            model_id=model.id,
+            status='available' if i % 2 else 'maintenance',
+            created_at=base + timedelta(minutes=i)
+        ))
+    db.session.commit()
+    return app
+
+def test_systems_data_keyset_pages(client):
+    seen = []
+    cursor = None
+    while True:
+        params = {'draw': 1, 'length': 10}
+        if cursor:
+            params['cursor'] = cursor
+        data = client.get('/systems/data', query_string=params).get_json()
+        assert data['recordsTotal'] == 25
+        seen.extend(row['tracking_id'] for row in data['data'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    # Newest first, every system exactly once
+    assert seen == [f'TC-{i:08d}' for i in reversed(range(25))]
+
+def test_systems_data_counts_only_first_page(client, count_queries):
+    first = client.get('/systems/data', query_string={'draw': 1, 'length': 10}).get_json()
+    assert (first['recordsTotal'], first['recordsFiltered']) == (25, 25)
+
+    statements = count_queries()
+    data = client.get('/systems/data', query_string={
+        'draw': 2, 'start': 10, 'length': 10, 'cursor': first['next_cursor'],
+        'records_total': 25, 'records_filtered': 25
+    }).get_json()
+    assert (data['recordsTotal'], data['recordsFiltered']) == (25, 25)
+    assert data['data'][0]['tracking_id'] == 'TC-00000014'
+    assert not any('count(' in statement for statement in statements)
+
+def test_systems_data_filters_and_sorts(client):
+    data = client.get('/systems/data', query_string={
+        'draw': 3,
+        'start': 0,
+        'length': 5,
+        'system_status': 'maintenance',
+        'order[0][column]': 0,
+        'order[0][dir]': 'asc'
+    }).get_json()
+
+    assert data['draw'] == 3
+    assert data['recordsFiltered'] == 13
+    assert [row['tracking_id'] for row in data['data']] == [
+        f'TC-{i:08d}' for i in range(0, 10, 2)
+    ]
+    assert data['data'][0]['model'] == 'Dell Optiplex 7090'
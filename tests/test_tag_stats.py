@@ -0,0 +1,82 @@
+import pytest
+from app import db
+from app.api.mobile.auth import generate_token
+from app.models.inventory import ComputerSystem, InventoryItem, Tag
+from app.models.user import User
+from app.utils.tag_stats import get_tag_stats
+
+@pytest.fixture
+def app(app):
+    admin = User(username='admin', email='admin@example.com', role='admin')
+    admin.set_password('password123')
+    db.session.add(admin)
+    testing, for_sale = Tag(name='TESTING'), Tag(name='FOR SALE')
+    db.session.add(Tag(name='UNUSED'))
+    for i in range(3):
+        db.session.add(InventoryItem(tracking_id=f'TC-0000000{i}', name=f'Item {i}', tags=[testing]))
+    db.session.add(InventoryItem(tracking_id='TC-00000009', name='Item 9', tags=[testing, for_sale]))
+    db.session.add(ComputerSystem(tracking_id='TC-0000000A', tags=[for_sale]))
+    db.session.commit()
+    return app
+
+def usage():
+    return {tag.name: (tag.item_count, tag.system_count) for tag in get_tag_stats()}
+
+def test_counts_in_one_query(app, count_queries):
+    statements = count_queries()
+    assert usage() == {'FOR SALE': (1, 1), 'TESTING': (4, 0), 'UNUSED': (0, 0)}
+    assert len(statements) == 1
+
+    # Served from the cache on subsequent calls
+    get_tag_stats()
+    assert len(statements) == 1
+
+def test_cache_invalidated_on_assignment_changes(app):
+    usage()
+    testing = Tag.query.filter_by(name='TESTING').one()
+    system = ComputerSystem.query.one()
+
+    system.tags.append(testing)
+    db.session.commit()
+    assert usage()['TESTING'] == (4, 1)
+
+    item = InventoryItem.query.filter_by(name='Item 9').one()
+    item.tags = []
+    db.session.commit()
+    assert usage()['FOR SALE'] == (0, 1)
+
+    db.session.delete(InventoryItem.query.filter_by(name='Item 0').one())
+    db.session.commit()
+    assert usage()['TESTING'] == (2, 1)
+
+def test_tags_page_query_count_fixed(app, count_queries):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(User.query.first().id)
+
+    statements = count_queries()
+
+    def page_queries():
+        start = len(statements)
+        html = client.get('/manage/tags').get_data(as_text=True)
+        return html, len(statements) - start
+
+    html, _ = page_queries()  # Load the configuration cache
+    assert 'FOR SALE' in html
+    db.session.add(Tag(name='EXTRA 0'))
+    db.session.commit()
+    html, before = page_queries()
+    db.session.add_all([Tag(name=f'EXTRA {i}') for i in range(1, 20)])
+    db.session.commit()
+    html, after = page_queries()
+    assert 'EXTRA 19' in html
+    assert after == before
+
+def test_mobile_tag_list(app):
+    token = generate_token(User.query.first())
+    response = app.test_client().get('/api/mobile/item/tags', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert response.get_json()[0] == {
+        'id': Tag.query.filter_by(name='FOR SALE').one().id, 'name': 'FOR SALE',
+        'color': '#6c757d', 'item_count': 1, 'system_count': 1
+    }
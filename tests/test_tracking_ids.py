@@ -0,0 +1,39 @@
+import pytest
+from app import db
+from app.models.inventory import ComputerSystem, InventoryItem
+from app.utils import tracking_ids
+from app.utils.tracking_ids import encode_tracking_id, next_tracking_id, reserve
+
+@pytest.fixture
+def app(app):
+    app.config['TRACKING_ID_BLOCK_SIZE'] = 5
+    return app
+
+def test_encoding_is_unique_and_keeps_format():
+    ids = {encode_tracking_id(value) for value in range(1, 100001)}
+    assert len(ids) == 100000
+    assert all(len(tracking_id) == 11 and tracking_id.startswith('TC-') for tracking_id in ids)
+
+def test_reserve_skips_legacy_ids_with_one_query_per_table(app, count_queries):
+    # Random IDs created before the allocator may collide with counter values
+    db.session.add_all([
+        InventoryItem(tracking_id=encode_tracking_id(2), name='Legacy Item'),
+        ComputerSystem(tracking_id=encode_tracking_id(4))
+    ])
+    db.session.commit()
+    statements = count_queries()
+
+    ids = reserve(100)
+    assert len(set(ids)) == 100
+    assert encode_tracking_id(2) not in ids and encode_tracking_id(4) not in ids
+    assert len([s for s in statements if 'tracking_id IN' in s]) == 4  # Two blocks (100, then 2 to replace the clashes), two tables each
+    assert set(reserve(50)).isdisjoint(ids)
+
+def test_next_tracking_id_draws_from_reserved_block(app, monkeypatch):
+    calls = []
+    real_reserve = tracking_ids.reserve
+    monkeypatch.setattr(tracking_ids, 'reserve', lambda count: calls.append(count) or real_reserve(count))
+
+    ids = [next_tracking_id() for _ in range(12)]
+    assert len(set(ids)) == 12
+    assert calls == [5, 5, 5]
@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+import requests
+from app import db
+from app.models.upc import UpcLookup
+from app.utils.upc_lookup import lookup_upc, store_lookup
+
+PRODUCTS = {
+    '012345678905': {'title': 'USB Network Adapter', 'brand': 'TP-Link', 'model': 'UE300'}
+}
+
+class StubUpcHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the UPCItemDB lookup endpoint"""
+    requests_seen = []
+
+    def do_GET(self):
+        upc = parse_qs(urlparse(self.path).query).get('upc', [''])[0]
+        StubUpcHandler.requests_seen.append(upc)
+        if upc == 'slow':
+            time.sleep(1)
+        if upc == 'broken':
+            self.send_response(503)
+            self.end_headers()
+            return
+        body = json.dumps({'items': [PRODUCTS[upc]] if upc in PRODUCTS else []}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubUpcHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/prod/v1/lookup'
+    server.shutdown()
+
+@pytest.fixture
+def config(config, stub_server):
+    class UpcConfig(config):
+        UPCITEMDB_API_KEY = 'test-key'
+        UPCITEMDB_API_URL = stub_server
+        UPC_LOOKUP_READ_TIMEOUT = 0.2
+    return UpcConfig
+
+@pytest.fixture
+def app(app):
+    StubUpcHandler.requests_seen = []
+    return app
+
+def test_repeat_lookup_served_from_cache(app):
+    item, cached = lookup_upc('012345678905')
+    assert item['model'] == 'UE300'
+    assert cached is False
+
+    item, cached = lookup_upc('012345678905')
+    assert item['model'] == 'UE300'
+    assert cached is True
+    assert StubUpcHandler.requests_seen == ['012345678905']
+
+def test_unknown_upc_negatively_cached(app):
+    assert lookup_upc('000000000000') == (None, False)
+    assert lookup_upc('000000000000') == (None, True)
+    assert StubUpcHandler.requests_seen == ['000000000000']
+    assert UpcLookup.query.filter_by(upc='000000000000').first().found is False
+
+def test_failures_time_out_and_are_not_cached(app):
+    with pytest.raises(requests.exceptions.Timeout):
+        lookup_upc('slow')
+    with pytest.raises(requests.exceptions.HTTPError):
+        lookup_upc('broken')
+    assert UpcLookup.query.count() == 0
+
+def test_cache_write_leaves_caller_transaction_alone(app):
+    from app.models.inventory import Category
+
+    # The cache row is committed on its own, even if the caller rolls back
+    db.session.add(Category(name='Adapters'))
+    lookup_upc('012345678905')
+    db.session.rollback()
+    assert Category.query.count() == 0
+    assert UpcLookup.query.count() == 1
+
+    # Refreshing an existing row updates it in place
+    db.session.add(Category(name='Adapters'))
+    store_lookup('012345678905', None)
+    db.session.commit()
+    assert Category.query.filter_by(name='Adapters').count() == 1
+    assert UpcLookup.query.one().found is False
+
+def test_upc_api_check_bypasses_cache(app):
+    from app.models.user import User
+
+    user = User(username='tech', email='tech@example.com')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+    PRODUCTS['190199267039'] = {'title': 'iPhone'}
+    try:
+        for _ in range(2):
+            assert client.get('/test_upc').get_json() == {'items': [{'title': 'iPhone'}]}
+    finally:
+        del PRODUCTS['190199267039']
+    assert StubUpcHandler.requests_seen == ['190199267039'] * 2
+    assert UpcLookup.query.count() == 0